@@ -23,6 +23,8 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    from app.services.identity_service import register_user_lookup
+    register_user_lookup(jwt)
     CORS(app, origins=['http://localhost:3000'], supports_credentials=True)
     
     # Initialize API
@@ -39,6 +41,9 @@ def create_app(config_class=Config):
     from app.routes.follow_routes import register_follow_routes
     from app.routes.message_routes import register_message_routes
     from app.routes.upload_routes import register_upload_routes
+    from app.routes.media_routes import register_media_routes
+    from app.routes.event_routes import register_event_routes
+    from app.routes.search_routes import register_search_routes
     
     register_auth_routes(api)
     register_user_routes(api)
@@ -50,5 +55,16 @@ def create_app(config_class=Config):
     register_follow_routes(api)
     register_message_routes(api)
     register_upload_routes(api)
+    register_media_routes(api)
+    register_event_routes(api)
+    register_search_routes(api)
+    
+    # Background jobs
+    from app.celery_app import celery_init_app
+    celery_init_app(app)
+    
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
     
     return app
\ No newline at end of file
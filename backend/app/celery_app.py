@@ -0,0 +1,18 @@
+from celery import Celery, Task
+
+def celery_init_app(app):
+    """Bind a Celery instance to the Flask app so tasks run in its context"""
+    class FlaskTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+    
+    celery_app = Celery(app.name, task_cls=FlaskTask)
+    celery_app.config_from_object(app.config['CELERY'])
+    celery_app.set_default()
+    app.extensions['celery'] = celery_app
+    
+    # Register task modules
+    from app.tasks import story_tasks, ai_tasks, upload_tasks, media_tasks, ranking_tasks, suggestion_tasks  # noqa: F401
+    
+    return celery_app
@@ -0,0 +1,103 @@
+import click
+from app import db
+from app.models.user import User
+
+def register_commands(app):
+    @app.cli.command('rebuild-timelines')
+    @click.option('--user-id', type=int, help='Rebuild a single user instead of everyone')
+    def rebuild_timelines(user_id):
+        """Rebuild materialized home timelines from the follow graph"""
+        from app.services.timeline_service import TimelineService
+        
+        timeline_service = TimelineService()
+        user_ids = [user_id] if user_id else [u[0] for u in db.session.query(User.id).all()]
+        
+        for uid in user_ids:
+            count = timeline_service.rebuild(uid)
+            db.session.commit()
+            click.echo(f'User {uid}: {count} timeline entries')
+    
+    @app.cli.command('archive-stories')
+    def archive_stories():
+        """Move expired stories into the story archive now"""
+        from app.services.story_archive_service import StoryArchiveService
+        
+        archived = StoryArchiveService().archive_expired()
+        click.echo(f'Stories archived: {archived}')
+    
+    @app.cli.command('enhance-stories')
+    @click.option('--family-id', type=int, help='Enhance every unenhanced story in a family')
+    @click.option('--story-id', 'story_ids', type=int, multiple=True, help='Story to enhance (repeatable)')
+    @click.option('--concurrency', type=int, help='Simultaneous model calls (default AI_BATCH_CONCURRENCY)')
+    def enhance_stories(family_id, story_ids, concurrency):
+        """Bulk AI enhancement of family stories"""
+        from app.services.ai_batch_service import AIBatchService
+        
+        if family_id is None and not story_ids:
+            raise click.UsageError('Pass --family-id or at least one --story-id')
+        
+        batch_service = AIBatchService()
+        if concurrency:
+            batch_service.concurrency = concurrency
+        ids = batch_service.eligible_story_ids(family_id=family_id, story_ids=list(story_ids) or None)
+        click.echo(f'Stories to enhance: {len(ids)}')
+        
+        def report(completed, failed, skipped):
+            click.echo(f'  {completed + failed + skipped}/{len(ids)} done ({failed} failed)')
+        
+        completed, failed, skipped = batch_service.enhance_stories(ids, on_commit=report)
+        click.echo(f'Enhanced: {completed}, failed: {failed}, skipped: {skipped}')
+    
+    @app.cli.command('ai-cache')
+    @click.option('--prune', is_flag=True, help='Drop expired and least recently used entries')
+    @click.option('--clear', is_flag=True, help='Remove every cached response')
+    def ai_cache(prune, clear):
+        """Show AI response cache statistics, optionally pruning or clearing it"""
+        from app.services.ai_cache_service import AICacheService
+        
+        cache_service = AICacheService()
+        if clear:
+            cache_service.clear()
+        elif prune:
+            click.echo(f'Entries removed: {cache_service.prune()}')
+        for name, value in cache_service.get_stats().items():
+            click.echo(f'{name}: {value}')
+    
+    @app.cli.command('reconcile-counters')
+    def reconcile_counters():
+        """Recompute denormalized post and user counters"""
+        from app.services.counter_service import CounterService
+        from app.services.identity_service import IdentityService
+        
+        counter_service = CounterService()
+        posts_fixed = counter_service.reconcile_posts()
+        users_fixed = counter_service.reconcile_users()
+        db.session.commit()
+        if users_fixed:
+            IdentityService().clear()  # Cached profiles carry the old counts
+        click.echo(f'Posts corrected: {posts_fixed}')
+        click.echo(f'Users corrected: {users_fixed}')
+    
+    @app.cli.command('rebuild-rankings')
+    def rebuild_rankings():
+        """Rescore recent posts and rebuild the explore and reels rankings"""
+        from app.services.ranking_service import RankingService
+        
+        for surface, count in RankingService().rebuild().items():
+            click.echo(f'{surface}: {count} posts ranked')
+    
+    @app.cli.command('rebuild-suggestions')
+    def rebuild_suggestions():
+        """Recompute every user's follow suggestions from the follow graph"""
+        from app.services.suggestion_service import SuggestionService
+        
+        click.echo(f'Suggestions stored: {SuggestionService().rebuild()}')
+    
+    @app.cli.command('reindex-search')
+    def reindex_search():
+        """Rebuild the full-text search index from stories, posts and comments"""
+        from app.services.search_service import SearchService
+        
+        indexed = SearchService().reindex()
+        db.session.commit()
+        click.echo(f'Documents indexed: {indexed}')
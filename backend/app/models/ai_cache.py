@@ -0,0 +1,13 @@
+from app import db
+from datetime import datetime
+
+class AICacheEntry(db.Model):
+    """A stored model response, addressed by a hash of everything that shaped it"""
+    __tablename__ = 'ai_cache_entries'
+    
+    key = db.Column(db.String(64), primary_key=True)  # SHA-256 hex
+    response = db.Column(db.Text, nullable=False)
+    hits = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    expires_at = db.Column(db.DateTime, index=True)
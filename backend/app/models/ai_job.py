@@ -0,0 +1,77 @@
+from app import db
+from datetime import datetime
+
+class AIJob(db.Model):
+    """A background AI request and its progress"""
+    __tablename__ = 'ai_jobs'
+
+    ACTIVE_STATUSES = ('pending', 'running', 'retrying')
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    story_id = db.Column(db.Integer, db.ForeignKey('stories.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False, default='enhance')
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, retrying, succeeded, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_ai_jobs_user_status', 'user_id', 'status'),
+        db.Index('ix_ai_jobs_story_status', 'story_id', 'status'),
+    )
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'story_id': self.story_id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class AIBatch(db.Model):
+    """Bulk enhancement of many stories, with progress counters"""
+    __tablename__ = 'ai_batches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    family_id = db.Column(db.Integer, db.ForeignKey('families.id'))
+    story_ids = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, succeeded, failed
+    total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    completed = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    failed = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    skipped = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Deleted or enhanced meanwhile
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (db.Index('ix_ai_batches_user_status', 'user_id', 'status'),)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'family_id': self.family_id,
+            'status': self.status,
+            'total': self.total,
+            'completed': self.completed,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'progress': round((self.completed + self.failed + self.skipped) / self.total, 3) if self.total else 1.0,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,53 @@
+from app import db
+from datetime import datetime
+
+class ArchivedStory(db.Model):
+    """Expired story posts moved out of the posts table by the sweeper"""
+    __tablename__ = 'archived_stories'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # Original post ID
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    family_id = db.Column(db.Integer, db.ForeignKey('families.id'))
+    caption = db.Column(db.Text)
+    media_urls = db.Column(db.JSON)
+    media_variants = db.Column(db.JSON)  # As on the post: sized URLs and placeholder per media_urls entry
+    media_type = db.Column(db.String(20))
+    location = db.Column(db.String(255))
+    visibility = db.Column(db.String(20))
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime)
+    expired_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_archived_stories_user_created', 'user_id', 'created_at'),)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'family_id': self.family_id,
+            'caption': self.caption,
+            'media_urls': self.media_urls,
+            'media_variants': self.media_variants or [None] * len(self.media_urls or []),
+            'media_type': self.media_type,
+            'location': self.location,
+            'is_story': True,
+            'visibility': self.visibility,
+            'created_at': self.created_at.isoformat(),
+            'expired_at': self.expired_at.isoformat() if self.expired_at else None,
+            'archived_at': self.archived_at.isoformat(),
+            'likes_count': self.likes_count or 0,
+            'comments_count': self.comments_count or 0
+        }
+
+class ArchivedStoryMedia(db.Model):
+    """Pipeline media an archived story still shows, moved over from its post_media links"""
+    __tablename__ = 'archived_story_media'
+
+    id = db.Column(db.Integer, primary_key=True)
+    archived_story_id = db.Column(db.Integer, db.ForeignKey('archived_stories.id'), nullable=False, index=True)
+    media_id = db.Column(db.Integer, db.ForeignKey('media.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('archived_story_id', 'media_id'),)
@@ -34,6 +34,11 @@ class FamilyMember(db.Model):
     role_in_family = db.Column(db.String(20), default='member')
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_family_members_family_user', 'family_id', 'user_id'),
+        db.Index('ix_family_members_user_family', 'user_id', 'family_id'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='family_memberships')
     
@@ -9,7 +9,10 @@ class Follow(db.Model):
     following_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    __table_args__ = (db.UniqueConstraint('follower_id', 'following_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('follower_id', 'following_id'),
+        db.Index('ix_follows_following_follower', 'following_id', 'follower_id'),
+    )
     
     # Relationships
     follower = db.relationship('User', foreign_keys=[follower_id], backref='following_relationships')
@@ -0,0 +1,86 @@
+from app import db
+from datetime import datetime
+
+class Media(db.Model):
+    """An uploaded file; stored and post-processed by the media pipeline"""
+    __tablename__ = 'media'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    media_type = db.Column(db.String(20), nullable=False)  # image, video, audio
+    folder = db.Column(db.String(50), nullable=False, default='posts')
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, processing, ready, failed
+    content_hash = db.Column(db.String(64))  # SHA-256 of the original upload
+    source_path = db.Column(db.String(500))  # Spooled original, removed once processed
+    url = db.Column(db.String(500))
+    thumbnail_url = db.Column(db.String(500))
+    variants = db.Column(db.JSON)  # Size name -> URL: thumb, grid, full
+    placeholder = db.Column(db.Text)  # Tiny JPEG data URI, shown blurred while loading
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    public_id = db.Column(db.String(255))
+    duration = db.Column(db.Float)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.media_type,
+            'folder': self.folder,
+            'status': self.status,
+            'url': self.url,
+            'thumbnail_url': self.thumbnail_url,
+            'variants': self.variants,
+            'placeholder': self.placeholder,
+            'width': self.width,
+            'height': self.height,
+            'public_id': self.public_id,
+            'duration': self.duration,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None
+        }
+
+class PostMedia(db.Model):
+    """Links a post to pipeline media, so the post can be published first"""
+    __tablename__ = 'post_media'
+
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
+    media_id = db.Column(db.Integer, db.ForeignKey('media.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('post_id', 'media_id'),)
+
+class MediaBlob(db.Model):
+    """A stored file, shared by every upload with the same content.
+
+    ref_count counts the uploads handed this file; storage is only deleted
+    once the last of them is released.
+    """
+    __tablename__ = 'media_blobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of the original upload
+    media_type = db.Column(db.String(20), nullable=False)
+    processed = db.Column(db.Boolean, nullable=False, default=False, server_default='0')  # Converted and resized by the pipeline
+    public_id = db.Column(db.String(255), nullable=False, unique=True)
+    url = db.Column(db.String(500), nullable=False)
+    thumbnail_url = db.Column(db.String(500))
+    variants = db.Column(db.JSON)
+    variant_public_ids = db.Column(db.JSON)  # Variants stored as separate files, deleted with the blob
+    placeholder = db.Column(db.Text)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    duration = db.Column(db.Float)
+    size = db.Column(db.BigInteger)
+    ref_count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('content_hash', 'media_type', 'processed'),)
+
+    def to_result(self):
+        """Same shape as a storage backend's save() result"""
+        return {'url': self.url, 'public_id': self.public_id, 'duration': self.duration}
@@ -10,9 +10,10 @@ class Conversation(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_message_id = db.Column(db.Integer, db.ForeignKey('messages.id', use_alter=True, name='fk_conversations_last_message_id'))
     
     # Relationships
-    messages = db.relationship('Message', backref='conversation', lazy=True)
+    messages = db.relationship('Message', backref='conversation', lazy=True, foreign_keys='Message.conversation_id')
     participants = db.relationship('ConversationParticipant', backref='conversation', lazy=True)
 
 class ConversationParticipant(db.Model):
@@ -23,6 +24,12 @@ class ConversationParticipant(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_read_at = db.Column(db.DateTime)
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Messages from others since last_read_at
+    
+    __table_args__ = (
+        db.Index('ix_conversation_participants_user_conversation', 'user_id', 'conversation_id'),
+        db.Index('ix_conversation_participants_conversation_user', 'conversation_id', 'user_id'),
+    )
     
     # Relationships
     user = db.relationship('User', backref='conversation_participations')
@@ -40,6 +47,8 @@ class Message(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     edited_at = db.Column(db.DateTime)
     
+    __table_args__ = (db.Index('ix_messages_conversation_created', 'conversation_id', 'created_at'),)
+    
     # Relationships
     sender = db.relationship('User', backref='sent_messages')
     reply_to = db.relationship('Message', remote_side=[id])
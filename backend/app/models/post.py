@@ -9,19 +9,36 @@ class Post(db.Model):
     family_id = db.Column(db.Integer, db.ForeignKey('families.id'))
     caption = db.Column(db.Text)
     media_urls = db.Column(db.JSON)  # Array of media URLs
+    media_variants = db.Column(db.JSON)  # Per media_urls entry: sized URLs and placeholder, or null
+    pending_media = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Linked media still processing
     media_type = db.Column(db.String(20), default='photo')  # photo, video, carousel
     location = db.Column(db.String(255))
     is_story = db.Column(db.Boolean, default=False)
     is_reel = db.Column(db.Boolean, default=False)
     story_expires_at = db.Column(db.DateTime)
     visibility = db.Column(db.String(20), default='public')  # public, family, close_friends
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    saves_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_posts_user_story_created', 'user_id', 'is_story', 'created_at'),
+        db.Index('ix_posts_reel_created', 'is_reel', 'created_at'),
+        # Unexpired-story lookups; expiry is compared at query time since now() cannot be indexed
+        db.Index('ix_posts_active_stories', 'user_id', 'story_expires_at',
+                 sqlite_where=db.text('is_story = 1'), postgresql_where=db.text('is_story = true')),
+        db.Index('ix_posts_story_expiry', 'story_expires_at',
+                 sqlite_where=db.text('is_story = 1'), postgresql_where=db.text('is_story = true')),
+    )
+    
     # Relationships
     likes = db.relationship('Like', backref='post', lazy=True, cascade='all, delete-orphan')
     comments = db.relationship('PostComment', backref='post', lazy=True, cascade='all, delete-orphan')
     saves = db.relationship('SavedPost', backref='post', lazy=True, cascade='all, delete-orphan')
+    views = db.relationship('StoryView', backref='post', lazy=True, cascade='all, delete-orphan')
+    media_links = db.relationship('PostMedia', backref='post', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -30,14 +47,16 @@ class Post(db.Model):
             'family_id': self.family_id,
             'caption': self.caption,
             'media_urls': self.media_urls,
+            'media_variants': self.media_variants or [None] * len(self.media_urls or []),
             'media_type': self.media_type,
+            'media_pending': bool(self.pending_media),
             'location': self.location,
             'is_story': self.is_story,
             'is_reel': self.is_reel,
             'visibility': self.visibility,
             'created_at': self.created_at.isoformat(),
-            'likes_count': len(self.likes),
-            'comments_count': len(self.comments),
+            'likes_count': self.likes_count or 0,
+            'comments_count': self.comments_count or 0,
             'author': self.author.to_dict() if self.author else None
         }
 
@@ -46,7 +65,7 @@ class Like(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     __table_args__ = (db.UniqueConstraint('user_id', 'post_id'),)
@@ -61,6 +80,8 @@ class PostComment(db.Model):
     parent_id = db.Column(db.Integer, db.ForeignKey('post_comments.id'))  # For replies
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (db.Index('ix_post_comments_post_created', 'post_id', 'created_at'),)
+    
     # Relationships
     user = db.relationship('User', backref='post_comments')
     replies = db.relationship('PostComment', backref=db.backref('parent', remote_side=[id]))
@@ -70,6 +91,16 @@ class SavedPost(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('user_id', 'post_id'),)
+
+class StoryView(db.Model):
+    __tablename__ = 'story_views'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Viewer
     post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -0,0 +1,16 @@
+from app import db
+from datetime import datetime
+
+class PostRank(db.Model):
+    """A post's position in a precomputed ranking (explore, reels)"""
+    __tablename__ = 'post_ranks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    surface = db.Column(db.String(20), nullable=False)  # explore, reels
+    rank = db.Column(db.Integer, nullable=False)  # 1 is the top post
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Pages are read as a range of ranks on this index
+    __table_args__ = (db.UniqueConstraint('surface', 'rank'),)
@@ -0,0 +1,71 @@
+from sqlalchemy import DDL, event
+from app import db
+
+# What PostgreSQL's GIN index covers; queries must use the same expression to be served by it
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', body), 'B'))"
+)
+
+# SQLite keeps an FTS5 index over the same rows, in step through triggers
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE OF title, body ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+class SearchDocument(db.Model):
+    """Searchable text of a story, post or comment, with the visibility of what it belongs to.
+
+    Comments are found through the story or post they were left on
+    (target_type, target_id), and are visible to whoever can see it.
+    """
+    __tablename__ = 'search_documents'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # story, post, story_comment, post_comment
+    source_id = db.Column(db.Integer, nullable=False)  # Row id in the kind's own table
+    target_type = db.Column(db.String(20), nullable=False)  # story, post
+    target_id = db.Column(db.Integer, nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)  # Author of the target, whose visibility applies
+    author_id = db.Column(db.Integer, nullable=False)  # Who wrote this text
+    family_id = db.Column(db.Integer)
+    visibility = db.Column(db.String(20), nullable=False)
+    title = db.Column(db.String(255))
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'source_id'),
+        db.Index('ix_search_documents_target', 'target_type', 'target_id'),
+        db.Index('ix_search_documents_vector', db.text(SEARCH_VECTOR), postgresql_using='gin').ddl_if(
+            dialect='postgresql'
+        ),
+    )
+
+    def to_dict(self):
+        return {
+            'type': self.kind,
+            'id': self.source_id,
+            'target_type': self.target_type,
+            'target_id': self.target_id,
+            'author_id': self.author_id,
+            'family_id': self.family_id,
+            'title': self.title,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(SearchDocument.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(
+    SearchDocument.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS search_documents_fts').execute_if(dialect='sqlite')
+)
@@ -20,6 +20,11 @@ class Story(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_stories_family_created', 'family_id', 'created_at'),
+        db.Index('ix_stories_user_created', 'user_id', 'created_at'),
+    )
+    
     # Relationships
     comments = db.relationship('Comment', backref='story', lazy=True, cascade='all, delete-orphan')
     
@@ -47,7 +52,7 @@ class Comment(db.Model):
     __tablename__ = 'comments'
     
     id = db.Column(db.Integer, primary_key=True)
-    story_id = db.Column(db.Integer, db.ForeignKey('stories.id'), nullable=False)
+    story_id = db.Column(db.Integer, db.ForeignKey('stories.id'), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
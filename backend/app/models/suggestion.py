@@ -0,0 +1,28 @@
+from app import db
+from datetime import datetime
+
+class FollowSuggestion(db.Model):
+    """A precomputed "suggested for you" entry: someone a user may want to follow"""
+    __tablename__ = 'follow_suggestions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Who sees the suggestion
+    suggested_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    mutual_count = db.Column(db.Integer, nullable=False, default=0)  # Followed users who follow them
+    shared_families = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'suggested_id'),
+        db.Index('ix_follow_suggestions_user_score', 'user_id', 'score'),
+    )
+
+    suggested = db.relationship('User', foreign_keys=[suggested_id])
+
+    def to_dict(self):
+        return {
+            'user': self.suggested.to_dict(),
+            'mutual_count': self.mutual_count,
+            'shared_families': self.shared_families
+        }
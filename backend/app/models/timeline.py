@@ -0,0 +1,17 @@
+from app import db
+from datetime import datetime
+
+class TimelineEntry(db.Model):
+    __tablename__ = 'timeline_entries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Timeline owner
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Copied from the post for ordering
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'post_id'),
+        db.Index('ix_timeline_entries_user_created', 'user_id', 'created_at'),
+        db.Index('ix_timeline_entries_user_author', 'user_id', 'author_id'),
+    )
@@ -0,0 +1,30 @@
+from app import db
+from datetime import datetime
+
+class UploadSession(db.Model):
+    """A chunked upload in progress; parts are spooled to a file on disk"""
+    __tablename__ = 'upload_sessions'
+    
+    id = db.Column(db.String(32), primary_key=True)  # Random hex, doubles as the resume token
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    upload_type = db.Column(db.String(20), nullable=False)  # image, video, audio
+    folder = db.Column(db.String(50), nullable=False, default='posts')
+    filename = db.Column(db.String(255), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_size = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    status = db.Column(db.String(20), nullable=False, default='uploading')  # uploading, complete, failed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def to_dict(self):
+        return {
+            'upload_id': self.id,
+            'upload_type': self.upload_type,
+            'folder': self.folder,
+            'filename': self.filename,
+            'total_size': self.total_size,
+            'offset': self.received_size,
+            'status': self.status,
+            'expires_at': self.expires_at.isoformat()
+        }
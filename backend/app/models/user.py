@@ -8,7 +8,7 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     username = db.Column(db.String(50), unique=True, nullable=True)
-    email = db.Column(db.String(150), nullable=False)
+    email = db.Column(db.String(150), nullable=False, index=True)
     password_hash = db.Column(db.Text, nullable=False)
     role = db.Column(db.String(20), default='member')
     is_verified = db.Column(db.Boolean, default=False)
@@ -20,26 +20,16 @@ class User(db.Model):
     birthday = db.Column(db.Date, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Denormalized counters, maintained by CounterService
+    followers_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    following_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    posts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Excludes stories
+    
     # Relationships
     stories = db.relationship('Story', backref='author', lazy=True)
     families_created = db.relationship('Family', backref='creator', lazy=True)
     posts = db.relationship('Post', backref='author', lazy=True)
     
-    # Follow relationships
-    @property
-    def followers_count(self):
-        from app.models.follow import Follow
-        return Follow.query.filter_by(following_id=self.id).count()
-    
-    @property
-    def following_count(self):
-        from app.models.follow import Follow
-        return Follow.query.filter_by(follower_id=self.id).count()
-    
-    @property
-    def posts_count(self):
-        return len([p for p in self.posts if not p.is_story])
-    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
@@ -61,7 +51,7 @@ class User(db.Model):
             'gender': self.gender,
             'birthday': self.birthday.isoformat() if self.birthday else None,
             'created_at': self.created_at.isoformat(),
-            'followers_count': self.followers_count,
-            'following_count': self.following_count,
-            'posts_count': self.posts_count
+            'followers_count': self.followers_count or 0,
+            'following_count': self.following_count or 0,
+            'posts_count': self.posts_count or 0
         }
\ No newline at end of file
@@ -1,8 +1,34 @@
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Response, stream_with_context
 from app import db
 from app.models.story import Story
+from app.models.ai_job import AIJob, AIBatch
+from app.services.ai_job_service import AIJobService
+from app.services.ai_batch_service import AIBatchService
+from app.services.ai_backends import AIServiceError
 from app.services.ai_service import AIService
+from app.services.family_access_service import FamilyAccessService
+from app.services.search_service import SearchService
+import json
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def enhancement_error(story, current_user_id):
+    """Error response if the user may not enhance this story, else None"""
+    # Check if user owns the story or has family access
+    if story.user_id != current_user_id:
+        # TODO: Check if user is family member
+        return {'error': 'Access denied'}, 403
+    
+    if not story.content:
+        return {'error': 'No content to enhance'}, 400
+    
+    if story.ai_enhanced:
+        return {'error': 'Story already enhanced'}, 400
+    
+    return None
 
 class EnhanceStoryResource(Resource):
     @jwt_required()
@@ -10,38 +36,160 @@ class EnhanceStoryResource(Resource):
         current_user_id = get_jwt_identity()
         story = Story.query.get_or_404(story_id)
         
-        # Check if user owns the story or has family access
-        if story.user_id != current_user_id:
-            # TODO: Check if user is family member
-            return {'error': 'Access denied'}, 403
+        error = enhancement_error(story, current_user_id)
+        if error:
+            return error
+        
+        # Enhancement runs in the background; the client polls the job
+        job_service = AIJobService()
+        job = job_service.active_job_for_story(story.id)
+        if job:
+            return {'message': 'Enhancement already in progress', 'job': job.to_dict()}, 202
+        
+        if job_service.at_capacity(current_user_id):
+            return {'error': 'Too many enhancements in progress, try again shortly'}, 429
+        
+        job = job_service.submit_enhancement(story, current_user_id)
+        db.session.refresh(job)  # Eager mode may already have finished it
+        if job.status == 'failed':
+            return {'error': 'Enhancement failed', 'details': job.error, 'job': job.to_dict()}, 503
+        
+        return {
+            'message': 'Enhancement started',
+            'job': job.to_dict()
+        }, 202
+
+class StreamEnhanceStoryResource(Resource):
+    @jwt_required()
+    def post(self, story_id):
+        current_user_id = get_jwt_identity()
+        # Locked until the job is recorded, so two requests cannot both start one
+        story = Story.query.filter_by(id=story_id).with_for_update().first_or_404()
+        
+        error = enhancement_error(story, current_user_id)
+        if error:
+            return error
         
-        if not story.content:
-            return {'error': 'No content to enhance'}, 400
+        job_service = AIJobService()
+        if job_service.active_job_for_story(story.id):
+            return {'error': 'Enhancement already in progress'}, 409
         
-        if story.ai_enhanced:
-            return {'error': 'Story already enhanced'}, 400
+        if job_service.at_capacity(current_user_id):
+            return {'error': 'Too many enhancements in progress, try again shortly'}, 429
         
-        # Enhance the story using AI
         try:
             ai_service = AIService()
-            result = ai_service.enhance_story(story.content, story.title)
-            
-            if not result['success']:
-                return {'error': 'Enhancement failed', 'details': result.get('error')}, 500
         except Exception as e:
             return {'error': 'AI service error', 'details': str(e)}, 500
         
-        # Update the story with enhanced content
-        story.enhanced_content = result['enhanced_content']
-        story.ai_enhanced = True
-        story.enhancement_accepted = False  # User needs to accept
+        content, title = story.content, story.title
+        # Commits, so no transaction stays open while the model streams
+        job_id = job_service.start_streamed(story, current_user_id).id
         
-        db.session.commit()
+        def stream():
+            fragments = []
+            error = 'Stream closed before the enhancement finished'
+            try:
+                for text in ai_service.stream_enhancement(content, title):
+                    fragments.append(text)
+                    yield sse('token', {'text': text})
+                
+                story = db.session.get(Story, story_id)
+                if story is None or story.ai_enhanced:
+                    error = 'Story changed during enhancement'
+                    yield sse('error', {'error': error})
+                    return
+                story.enhanced_content = ''.join(fragments).strip()
+                story.ai_enhanced = True
+                story.enhancement_accepted = False  # User needs to accept
+                SearchService().index_story(story)
+                job_service.mark_succeeded(job_id)
+                db.session.commit()
+                error = None
+                yield sse('done', {'story': story.to_dict()})
+            except AIServiceError as e:
+                error = str(e)
+                yield sse('error', {'error': 'Enhancement failed', 'details': error})
+            finally:
+                if error is not None:
+                    job_service.mark_failed(job_id, error)
+        
+        return Response(
+            stream_with_context(stream()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+class AIJobResource(Resource):
+    @jwt_required()
+    def get(self, job_id):
+        current_user_id = get_jwt_identity()
+        job = AIJob.query.get_or_404(job_id)
+        
+        if job.user_id != current_user_id:
+            return {'error': 'Access denied'}, 403
+        
+        result = {'job': job.to_dict()}
+        if job.status == 'succeeded':
+            story = Story.query.get(job.story_id)
+            result['story'] = story.to_dict() if story else None
+        return result
+
+class AIBatchesResource(Resource):
+    @jwt_required()
+    def post(self):
+        parser = reqparse.RequestParser()
+        parser.add_argument('family_id', type=int, location='json')
+        parser.add_argument('story_ids', type=list, location='json')
+        args = parser.parse_args()
+        
+        current_user_id = get_jwt_identity()
+        
+        if args['family_id'] is None and not args['story_ids']:
+            return {'error': 'family_id or story_ids is required'}, 400
+        
+        if args['family_id'] is not None:
+            if not FamilyAccessService().load(current_user_id).is_member(args['family_id']):
+                return {'error': 'Access denied'}, 403
+        
+        try:
+            requested_ids = [int(sid) for sid in args['story_ids']] if args['story_ids'] else None
+        except (TypeError, ValueError):
+            return {'error': 'story_ids must be a list of integers'}, 400
+        
+        batch_service = AIBatchService()
+        if batch_service.active_batch(current_user_id):
+            return {'error': 'A batch enhancement is already running'}, 429
+        
+        # Only the author's own stories can be enhanced, as with single enhancement
+        story_ids = batch_service.eligible_story_ids(
+            family_id=args['family_id'],
+            story_ids=requested_ids,
+            user_id=current_user_id
+        )
+        if not story_ids:
+            return {'error': 'No stories to enhance'}, 400
+        if len(story_ids) > batch_service.max_stories:
+            return {'error': f'At most {batch_service.max_stories} stories per batch'}, 400
+        
+        batch = batch_service.submit(current_user_id, story_ids, args['family_id'])
+        db.session.refresh(batch)
         
         return {
-            'message': 'Story enhanced successfully',
-            'story': story.to_dict()
-        }
+            'message': 'Batch enhancement started',
+            'batch': batch.to_dict()
+        }, 202
+
+class AIBatchResource(Resource):
+    @jwt_required()
+    def get(self, batch_id):
+        current_user_id = get_jwt_identity()
+        batch = AIBatch.query.get_or_404(batch_id)
+        
+        if batch.user_id != current_user_id:
+            return {'error': 'Access denied'}, 403
+        
+        return {'batch': batch.to_dict()}
 
 class AcceptEnhancementResource(Resource):
     @jwt_required()
@@ -62,6 +210,7 @@ class AcceptEnhancementResource(Resource):
             # If rejected, clear the enhanced content
             story.enhanced_content = None
             story.ai_enhanced = False
+            SearchService().index_story(story)
         
         db.session.commit()
         
@@ -72,4 +221,8 @@ class AcceptEnhancementResource(Resource):
 
 def register_ai_routes(api):
     api.add_resource(EnhanceStoryResource, '/stories/<int:story_id>/enhance')
-    api.add_resource(AcceptEnhancementResource, '/stories/<int:story_id>/accept-enhancement')
\ No newline at end of file
+    api.add_resource(StreamEnhanceStoryResource, '/stories/<int:story_id>/enhance/stream')
+    api.add_resource(AcceptEnhancementResource, '/stories/<int:story_id>/accept-enhancement')
+    api.add_resource(AIJobResource, '/ai/jobs/<int:job_id>')
+    api.add_resource(AIBatchesResource, '/ai/batches')
+    api.add_resource(AIBatchResource, '/ai/batches/<int:batch_id>')
\ No newline at end of file
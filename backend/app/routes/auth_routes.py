@@ -1,7 +1,13 @@
+from flask import request
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app import db
-from app.models.user import User
+from app.services.auth_service import AuthService, AuthError
+
+def auth_error(error):
+    """Response for an AuthError, with Retry-After when throttled"""
+    headers = {'Retry-After': str(error.retry_after)} if error.retry_after else None
+    return {'error': str(error), **error.details}, error.status, headers
 
 class RegisterResource(Resource):
     def post(self):
@@ -10,15 +16,11 @@ class RegisterResource(Resource):
             parser.add_argument('name', required=True)
             parser.add_argument('email', required=True)
             parser.add_argument('password', required=True)
+            parser.add_argument('username')  # Required when the email already has an account
             args = parser.parse_args()
             
-            # Allow multiple accounts per email - no check needed
-            
-            user = User(name=args['name'], email=args['email'])
-            user.set_password(args['password'])
-            
-            db.session.add(user)
-            db.session.commit()
+            # Several accounts may share an email; usernames tell them apart at sign-in
+            user = AuthService().register(args['name'], args['email'], args['password'], args['username'])
             
             access_token = create_access_token(identity=user.id)
             refresh_token = create_refresh_token(identity=user.id)
@@ -29,6 +31,9 @@ class RegisterResource(Resource):
                 'refresh_token': refresh_token,
                 'user': user.to_dict()
             }, 201
+        except AuthError as e:
+            db.session.rollback()
+            return auth_error(e)
         except Exception as e:
             db.session.rollback()
             return {'error': str(e)}, 500
@@ -36,20 +41,20 @@ class RegisterResource(Resource):
 class LoginResource(Resource):
     def post(self):
         parser = reqparse.RequestParser()
-        parser.add_argument('email', required=True)
+        parser.add_argument('email')
+        parser.add_argument('username')
         parser.add_argument('password', required=True)
         args = parser.parse_args()
         
-        users = User.query.filter_by(email=args['email']).all()
-        user = None
-        
-        for u in users:
-            if u.check_password(args['password']):
-                user = u
-                break
+        if not args['email'] and not args['username']:
+            return {'error': 'Email or username is required'}, 400
         
-        if not user:
-            return {'error': 'Invalid credentials'}, 401
+        try:
+            user = AuthService().authenticate(
+                args['password'], request.remote_addr, email=args['email'], username=args['username']
+            )
+        except AuthError as e:
+            return auth_error(e)
         
         access_token = create_access_token(identity=user.id)
         refresh_token = create_refresh_token(identity=user.id)
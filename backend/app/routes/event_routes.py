@@ -0,0 +1,38 @@
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Response, current_app, stream_with_context
+from app import db
+from app.services.pubsub_service import get_broker, user_channel
+import json
+
+class EventStreamResource(Resource):
+    # EventSource cannot send headers, so the token may also come as ?jwt=
+    @jwt_required(locations=['headers', 'query_string'])
+    def get(self):
+        current_user_id = get_jwt_identity()
+        keepalive = current_app.config.get('EVENT_STREAM_KEEPALIVE', 15)
+        subscription = get_broker().subscribe(user_channel(current_user_id))
+        
+        def stream():
+            try:
+                yield ': connected\n\n'
+                while True:
+                    event = subscription.get(timeout=keepalive)
+                    if event is None:
+                        yield ': keepalive\n\n'
+                        continue
+                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+            finally:
+                subscription.close()
+        
+        # The stream keeps the request context alive for as long as the client
+        # listens; hand back the connection the user lookup checked out
+        db.session.remove()
+        return Response(
+            stream_with_context(stream()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+def register_event_routes(api):
+    api.add_resource(EventStreamResource, '/events/stream')
@@ -2,6 +2,9 @@ from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.family import Family, FamilyMember
+from app.services.family_access_service import FamilyAccessService
+from app.services.response_cache_service import ResponseCache
+from app.utils.serializers import serialize_families, serialize_family_members
 
 class FamiliesResource(Resource):
     @jwt_required()
@@ -9,10 +12,11 @@ class FamiliesResource(Resource):
         current_user_id = get_jwt_identity()
         
         # Get families where user is a member
-        memberships = FamilyMember.query.filter_by(user_id=current_user_id).all()
-        families = [membership.family.to_dict() for membership in memberships]
+        families = Family.query.join(
+            FamilyMember, FamilyMember.family_id == Family.id
+        ).filter(FamilyMember.user_id == current_user_id).order_by(FamilyMember.id).all()
         
-        return {'families': families}
+        return {'families': serialize_families(families)}
     
     @jwt_required()
     def post(self):
@@ -42,6 +46,7 @@ class FamiliesResource(Resource):
         
         db.session.add(member)
         db.session.commit()
+        FamilyAccessService().invalidate(current_user_id)
         
         return {'message': 'Family created', 'family': family.to_dict()}, 201
 
@@ -51,18 +56,25 @@ class FamilyResource(Resource):
         current_user_id = get_jwt_identity()
         
         # Check membership
-        member = FamilyMember.query.filter_by(
-            family_id=family_id, 
-            user_id=current_user_id
-        ).first()
-        if not member:
+        if not FamilyAccessService().load(current_user_id).is_member(family_id):
             return {'error': 'Access denied'}, 403
         
         family = Family.query.get_or_404(family_id)
-        family_dict = family.to_dict()
-        family_dict['members'] = [m.to_dict() for m in family.members]
+        members = FamilyMember.query.filter_by(family_id=family_id).order_by(FamilyMember.id).all()
         
-        return {'family': family_dict}
+        def render():
+            family_dict = family.to_dict()
+            family_dict['members'] = serialize_family_members(members)
+            return {'family': family_dict}
+        
+        # Families and memberships have no version column, so their few fields are the stamp
+        cache = ResponseCache()
+        return cache.respond(
+            render,
+            'family', family.id, family.name, family.description,
+            [(m.id, m.user_id, m.relation, m.role_in_family) for m in members],
+            cache.tokens('user', [m.user_id for m in members])
+        )
 
 def register_family_routes(api):
     api.add_resource(FamiliesResource, '/families')
@@ -3,6 +3,32 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.follow import Follow, CloseFriend
 from app.models.user import User
+from app.services.timeline_service import TimelineService
+from app.services.counter_service import CounterService
+from app.services.story_tray_service import StoryTrayService
+from app.services.suggestion_service import SuggestionService
+from app.services.identity_service import IdentityService
+from app.services.response_cache_service import ResponseCache
+from app.utils.serializers import serialize_users, serialize_suggestions
+
+def follow_list(key, owner_column, listed_column, user_id):
+    """Users on one side of user_id's follows, in id order, as a cached response.
+
+    The ids come from the covering follows index; users are only loaded
+    when the response has to be rendered.
+    """
+    ids = [r[0] for r in db.session.query(listed_column).filter(
+        owner_column == user_id
+    ).order_by(listed_column).all()]
+    
+    def render():
+        users = db.session.query(User).join(
+            Follow, listed_column == User.id
+        ).filter(owner_column == user_id).order_by(listed_column).all()
+        return {key: serialize_users(users)}
+    
+    cache = ResponseCache()
+    return cache.respond(render, key, user_id, ids, cache.tokens('user', ids))
 
 class FollowResource(Resource):
     @jwt_required()
@@ -17,38 +43,48 @@ class FollowResource(Resource):
             following_id=user_id
         ).first()
         
+        timeline_service = TimelineService()
+        counter_service = CounterService()
+        
         if existing_follow:
             db.session.delete(existing_follow)
+            timeline_service.prune(current_user_id, user_id)
+            counter_service.record_follow(current_user_id, user_id, -1)
             action = 'unfollowed'
         else:
             follow = Follow(follower_id=current_user_id, following_id=user_id)
             db.session.add(follow)
+            timeline_service.backfill(current_user_id, user_id)
+            counter_service.record_follow(current_user_id, user_id)
             action = 'followed'
         
         db.session.commit()
+        StoryTrayService().invalidate(current_user_id)
+        IdentityService().invalidate(current_user_id, user_id)  # Follower counts changed
+        SuggestionService().queue_update(current_user_id, user_id)
         return {'message': f'User {action}'}
 
 class FollowersResource(Resource):
     @jwt_required()
     def get(self, user_id):
-        followers = db.session.query(Follow, User).join(
-            User, Follow.follower_id == User.id
-        ).filter(Follow.following_id == user_id).all()
-        
-        return {
-            'followers': [user.to_dict() for follow, user in followers]
-        }
+        return follow_list('followers', Follow.following_id, Follow.follower_id, user_id)
 
 class FollowingResource(Resource):
     @jwt_required()
     def get(self, user_id):
-        following = db.session.query(Follow, User).join(
-            User, Follow.following_id == User.id
-        ).filter(Follow.follower_id == user_id).all()
+        return follow_list('following', Follow.follower_id, Follow.following_id, user_id)
+
+class SuggestionsResource(Resource):
+    @jwt_required()
+    def get(self):
+        parser = reqparse.RequestParser()
+        parser.add_argument('limit', type=int, location='args')
+        args = parser.parse_args()
         
-        return {
-            'following': [user.to_dict() for follow, user in following]
-        }
+        current_user_id = get_jwt_identity()
+        suggestions = SuggestionService().get_suggestions(current_user_id, args['limit'])
+        
+        return {'suggestions': serialize_suggestions(suggestions)}
 
 class CloseFriendsResource(Resource):
     @jwt_required()
@@ -60,7 +96,7 @@ class CloseFriendsResource(Resource):
         ).filter(CloseFriend.user_id == current_user_id).all()
         
         return {
-            'close_friends': [user.to_dict() for cf, user in close_friends]
+            'close_friends': serialize_users([user for cf, user in close_friends])
         }
     
     @jwt_required()
@@ -94,4 +130,5 @@ def register_follow_routes(api):
     api.add_resource(FollowResource, '/users/<int:user_id>/follow')
     api.add_resource(FollowersResource, '/users/<int:user_id>/followers')
     api.add_resource(FollowingResource, '/users/<int:user_id>/following')
+    api.add_resource(SuggestionsResource, '/users/suggestions')
     api.add_resource(CloseFriendsResource, '/close-friends')
\ No newline at end of file
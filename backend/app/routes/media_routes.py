@@ -0,0 +1,25 @@
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import current_app, send_from_directory
+from app.models.media import Media
+
+class MediaResource(Resource):
+    @jwt_required()
+    def get(self, media_id):
+        """Processing status of an upload"""
+        media = Media.query.get_or_404(media_id)
+        if media.user_id != get_jwt_identity():
+            return {'error': 'Access denied'}, 403
+        return {'media': media.to_dict()}
+
+class MediaFileResource(Resource):
+    def get(self, filename):
+        """Serve files kept by the local storage backend"""
+        if current_app.config.get('MEDIA_STORAGE_BACKEND') != 'local':
+            return {'error': 'Not found'}, 404
+        # Stored names are random and never rewritten, so they can be cached for good
+        return send_from_directory(current_app.config['MEDIA_ROOT'], filename, max_age=365 * 86400)
+
+def register_media_routes(api):
+    api.add_resource(MediaResource, '/media/<int:media_id>')
+    api.add_resource(MediaFileResource, '/media/files/<path:filename>')
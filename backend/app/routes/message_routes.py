@@ -1,35 +1,59 @@
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request
+from collections import defaultdict
+from datetime import datetime
 from app import db
 from app.models.message import Conversation, ConversationParticipant, Message
 from app.models.user import User
 from app.models.follow import Follow
 from sqlalchemy import or_, and_
-from app.models.user import User
-from app.models.follow import Follow
-from sqlalchemy import or_, and_
+from app.utils.pagination import keyset_paginate
+from app.utils.serializers import serialize_messages
+from app.services.pubsub_service import publish_to_users
+
+def participant_ids(conversation_id):
+    rows = db.session.query(ConversationParticipant.user_id).filter_by(conversation_id=conversation_id).all()
+    return [r[0] for r in rows]
 
 class ConversationsResource(Resource):
     @jwt_required()
     def get(self):
         current_user_id = get_jwt_identity()
         
-        conversations = db.session.query(Conversation).join(
-            ConversationParticipant
+        # Conversations with the current user's unread counter
+        rows = db.session.query(Conversation, ConversationParticipant.unread_count).join(
+            ConversationParticipant, ConversationParticipant.conversation_id == Conversation.id
         ).filter(ConversationParticipant.user_id == current_user_id).order_by(
             Conversation.updated_at.desc()
         ).all()
         
+        conversation_ids = [conv.id for conv, unread_count in rows]
+        
+        # Participants of every conversation in one query
+        participants = defaultdict(list)
+        if conversation_ids:
+            members = db.session.query(ConversationParticipant.conversation_id, User).join(
+                User, User.id == ConversationParticipant.user_id
+            ).filter(
+                ConversationParticipant.conversation_id.in_(conversation_ids)
+            ).order_by(ConversationParticipant.id).all()
+            for conversation_id, user in members:
+                participants[conversation_id].append(user)
+        
+        # Last messages from the denormalized pointer
+        last_messages = {}
+        last_message_ids = [conv.last_message_id for conv, unread_count in rows if conv.last_message_id]
+        if last_message_ids:
+            messages = Message.query.filter(Message.id.in_(last_message_ids)).all()
+            last_messages = {msg.id: data for msg, data in zip(messages, serialize_messages(messages))}
+        
         result = []
-        for conv in conversations:
-            # Get last message
-            last_message = Message.query.filter_by(
-                conversation_id=conv.id
-            ).order_by(Message.created_at.desc()).first()
+        for conv, unread_count in rows:
+            users = participants[conv.id]
             
             # Get other participants (exclude current user)
-            other_participants = [p.user for p in conv.participants if p.user_id != current_user_id]
+            other_participants = [u for u in users if u.id != current_user_id]
             
             # For direct messages, use the other person's name and avatar
             if not conv.is_group and other_participants:
@@ -40,34 +64,19 @@ class ConversationsResource(Resource):
                 name = conv.name or 'Group Chat'
                 avatar = 'https://picsum.photos/seed/group/150/150'
             
-            # Check unread count
-            participant = next((p for p in conv.participants if p.user_id == current_user_id), None)
-            unread_count = 0
-            if participant and participant.last_read_at:
-                unread_count = Message.query.filter(
-                    Message.conversation_id == conv.id,
-                    Message.created_at > participant.last_read_at,
-                    Message.sender_id != current_user_id
-                ).count()
-            elif participant:
-                unread_count = Message.query.filter(
-                    Message.conversation_id == conv.id,
-                    Message.sender_id != current_user_id
-                ).count()
-            
             result.append({
                 'id': conv.id,
                 'name': name,
                 'avatar': avatar,
                 'is_group': conv.is_group,
                 'updated_at': conv.updated_at.isoformat(),
-                'last_message': last_message.to_dict() if last_message else None,
-                'unread_count': unread_count,
+                'last_message': last_messages.get(conv.last_message_id),
+                'unread_count': unread_count or 0,
                 'participants': [{
-                    'id': p.user.id,
-                    'username': p.user.username,
-                    'profile_image': p.user.profile_image or f'https://picsum.photos/seed/{p.user.id}/150/150'
-                } for p in conv.participants]
+                    'id': u.id,
+                    'username': u.username,
+                    'profile_image': u.profile_image or f'https://picsum.photos/seed/{u.id}/150/150'
+                } for u in users]
             })
         
         return {'conversations': result}
@@ -125,6 +134,7 @@ class MessagesResource(Resource):
         parser = reqparse.RequestParser()
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('limit', type=int, default=50, location='args')
+        parser.add_argument('cursor', type=str, location='args')  # keyset mode; empty for newest page
         args = parser.parse_args()
         
         current_user_id = get_jwt_identity()
@@ -138,20 +148,43 @@ class MessagesResource(Resource):
         if not participant:
             return {'error': 'Access denied'}, 403
         
+        if args['cursor'] is not None:
+            # Walk backwards from the newest message; next_cursor points at older history
+            try:
+                messages, next_cursor = keyset_paginate(
+                    Message.query.filter_by(conversation_id=conversation_id),
+                    Message.created_at, Message.id, args['cursor'], args['limit']
+                )
+            except ValueError:
+                return {'error': 'Invalid cursor'}, 400
+            
+            # Serialize before committing so the commit does not expire the page
+            result = {
+                'messages': serialize_messages(list(reversed(messages))),
+                'next_cursor': next_cursor
+            }
+            
+            # Only the newest page moves the read marker
+            if not args['cursor']:
+                self.mark_read(participant)
+            
+            return result
+        
         messages = Message.query.filter_by(
             conversation_id=conversation_id
         ).order_by(Message.created_at.asc()).paginate(
             page=args['page'], per_page=args['limit'], error_out=False
         )
         
-        # Mark messages as read
-        participant.last_read_at = db.func.now()
-        db.session.commit()
-        
-        return {
-            'messages': [msg.to_dict() for msg in messages.items],
+        result = {
+            'messages': serialize_messages(messages.items),
             'total': messages.total
         }
+        
+        # Mark messages as read
+        self.mark_read(participant)
+        
+        return result
     
     @jwt_required()
     def post(self, conversation_id):
@@ -183,14 +216,60 @@ class MessagesResource(Resource):
         )
         
         db.session.add(message)
+        db.session.flush()  # Get message ID
         
-        # Update conversation timestamp
+        # Update conversation timestamp and inbox pointers
         conversation = Conversation.query.get(conversation_id)
         conversation.updated_at = db.func.now()
+        conversation.last_message_id = message.id
+        
+        ConversationParticipant.query.filter(
+            ConversationParticipant.conversation_id == conversation_id,
+            ConversationParticipant.user_id != current_user_id
+        ).update(
+            {ConversationParticipant.unread_count: ConversationParticipant.unread_count + 1},
+            synchronize_session=False
+        )
         
         db.session.commit()
         
-        return {'message': 'Message sent', 'message_data': message.to_dict()}, 201
+        message_data = message.to_dict()
+        publish_to_users(participant_ids(conversation_id), 'message', message_data)
+        
+        return {'message': 'Message sent', 'message_data': message_data}, 201
+    
+    def mark_read(self, participant):
+        participant.last_read_at = datetime.utcnow()
+        participant.unread_count = 0
+        db.session.commit()
+        
+        others = [uid for uid in participant_ids(participant.conversation_id) if uid != participant.user_id]
+        publish_to_users(others, 'read', {
+            'conversation_id': participant.conversation_id,
+            'user_id': participant.user_id,
+            'last_read_at': participant.last_read_at.isoformat()
+        })
+
+class TypingResource(Resource):
+    @jwt_required()
+    def post(self, conversation_id):
+        parser = reqparse.RequestParser()
+        parser.add_argument('is_typing', type=bool, default=True, location='json')
+        args = parser.parse_args()
+        
+        current_user_id = get_jwt_identity()
+        
+        user_ids = participant_ids(conversation_id)
+        if current_user_id not in user_ids:
+            return {'error': 'Access denied'}, 403
+        
+        publish_to_users([uid for uid in user_ids if uid != current_user_id], 'typing', {
+            'conversation_id': conversation_id,
+            'user_id': current_user_id,
+            'is_typing': args['is_typing']
+        })
+        
+        return {'message': 'Typing status sent'}
 
 class SearchUsersResource(Resource):
     @jwt_required()
@@ -219,4 +298,5 @@ class SearchUsersResource(Resource):
 def register_message_routes(api):
     api.add_resource(ConversationsResource, '/conversations')
     api.add_resource(MessagesResource, '/conversations/<int:conversation_id>/messages')
+    api.add_resource(TypingResource, '/conversations/<int:conversation_id>/typing')
     api.add_resource(SearchUsersResource, '/search/users')
\ No newline at end of file
@@ -3,8 +3,37 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.post import Post, Like, PostComment, SavedPost
 from app.models.follow import Follow
+from app.services.timeline_service import TimelineService
+from app.services.counter_service import CounterService
+from app.services.story_tray_service import StoryTrayService
+from app.services.media_pipeline_service import MediaPipelineService, MediaError
+from app.services.media_service import MediaService
+from app.services.ranking_service import RankingService
+from app.services.identity_service import IdentityService
+from app.services.response_cache_service import ResponseCache
+from app.services.search_service import SearchService
+from app.services.story_archive_service import StoryArchiveService
+from app.models.archive import ArchivedStory
+from app.utils.pagination import keyset_paginate
+from app.utils.serializers import serialize_posts
 from datetime import datetime, timedelta
 
+def paginate_posts(query, args, key):
+    """Serialize a post query with cursor pagination if requested, else page/limit"""
+    if args['cursor'] is not None:
+        try:
+            items, next_cursor = keyset_paginate(query, Post.created_at, Post.id, args['cursor'], args['limit'])
+        except ValueError:
+            return {'error': 'Invalid cursor'}, 400
+        return {key: serialize_posts(items), 'next_cursor': next_cursor}
+    
+    page = query.paginate(page=args['page'], per_page=args['limit'], error_out=False)
+    return {
+        key: serialize_posts(page.items),
+        'total': page.total,
+        'pages': page.pages
+    }
+
 class PostsResource(Resource):
     @jwt_required()
     def get(self):
@@ -13,6 +42,7 @@ class PostsResource(Resource):
         parser.add_argument('user_id', type=int, location='args')  # filter by user
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('limit', type=int, default=10, location='args')
+        parser.add_argument('cursor', type=str, location='args')  # keyset mode; empty for first page
         args = parser.parse_args()
         
         current_user_id = get_jwt_identity()
@@ -25,33 +55,21 @@ class PostsResource(Resource):
                     Post.user_id == args['user_id'],
                     Post.story_expires_at > datetime.utcnow()
                 ).order_by(Post.created_at.desc()).all()
-                return {'stories': [story.to_dict() for story in stories]}
+                return {'stories': serialize_posts(stories)}
             
             elif args['type'] == 'reels':
                 reels = Post.query.filter(
                     Post.is_reel == True,
                     Post.user_id == args['user_id']
-                ).order_by(Post.created_at.desc()).paginate(
-                    page=args['page'], per_page=args['limit'], error_out=False
-                )
-                return {
-                    'reels': [reel.to_dict() for reel in reels.items],
-                    'total': reels.total,
-                    'pages': reels.pages
-                }
+                ).order_by(Post.created_at.desc())
+                return paginate_posts(reels, args, 'reels')
             
             else:  # regular posts
                 posts = Post.query.filter(
                     Post.is_story == False,
                     Post.user_id == args['user_id']
-                ).order_by(Post.created_at.desc()).paginate(
-                    page=args['page'], per_page=args['limit'], error_out=False
-                )
-                return {
-                    'posts': [post.to_dict() for post in posts.items],
-                    'total': posts.total,
-                    'pages': posts.pages
-                }
+                ).order_by(Post.created_at.desc())
+                return paginate_posts(posts, args, 'posts')
         
         if args['type'] == 'stories':
             # Get stories from followed users (last 24 hours)
@@ -64,41 +82,51 @@ class PostsResource(Resource):
                 Post.story_expires_at > datetime.utcnow()
             ).order_by(Post.created_at.desc()).all()
             
-            return {'stories': [story.to_dict() for story in stories]}
+            return {'stories': serialize_posts(stories)}
         
-        elif args['type'] == 'reels':
-            reels = Post.query.filter_by(is_reel=True).order_by(Post.created_at.desc()).paginate(
+        elif args['type'] in ('reels', 'explore'):
+            key = 'reels' if args['type'] == 'reels' else 'posts'
+            ranking_service = RankingService()
+            
+            if not ranking_service.is_ranked(args['type']):
+                # Nothing ranked yet; newest public posts first
+                posts = Post.query.filter(Post.is_story == False, Post.visibility == 'public')
+                if args['type'] == 'reels':
+                    posts = posts.filter(Post.is_reel == True)
+                return paginate_posts(posts.order_by(Post.created_at.desc()), args, key)
+            
+            # Read the precomputed ranking
+            if args['cursor'] is not None:
+                try:
+                    posts, next_cursor = ranking_service.page(args['type'], args['cursor'], args['limit'])
+                except ValueError:
+                    return {'error': 'Invalid cursor'}, 400
+                return {key: serialize_posts(posts), 'next_cursor': next_cursor}
+            
+            page = ranking_service.ranked_query(args['type']).paginate(
                 page=args['page'], per_page=args['limit'], error_out=False
             )
-            return {
-                'reels': [reel.to_dict() for reel in reels.items],
-                'total': reels.total,
-                'pages': reels.pages
-            }
+            return {key: serialize_posts(page.items), 'total': page.total, 'pages': page.pages}
         
         else:  # feed
-            # Get posts from followed users
-            following_ids = db.session.query(Follow.following_id).filter_by(follower_id=current_user_id).all()
-            following_ids = [f[0] for f in following_ids] + [current_user_id]
+            # Read the precomputed home timeline
+            timeline_service = TimelineService()
             
-            posts = Post.query.filter(
-                Post.is_story == False,
-                Post.user_id.in_(following_ids)
-            ).order_by(Post.created_at.desc()).paginate(
-                page=args['page'], per_page=args['limit'], error_out=False
-            )
+            if args['cursor'] is not None:
+                try:
+                    posts, next_cursor = timeline_service.feed_page(current_user_id, args['cursor'], args['limit'])
+                except ValueError:
+                    return {'error': 'Invalid cursor'}, 400
+                return {'posts': serialize_posts(posts), 'next_cursor': next_cursor}
             
-            return {
-                'posts': [post.to_dict() for post in posts.items],
-                'total': posts.total,
-                'pages': posts.pages
-            }
+            return paginate_posts(timeline_service.feed_query(current_user_id), args, 'posts')
     
     @jwt_required()
     def post(self):
         parser = reqparse.RequestParser()
         parser.add_argument('caption', type=str, location='json')
         parser.add_argument('media_urls', type=list, location='json')
+        parser.add_argument('media_ids', type=int, action='append', location='json')  # From async uploads, may be pending
         parser.add_argument('media_type', type=str, default='photo', location='json')
         parser.add_argument('location', type=str, location='json')
         parser.add_argument('is_story', type=bool, default=False, location='json')
@@ -123,28 +151,147 @@ class PostsResource(Resource):
             post.story_expires_at = datetime.utcnow() + timedelta(hours=24)
         
         db.session.add(post)
+        db.session.flush()  # Get post ID
+        
+        try:
+            MediaPipelineService().attach(post, args['media_ids'])
+        except MediaError as e:
+            db.session.rollback()
+            return {'error': str(e)}, 400
+        
+        TimelineService().fan_out_post(post)
+        CounterService().record_post(post)
+        SearchService().index_post(post)
         db.session.commit()
         
+        if post.is_story:
+            StoryTrayService().invalidate_followers(current_user_id)
+        else:
+            IdentityService().invalidate(current_user_id)  # posts_count changed
+        
         return {'message': 'Post created', 'post': post.to_dict()}, 201
 
 class PostResource(Resource):
     @jwt_required()
     def get(self, post_id):
         post = Post.query.get_or_404(post_id)
-        return {'post': post.to_dict()}
+        # Edits and media changes move updated_at; engagement only moves the counters
+        cache = ResponseCache()
+        return cache.respond(
+            lambda: {'post': post.to_dict()},
+            'post', post.id, post.updated_at, post.likes_count, post.comments_count,
+            *cache.tokens('user', [post.user_id])
+        )
+    
+    @jwt_required()
+    def delete(self, post_id):
+        current_user_id = get_jwt_identity()
+        post = Post.query.get_or_404(post_id)
+        
+        if post.user_id != current_user_id:
+            return {'error': 'Access denied'}, 403
+        
+        is_story = post.is_story
+        released_media = MediaPipelineService().detach(post)
+        TimelineService().remove_post(post.id)
+        RankingService().remove_post(post.id)
+        SearchService().remove('post', post.id)
+        CounterService().record_post(post, -1)
+        db.session.delete(post)
+        db.session.commit()
+        
+        if is_story:
+            StoryTrayService().invalidate_followers(current_user_id)
+        else:
+            IdentityService().invalidate(current_user_id)
+        
+        # Stored files shared with other uploads stay until their last reference goes
+        media_service = MediaService()
+        for public_id in released_media:
+            media_service.delete_media(public_id)
+        
+        return {'message': 'Post deleted'}
+
+class StoryTrayResource(Resource):
+    @jwt_required()
+    def get(self):
+        current_user_id = get_jwt_identity()
+        return {'tray': StoryTrayService().get_tray(current_user_id)}
+
+class StoryArchiveResource(Resource):
+    @jwt_required()
+    def get(self):
+        parser = reqparse.RequestParser()
+        parser.add_argument('page', type=int, default=1, location='args')
+        parser.add_argument('limit', type=int, default=20, location='args')
+        parser.add_argument('cursor', type=str, location='args')  # keyset mode; empty for first page
+        args = parser.parse_args()
+        
+        current_user_id = get_jwt_identity()
+        
+        # The archive is private to its owner
+        query = ArchivedStory.query.filter_by(user_id=current_user_id)
+        
+        if args['cursor'] is not None:
+            try:
+                stories, next_cursor = keyset_paginate(
+                    query, ArchivedStory.created_at, ArchivedStory.id, args['cursor'], args['limit']
+                )
+            except ValueError:
+                return {'error': 'Invalid cursor'}, 400
+            return {'stories': [story.to_dict() for story in stories], 'next_cursor': next_cursor}
+        
+        stories = query.order_by(ArchivedStory.created_at.desc()).paginate(
+            page=args['page'], per_page=args['limit'], error_out=False
+        )
+        return {
+            'stories': [story.to_dict() for story in stories.items],
+            'total': stories.total,
+            'pages': stories.pages
+        }
+
+class ArchivedStoryResource(Resource):
+    @jwt_required()
+    def delete(self, story_id):
+        current_user_id = get_jwt_identity()
+        story = ArchivedStory.query.get_or_404(story_id)
+        
+        if story.user_id != current_user_id:
+            return {'error': 'Access denied'}, 403
+        
+        StoryArchiveService().delete(story)
+        return {'message': 'Archived story deleted'}
+
+class StoryViewResource(Resource):
+    @jwt_required()
+    def post(self, post_id):
+        current_user_id = get_jwt_identity()
+        post = Post.query.get_or_404(post_id)
+        
+        if not post.is_story:
+            return {'error': 'Not a story'}, 400
+        
+        if StoryTrayService().mark_viewed(current_user_id, post):
+            db.session.commit()
+        
+        return {'message': 'Story viewed'}
 
 class LikeResource(Resource):
     @jwt_required()
     def post(self, post_id):
         current_user_id = get_jwt_identity()
         
+        counter_service = CounterService()
+        
         existing_like = Like.query.filter_by(user_id=current_user_id, post_id=post_id).first()
         if existing_like:
             db.session.delete(existing_like)
+            counter_service.increment_post(post_id, 'likes_count', -1)
             action = 'unliked'
         else:
             like = Like(user_id=current_user_id, post_id=post_id)
             db.session.add(like)
+            counter_service.increment_post(post_id, 'likes_count')
             action = 'liked'
         
         db.session.commit()
@@ -168,12 +315,19 @@ class CommentResource(Resource):
         )
         
         db.session.add(comment)
+        CounterService().increment_post(post_id, 'comments_count')
+        db.session.flush()  # Get comment ID
+        SearchService().index_comment(comment)
         db.session.commit()
         
         return {'message': 'Comment added', 'comment': comment.content}, 201
 
 def register_post_routes(api):
     api.add_resource(PostsResource, '/posts')
+    api.add_resource(StoryTrayResource, '/posts/stories/tray')
+    api.add_resource(StoryArchiveResource, '/posts/stories/archive')
+    api.add_resource(ArchivedStoryResource, '/posts/stories/archive/<int:story_id>')
     api.add_resource(PostResource, '/posts/<int:post_id>')
+    api.add_resource(StoryViewResource, '/posts/<int:post_id>/view')
     api.add_resource(LikeResource, '/posts/<int:post_id>/like')
     api.add_resource(CommentResource, '/posts/<int:post_id>/comments')
\ No newline at end of file
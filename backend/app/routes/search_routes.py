@@ -0,0 +1,41 @@
+from flask_restful import Resource, reqparse
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.family_access_service import FamilyAccessService
+from app.services.search_service import SearchService, KINDS
+
+class SearchResource(Resource):
+    @jwt_required()
+    def get(self):
+        parser = reqparse.RequestParser()
+        parser.add_argument('q', type=str, required=True, location='args')
+        parser.add_argument('type', type=str, location='args')  # stories, posts, comments; all by default
+        parser.add_argument('family_id', type=int, location='args')  # only this family's items
+        parser.add_argument('page', type=int, default=1, location='args')
+        parser.add_argument('limit', type=int, default=20, location='args')
+        args = parser.parse_args()
+
+        current_user_id = get_jwt_identity()
+
+        if args['type'] and args['type'] not in KINDS:
+            return {'error': f"type must be one of: {', '.join(KINDS)}"}, 400
+
+        if args['family_id'] is not None and \
+                not FamilyAccessService().load(current_user_id).is_member(args['family_id']):
+            return {'error': 'Access denied'}, 403
+
+        try:
+            results, has_more = SearchService().search(
+                current_user_id,
+                args['q'],
+                kinds=KINDS.get(args['type']),
+                family_id=args['family_id'],
+                page=args['page'],
+                limit=args['limit']
+            )
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return {'results': results, 'page': args['page'], 'has_more': has_more}
+
+def register_search_routes(api):
+    api.add_resource(SearchResource, '/search')
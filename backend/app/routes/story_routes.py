@@ -2,7 +2,11 @@ from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.story import Story
-from app.models.family import FamilyMember
+from app.services.family_access_service import FamilyAccessService
+from app.services.response_cache_service import ResponseCache
+from app.services.search_service import SearchService
+from app.utils.pagination import keyset_paginate
+from app.utils.serializers import serialize_stories
 
 class StoriesResource(Resource):
     @jwt_required()
@@ -11,6 +15,7 @@ class StoriesResource(Resource):
         parser.add_argument('family_id', type=int, location='args')
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('limit', type=int, default=10, location='args')
+        parser.add_argument('cursor', type=str, location='args')  # keyset mode; empty for first page
         args = parser.parse_args()
         
         current_user_id = get_jwt_identity()
@@ -19,16 +24,27 @@ class StoriesResource(Resource):
         
         if args['family_id']:
             # Check if user is member of family
-            member = FamilyMember.query.filter_by(
-                family_id=args['family_id'], 
-                user_id=current_user_id
-            ).first()
-            if not member:
+            access = FamilyAccessService().load(current_user_id)
+            if not access.is_member(args['family_id']):
                 return {'error': 'Access denied'}, 403
-            query = query.filter_by(family_id=args['family_id'])
+            # Other members' private stories stay hidden, as on the story itself
+            query = query.filter(Story.family_id == args['family_id'], access.story_filter())
         else:
             query = query.filter_by(user_id=current_user_id)
         
+        if args['cursor'] is not None:
+            try:
+                stories, next_cursor = keyset_paginate(
+                    query, Story.created_at, Story.id, args['cursor'], args['limit']
+                )
+            except ValueError:
+                return {'error': 'Invalid cursor'}, 400
+            
+            return {
+                'stories': serialize_stories(stories),
+                'next_cursor': next_cursor
+            }
+        
         stories = query.paginate(
             page=args['page'], 
             per_page=args['limit'], 
@@ -36,7 +52,7 @@ class StoriesResource(Resource):
         )
         
         return {
-            'stories': [story.to_dict() for story in stories.items],
+            'stories': serialize_stories(stories.items),
             'total': stories.total,
             'pages': stories.pages,
             'current_page': stories.page
@@ -55,11 +71,7 @@ class StoriesResource(Resource):
         current_user_id = get_jwt_identity()
         
         # Check family membership
-        member = FamilyMember.query.filter_by(
-            family_id=args['family_id'], 
-            user_id=current_user_id
-        ).first()
-        if not member:
+        if not FamilyAccessService().load(current_user_id).is_member(args['family_id']):
             return {'error': 'Access denied'}, 403
         
         story = Story(
@@ -72,6 +84,8 @@ class StoriesResource(Resource):
         )
         
         db.session.add(story)
+        db.session.flush()  # Get story ID
+        SearchService().index_story(story)
         db.session.commit()
         
         return {'message': 'Story created', 'story': story.to_dict()}, 201
@@ -83,18 +97,14 @@ class StoryResource(Resource):
         story = Story.query.get_or_404(story_id)
         
         # Check access permissions
-        if story.visibility == 'private' and story.user_id != current_user_id:
+        if not FamilyAccessService().load(current_user_id).can_view_story(story):
             return {'error': 'Access denied'}, 403
         
-        if story.visibility == 'family':
-            member = FamilyMember.query.filter_by(
-                family_id=story.family_id, 
-                user_id=current_user_id
-            ).first()
-            if not member:
-                return {'error': 'Access denied'}, 403
-        
-        return {'story': story.to_dict()}
+        cache = ResponseCache()
+        return cache.respond(
+            lambda: {'story': story.to_dict()},
+            'story', story.id, story.updated_at, *cache.tokens('user', [story.user_id])
+        )
     
     @jwt_required()
     def put(self, story_id):
@@ -117,6 +127,7 @@ class StoryResource(Resource):
         if args['visibility']:
             story.visibility = args['visibility']
         
+        SearchService().index_story(story)
         db.session.commit()
         return {'message': 'Story updated', 'story': story.to_dict()}
 
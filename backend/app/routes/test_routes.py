@@ -17,7 +17,8 @@ class TestAIResource(Resource):
             return {
                 'api_key_present': bool(api_key),
                 'ai_test_success': result['success'],
-                'ai_test_result': result.get('enhanced_content', result.get('error'))
+                'ai_test_result': result.get('enhanced_content', result.get('error')),
+                'ai_cache': ai_service.cache.get_stats()
             }
         except Exception as e:
             return {'error': str(e)}, 500
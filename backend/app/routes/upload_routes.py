@@ -1,14 +1,24 @@
-from flask_restful import Resource
+from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request
+from app.models.upload import UploadSession
 from app.services.media_service import MediaService
+from app.services.media_pipeline_service import MediaPipelineService
+from app.services.upload_service import UploadService, UploadError, validate_upload, MAX_SIZES, UPLOAD_FOLDERS
 import os
 
+# Multipart overhead allowed on top of the largest file size
+FORM_OVERHEAD = 64 * 1024
+
 class UploadResource(Resource):
     @jwt_required()
     def post(self):
         current_user_id = get_jwt_identity()
         
+        # Refuse oversized bodies before Werkzeug parses (and spools) the form
+        if request.content_length and request.content_length > max(MAX_SIZES.values()) + FORM_OVERHEAD:
+            return {'error': 'File too large'}, 413
+        
         if 'file' not in request.files:
             return {'error': 'No file provided'}, 400
         
@@ -20,27 +30,26 @@ class UploadResource(Resource):
         upload_type = request.form.get('type', 'image')  # image, video, audio
         folder = request.form.get('folder', 'posts')  # posts, stories, messages, profiles
         
-        # Validate file type
-        allowed_extensions = {
-            'image': {'jpg', 'jpeg', 'png', 'gif', 'webp'},
-            'video': {'mp4', 'mov', 'avi', 'mkv', 'webm'},
-            'audio': {'mp3', 'wav', 'ogg', 'm4a', 'aac'}
-        }
-        
-        file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        if file_ext not in allowed_extensions.get(upload_type, set()):
-            return {'error': f'Invalid file type for {upload_type}'}, 400
+        # Validate file type and size
+        error = validate_upload(upload_type, file.filename)
+        if error:
+            return {'error': error}, 400
+        if folder not in UPLOAD_FOLDERS:  # Becomes part of a storage path
+            return {'error': 'Invalid folder'}, 400
         
-        # Check file size (10MB for images, 100MB for videos, 25MB for audio)
-        max_sizes = {'image': 10 * 1024 * 1024, 'video': 100 * 1024 * 1024, 'audio': 25 * 1024 * 1024}
         file.seek(0, os.SEEK_END)
         file_size = file.tell()
         file.seek(0)
         
-        if file_size > max_sizes.get(upload_type, 10 * 1024 * 1024):
+        if file_size > MAX_SIZES[upload_type]:
             return {'error': f'File too large for {upload_type}'}, 400
         
-        # Upload to Cloudinary
+        # async=true returns a pending media id straight away; a worker stores the file
+        if request.form.get('async', 'false').lower() == 'true':
+            media = MediaPipelineService().submit(current_user_id, upload_type, folder, file, file.filename)
+            return {'message': 'File accepted for processing', 'media': media.to_dict()}, 202
+        
+        # Upload to media storage
         media_service = MediaService()
         
         if upload_type == 'image':
@@ -58,10 +67,108 @@ class UploadResource(Resource):
                 'url': result['url'],
                 'public_id': result['public_id'],
                 'type': upload_type,
-                'duration': result.get('duration')
+                'duration': result.get('duration'),
+                'duplicate': result.get('duplicate', False)
             }, 201
         else:
             return {'error': result['error']}, 500
 
+def get_own_upload(upload_id):
+    upload = UploadSession.query.get_or_404(upload_id)
+    if upload.user_id != get_jwt_identity():
+        return None
+    return upload
+
+class UploadSessionsResource(Resource):
+    @jwt_required()
+    def post(self):
+        """Start a chunked upload; parts are then PUT to /uploads/<id>"""
+        parser = reqparse.RequestParser()
+        parser.add_argument('filename', type=str, required=True, location='json')
+        parser.add_argument('size', type=int, required=True, location='json')
+        parser.add_argument('type', type=str, default='image', location='json')  # image, video, audio
+        parser.add_argument('folder', type=str, default='posts', location='json')  # posts, stories, messages, profiles
+        args = parser.parse_args()
+        
+        upload_service = UploadService()
+        try:
+            upload = upload_service.create(
+                get_jwt_identity(), args['type'], args['folder'], args['filename'], args['size']
+            )
+        except UploadError as e:
+            return {'error': str(e), **e.details}, e.status
+        
+        return {
+            'message': 'Upload started',
+            'upload': upload.to_dict(),
+            'max_part_size': upload_service.max_part_size
+        }, 201
+
+class UploadSessionResource(Resource):
+    @jwt_required()
+    def get(self, upload_id):
+        """Current offset, for resuming after a dropped connection"""
+        upload = get_own_upload(upload_id)
+        if upload is None:
+            return {'error': 'Access denied'}, 403
+        return {'upload': upload.to_dict()}
+    
+    @jwt_required()
+    def put(self, upload_id):
+        """Write the raw request body at ?offset="""
+        upload = get_own_upload(upload_id)
+        if upload is None:
+            return {'error': 'Access denied'}, 403
+        
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            return {'error': 'offset is required', 'offset': upload.received_size}, 400
+        
+        try:
+            new_offset = UploadService().write_part(upload, offset, request.stream, request.content_length)
+        except UploadError as e:
+            return {'error': str(e), **e.details}, e.status
+        
+        return {'offset': new_offset, 'complete': new_offset == upload.total_size}
+    
+    @jwt_required()
+    def delete(self, upload_id):
+        upload = get_own_upload(upload_id)
+        if upload is None:
+            return {'error': 'Access denied'}, 403
+        UploadService().abort(upload)
+        return {'message': 'Upload aborted'}
+
+class CompleteUploadResource(Resource):
+    @jwt_required()
+    def post(self, upload_id):
+        upload = get_own_upload(upload_id)
+        if upload is None:
+            return {'error': 'Access denied'}, 403
+        
+        if (request.get_json(silent=True) or {}).get('async'):
+            try:
+                media = UploadService().queue(upload)
+            except UploadError as e:
+                return {'error': str(e), **e.details}, e.status
+            return {'message': 'File accepted for processing', 'media': media.to_dict()}, 202
+        
+        try:
+            result = UploadService().complete(upload)
+        except UploadError as e:
+            return {'error': str(e), **e.details}, e.status
+        
+        return {
+            'message': 'File uploaded successfully',
+            'url': result['url'],
+            'public_id': result['public_id'],
+            'type': upload.upload_type,
+            'duration': result.get('duration'),
+            'duplicate': result.get('duplicate', False)
+        }, 201
+
 def register_upload_routes(api):
-    api.add_resource(UploadResource, '/upload')
\ No newline at end of file
+    api.add_resource(UploadResource, '/upload')
+    api.add_resource(UploadSessionsResource, '/uploads')
+    api.add_resource(UploadSessionResource, '/uploads/<string:upload_id>')
+    api.add_resource(CompleteUploadResource, '/uploads/<string:upload_id>/complete')
\ No newline at end of file
@@ -1,17 +1,22 @@
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from flask import request
 from app import db
 from app.models.user import User
-from werkzeug.security import check_password_hash, generate_password_hash
+from app.services.auth_service import get_hasher, AuthError
+from app.services.identity_service import IdentityService
+from app.services.response_cache_service import ResponseCache
 from datetime import datetime
 
 class UserProfileResource(Resource):
     @jwt_required()
     def get(self):
-        current_user_id = get_jwt_identity()
-        user = User.query.get_or_404(current_user_id)
-        return {'user': user.to_dict()}
+        # Snapshot loaded with the JWT; no query when it is cached
+        cache = ResponseCache()
+        return cache.respond(
+            lambda: {'user': current_user.to_dict()},
+            'me', current_user.id, *cache.tokens('user', [current_user.id])
+        )
     
     @jwt_required()
     def put(self):
@@ -41,6 +46,7 @@ class UserProfileResource(Resource):
                 user.profile_image = data['profile_image']
             
             db.session.commit()
+            IdentityService().invalidate(user.id)
             return {'message': 'Profile updated successfully', 'user': user.to_dict()}
         except Exception as e:
             db.session.rollback()
@@ -50,18 +56,26 @@ class ChangePasswordResource(Resource):
     @jwt_required()
     def post(self):
         current_user_id = get_jwt_identity()
-        user = User.query.get_or_404(current_user_id)
+        # Credentials are always checked against the row itself, never a cached copy
+        user = db.session.get(User, current_user_id, populate_existing=True)
+        if user is None:
+            return {'error': 'User not found'}, 404
         
         parser = reqparse.RequestParser()
         parser.add_argument('currentPassword', type=str, required=True, location='json')
         parser.add_argument('newPassword', type=str, required=True, location='json')
         args = parser.parse_args()
         
-        if not check_password_hash(user.password_hash, args['currentPassword']):
-            return {'error': 'Current password is incorrect'}, 400
+        hasher = get_hasher()
+        try:
+            if not hasher.verify(user.password_hash, args['currentPassword']):
+                return {'error': 'Current password is incorrect'}, 400
+            user.password_hash = hasher.hash(args['newPassword'])
+        except AuthError as e:
+            return {'error': str(e)}, e.status
         
-        user.password_hash = generate_password_hash(args['newPassword'])
         db.session.commit()
+        IdentityService().invalidate(user.id)
         
         return {'message': 'Password changed successfully'}
 
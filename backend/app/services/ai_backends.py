@@ -0,0 +1,117 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from flask import current_app
+
+class AIServiceError(Exception):
+    """A failed model call; retryable errors are worth trying again later"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class OpenAIBackend:
+    """Chat completions through the OpenAI API (or a compatible server at api_base)"""
+
+    def __init__(self, api_key=None, api_base=None, timeout=None):
+        import openai
+        api_key = api_key or os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+        openai.api_key = api_key
+        self.openai = openai
+        self.options = {'api_base': api_base} if api_base else {}
+        if timeout:
+            self.options['request_timeout'] = timeout
+
+    def complete(self, model, messages, max_tokens, temperature):
+        with self._translate_errors():
+            response = self.openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self.options
+            )
+        return response.choices[0].message.content.strip()
+
+    def stream(self, model, messages, max_tokens, temperature):
+        """Yield reply text fragments as the API produces them"""
+        with self._translate_errors():
+            chunks = self.openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **self.options
+            )
+            for chunk in chunks:
+                text = chunk.choices[0].delta.get('content') if chunk.choices else None
+                if text:
+                    yield text
+
+    @contextmanager
+    def _translate_errors(self):
+        error = self.openai.error
+        try:
+            yield
+        except error.RateLimitError as e:
+            # Exhausted quota is reported as a rate limit but will not recover by waiting
+            retryable = 'quota' not in str(e).lower()
+            raise AIServiceError(str(e), retryable=retryable, retry_after=_retry_after(e)) from e
+        except (error.Timeout, error.APIConnectionError, error.ServiceUnavailableError, error.TryAgain) as e:
+            raise AIServiceError(str(e), retryable=True) from e
+        except error.APIError as e:
+            raise AIServiceError(str(e), retryable=(e.http_status or 500) >= 500) from e
+        except error.OpenAIError as e:
+            raise AIServiceError(str(e)) from e
+
+class FakeBackend:
+    """Deterministic stand-in model for tests and offline development.
+
+    Replies with the last user message after an optional delay (streamed
+    word by word), so latency and throughput can be exercised without
+    network access or tokens.
+    """
+
+    def __init__(self, latency=0.0, token_delay=0.0):
+        self.latency = latency
+        self.token_delay = token_delay
+
+    def complete(self, model, messages, max_tokens, temperature):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(model, messages)
+
+    def stream(self, model, messages, max_tokens, temperature):
+        """Yield the reply word by word, token_delay seconds apart"""
+        if self.latency:
+            time.sleep(self.latency)
+        for word in re.findall(r'\S+\s*', self._reply(model, messages)):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield word
+
+    def _reply(self, model, messages):
+        return f"[{model}] {messages[-1]['content']}".strip()
+
+def _retry_after(exc):
+    headers = getattr(exc, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+def get_backend(app=None):
+    """The completion backend selected by AI_BACKEND ('openai' or 'fake')"""
+    app = app or current_app._get_current_object()
+    if app.config.get('AI_BACKEND') == 'fake':
+        return FakeBackend(app.config.get('AI_FAKE_LATENCY', 0.0), app.config.get('AI_FAKE_TOKEN_DELAY', 0.0))
+    return OpenAIBackend(
+        app.config.get('OPENAI_API_KEY'),
+        app.config.get('AI_API_BASE'),
+        app.config.get('AI_REQUEST_TIMEOUT')
+    )
@@ -0,0 +1,210 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.ai_job import AIBatch
+from app.models.story import Story
+from app.services.ai_backends import AIServiceError
+from app.services.ai_service import AIService
+from app.services.search_service import SearchService
+
+class BackoffGate:
+    """Shared pause for all pool threads after a rate-limit or overload error"""
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+class AIBatchService:
+    """Enhances many stories through a bounded thread pool.
+
+    Pool threads only talk to the model. Results are written back from the
+    calling thread and committed every AI_BATCH_COMMIT_SIZE stories, so the
+    database sees a few short write transactions instead of one per story.
+    """
+
+    def __init__(self):
+        self.concurrency = current_app.config.get('AI_BATCH_CONCURRENCY', 4)
+        self.commit_size = current_app.config.get('AI_BATCH_COMMIT_SIZE', 20)
+        self.max_stories = current_app.config.get('AI_BATCH_MAX_STORIES', 500)
+        self.max_retries = current_app.config.get('AI_JOB_MAX_RETRIES', 3)
+        self.retry_delay_base = current_app.config.get('AI_JOB_RETRY_DELAY', 10)
+        self.batch_timeout = current_app.config.get('AI_BATCH_TIMEOUT', 3600)
+
+    def eligible_story_ids(self, family_id=None, story_ids=None, user_id=None):
+        """Stories with content that are not enhanced yet, oldest first"""
+        query = db.session.query(Story.id).filter(
+            Story.content.isnot(None),
+            Story.content != '',
+            Story.ai_enhanced == False
+        )
+        if family_id is not None:
+            query = query.filter(Story.family_id == family_id)
+        if story_ids is not None:
+            query = query.filter(Story.id.in_(story_ids))
+        if user_id is not None:
+            query = query.filter(Story.user_id == user_id)
+        return [row[0] for row in query.order_by(Story.created_at, Story.id).all()]
+
+    def active_batch(self, user_id):
+        # Batches older than the timeout are treated as lost (e.g. a worker died)
+        cutoff = datetime.utcnow() - timedelta(seconds=self.batch_timeout)
+        return AIBatch.query.filter(
+            AIBatch.user_id == user_id,
+            AIBatch.status.in_(('pending', 'running')),
+            AIBatch.created_at > cutoff
+        ).first()
+
+    def submit(self, user_id, story_ids, family_id=None):
+        """Record and queue a batch; commits the session"""
+        batch = AIBatch(user_id=user_id, family_id=family_id, story_ids=story_ids, total=len(story_ids))
+        db.session.add(batch)
+        db.session.commit()
+
+        from app.tasks.ai_tasks import enhance_batch
+        try:
+            enhance_batch.delay(batch.id)
+        except Exception as e:
+            current_app.logger.error(f"AI batch enqueue error: {str(e)}")
+            batch.status = 'failed'
+            batch.error = 'Could not queue batch'
+            batch.finished_at = datetime.utcnow()
+            db.session.commit()
+        return batch
+
+    def run(self, batch_id):
+        """Worker side: enhance every story in a batch, updating progress"""
+        batch = db.session.get(AIBatch, batch_id)
+        if batch is None or batch.status not in ('pending', 'running'):
+            return None
+
+        batch.status = 'running'
+        batch.started_at = batch.started_at or datetime.utcnow()
+        db.session.commit()
+
+        def record_progress(completed, failed, skipped):
+            batch.completed = completed
+            batch.failed = failed
+            batch.skipped = skipped
+
+        try:
+            completed, failed, skipped = self.enhance_stories(batch.story_ids, on_commit=record_progress)
+        except Exception as e:
+            db.session.rollback()
+            batch.status = 'failed'
+            batch.error = str(e)
+            batch.finished_at = datetime.utcnow()
+            db.session.commit()
+            raise
+
+        batch.status = 'succeeded'
+        batch.finished_at = datetime.utcnow()
+        db.session.commit()
+        return {'completed': completed, 'failed': failed, 'skipped': skipped}
+
+    def enhance_stories(self, story_ids, on_commit=None):
+        """Enhance stories concurrently; returns (completed, failed, skipped).
+
+        on_commit(completed, failed, skipped) runs just before each batched
+        commit so callers can persist or print progress alongside it.
+        """
+        items = db.session.query(Story.id, Story.content, Story.title).filter(
+            Story.id.in_(story_ids),
+            Story.ai_enhanced == False
+        ).all()
+        db.session.commit()  # End the read transaction before the model calls
+        skipped = len(set(story_ids)) - len(items)  # Deleted or enhanced meanwhile
+        completed = failed = 0
+        pending_results = []
+
+        def flush():
+            for story_id, enhanced_content in pending_results:
+                db.session.query(Story).filter(
+                    Story.id == story_id,
+                    Story.ai_enhanced == False
+                ).update({
+                    'enhanced_content': enhanced_content,
+                    'ai_enhanced': True,
+                    'enhancement_accepted': False
+                }, synchronize_session=False)
+            if pending_results:
+                SearchService().index_stories([story_id for story_id, _ in pending_results])
+            pending_results.clear()
+            if on_commit:
+                on_commit(completed, failed, skipped)
+            db.session.commit()
+
+        for story_id, enhanced_content, error in self.enhance_many(items):
+            if error is None:
+                completed += 1
+                pending_results.append((story_id, enhanced_content))
+            else:
+                failed += 1
+                current_app.logger.warning(f"Batch enhancement of story {story_id} failed: {error}")
+            if (completed + failed) % self.commit_size == 0:
+                flush()
+        flush()
+        return completed, failed, skipped
+
+    def enhance_many(self, items):
+        """Yield (story_id, enhanced_content, error) as model calls finish.
+
+        At most `concurrency` calls are in flight and no more than twice that
+        are queued, so memory stays flat however many stories are passed.
+        """
+        app = current_app._get_current_object()
+        gate = BackoffGate()
+        items = iter(items)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='ai-batch') as pool:
+            in_flight = {}
+
+            def fill():
+                while len(in_flight) < self.concurrency * 2:
+                    item = next(items, None)
+                    if item is None:
+                        return
+                    story_id, content, title = item
+                    future = pool.submit(self._enhance_one, app, gate, content, title)
+                    in_flight[future] = story_id
+
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    story_id = in_flight.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        yield story_id, future.result(), None
+                    else:
+                        yield story_id, None, str(error)
+                fill()
+
+    def _enhance_one(self, app, gate, content, title):
+        with app.app_context():
+            ai_service = AIService()
+            for attempt in range(self.max_retries + 1):
+                gate.wait()
+                try:
+                    return ai_service.enhance(content, title)
+                except AIServiceError as e:
+                    if not e.retryable or attempt == self.max_retries:
+                        raise
+                    # Back the whole pool off, not just this thread
+                    delay = e.retry_after or self.retry_delay_base * (2 ** attempt)
+                    gate.pause(delay + random.uniform(0, delay / 4))
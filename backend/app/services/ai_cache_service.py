@@ -0,0 +1,163 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.ai_cache import AICacheEntry
+from app.utils.cache import SafeCache, get_store as get_shared_store
+
+_stats_lock = threading.Lock()
+_store_lock = threading.Lock()
+
+class DatabaseStore:
+    """Persistent cache in the ai_cache_entries table.
+
+    Uses its own connection so cache writes never commit (or roll back) the
+    caller's session. Expired rows read as misses; `prune` drops them and
+    evicts least recently used rows beyond max_entries.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+
+    def get(self, key):
+        now = datetime.utcnow()
+        table = AICacheEntry.__table__
+        with db.engine.begin() as conn:
+            response = conn.execute(
+                select(table.c.response).where(table.c.key == key, table.c.expires_at > now)
+            ).scalar()
+            if response is not None:
+                conn.execute(
+                    update(table).where(table.c.key == key).values(hits=table.c.hits + 1, last_used_at=now)
+                )
+        return response
+
+    def set(self, key, value, ex=None):
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ex if ex is not None else 10 * 365 * 86400)
+        table = AICacheEntry.__table__
+        values = {'response': value, 'created_at': now, 'last_used_at': now, 'expires_at': expires_at}
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(table).values(key=key, hits=0, **values))
+        except IntegrityError:
+            with db.engine.begin() as conn:
+                conn.execute(update(table).where(table.c.key == key).values(**values))
+        return True
+
+    def delete(self, *keys):
+        table = AICacheEntry.__table__
+        with db.engine.begin() as conn:
+            return conn.execute(delete(table).where(table.c.key.in_(keys))).rowcount
+
+    def clear(self):
+        with db.engine.begin() as conn:
+            conn.execute(delete(AICacheEntry.__table__))
+
+    def prune(self):
+        """Remove expired rows, then the least recently used over the limit"""
+        table = AICacheEntry.__table__
+        with db.engine.begin() as conn:
+            removed = conn.execute(
+                delete(table).where(table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+            keep = select(table.c.key).order_by(table.c.last_used_at.desc()).limit(self.max_entries)
+            removed += conn.execute(
+                delete(table).where(table.c.key.not_in(keep.scalar_subquery()))
+            ).rowcount
+        return removed
+
+    def __len__(self):
+        with db.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(AICacheEntry.__table__)).scalar()
+
+class AICacheService:
+    """Content-addressed cache of model responses.
+
+    The key is a SHA-256 of the model, prompts, content and sampling
+    parameters, so any identical request is answered without calling the
+    model. AI_CACHE_BACKEND selects 'db' (default), 'redis', 'memory' or
+    'none'.
+    """
+
+    def __init__(self, app=None):
+        app = app or current_app._get_current_object()
+        self.store = get_store(app)
+        self.ttl = app.config.get('AI_CACHE_TTL', 30 * 86400)
+        with _stats_lock:
+            self.stats = app.extensions.setdefault('ai_cache_stats', {'hits': 0, 'misses': 0})
+
+    @staticmethod
+    def make_key(model, messages, max_tokens, temperature):
+        payload = json.dumps(
+            [model, messages, max_tokens, round(float(temperature), 3)],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, model, messages, max_tokens, temperature, compute):
+        """Cached response for the request, calling compute() on a miss"""
+        if self.store is None:
+            return compute()
+
+        cached = self.lookup(model, messages, max_tokens, temperature)
+        if cached is not None:
+            return cached
+
+        response = compute()
+        self.save(model, messages, max_tokens, temperature, response)
+        return response
+
+    def lookup(self, model, messages, max_tokens, temperature):
+        """Cached response or None, counting the hit or miss"""
+        if self.store is None:
+            return None
+        cached = self.store.get(self.make_key(model, messages, max_tokens, temperature))
+        self._count('hits' if cached is not None else 'misses')
+        return cached
+
+    def save(self, model, messages, max_tokens, temperature, response):
+        if self.store is not None:
+            self.store.set(self.make_key(model, messages, max_tokens, temperature), response, ex=self.ttl)
+
+    def prune(self):
+        # Memory and Redis entries expire on their own
+        if self.store is None or not isinstance(self.store.cache, DatabaseStore):
+            return 0
+        return self.store.cache.prune()
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear()
+
+    def get_stats(self):
+        with _stats_lock:
+            hits, misses = self.stats['hits'], self.stats['misses']
+        lookups = hits + misses
+        return {
+            'backend': current_app.config.get('AI_CACHE_BACKEND', 'db'),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else None,
+            'entries': len(self.store) if self.store is not None else 0
+        }
+
+    def _count(self, name):
+        with _stats_lock:
+            self.stats[name] += 1
+
+def get_store(app):
+    # 'redis', 'memory' and 'none' behave as for every other cache
+    if app.config.get('AI_CACHE_BACKEND', 'db') != 'db':
+        return get_shared_store('ai_cache', 'AI_CACHE_BACKEND', 'AI_CACHE_MAX_ENTRIES', app)
+    with _store_lock:
+        store = app.extensions.get('ai_cache_db')
+        if store is None:
+            store = app.extensions['ai_cache_db'] = SafeCache(
+                DatabaseStore(app.config.get('AI_CACHE_MAX_ENTRIES', 10000)), 'ai_cache'
+            )
+        return store
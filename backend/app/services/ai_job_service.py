@@ -0,0 +1,123 @@
+import random
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.ai_job import AIJob
+from app.models.story import Story
+from app.services.ai_service import AIService
+from app.services.search_service import SearchService
+
+class AIJobService:
+    """Runs AI story enhancement as background jobs.
+
+    The request only records an AIJob row and queues a Celery task; the
+    worker calls the model outside any database transaction and writes the
+    result back onto the story.
+    """
+
+    def __init__(self):
+        self.max_active_per_user = current_app.config.get('AI_MAX_ACTIVE_JOBS_PER_USER', 3)
+        self.max_retries = current_app.config.get('AI_JOB_MAX_RETRIES', 3)
+        self.retry_delay_base = current_app.config.get('AI_JOB_RETRY_DELAY', 10)
+        self.job_timeout = current_app.config.get('AI_JOB_TIMEOUT', 900)
+
+    def _active_jobs(self):
+        # Jobs older than the timeout are treated as lost (e.g. a worker died)
+        cutoff = datetime.utcnow() - timedelta(seconds=self.job_timeout)
+        return AIJob.query.filter(
+            AIJob.status.in_(AIJob.ACTIVE_STATUSES),
+            AIJob.created_at > cutoff
+        )
+
+    def active_job_for_story(self, story_id):
+        return self._active_jobs().filter(AIJob.story_id == story_id).first()
+
+    def at_capacity(self, user_id):
+        """Whether a user already has the maximum number of jobs in flight"""
+        return self._active_jobs().filter(AIJob.user_id == user_id).count() >= self.max_active_per_user
+
+    def submit_enhancement(self, story, user_id):
+        """Record and queue an enhancement job; commits the session"""
+        job = AIJob(user_id=user_id, story_id=story.id, kind='enhance')
+        db.session.add(job)
+        db.session.commit()  # The worker must be able to see the row
+
+        from app.tasks.ai_tasks import enhance_story
+        try:
+            enhance_story.delay(job.id)
+        except Exception as e:
+            current_app.logger.error(f"AI job enqueue error: {str(e)}")
+            self.mark_failed(job.id, 'Could not queue job')
+        return job
+
+    def start_streamed(self, story, user_id):
+        """Record an enhancement the request streams itself, so it counts as in flight; commits"""
+        job = AIJob(user_id=user_id, story_id=story.id, kind='enhance', status='running',
+                    attempts=1, started_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def mark_succeeded(self, job_id):
+        """Flag a job done, in the caller's transaction"""
+        job = db.session.get(AIJob, job_id)
+        job.status = 'succeeded'
+        job.error = None
+        job.finished_at = datetime.utcnow()
+
+    def run_enhancement(self, job_id):
+        """Worker side: enhance the job's story and store the result"""
+        job = db.session.get(AIJob, job_id)
+        if job is None or not job.is_active:
+            return None
+
+        story = db.session.get(Story, job.story_id)
+        if story is None or not story.content:
+            return self.mark_failed(job_id, 'No content to enhance')
+        if story.ai_enhanced:
+            return self.mark_failed(job_id, 'Story already enhanced')
+
+        content, title = story.content, story.title
+        job.status = 'running'
+        job.attempts += 1
+        job.started_at = job.started_at or datetime.utcnow()
+        db.session.commit()  # Don't hold a transaction open during the model call
+
+        enhanced_content = AIService().enhance(content, title)
+
+        story = db.session.get(Story, job.story_id)
+        if story is None:
+            return self.mark_failed(job_id, 'Story was deleted')
+        story.enhanced_content = enhanced_content
+        story.ai_enhanced = True
+        story.enhancement_accepted = False  # User needs to accept
+        SearchService().index_story(story)
+
+        self.mark_succeeded(job_id)
+        db.session.commit()
+        return 'succeeded'
+
+    def retry_delay(self, error, retries):
+        """Seconds to wait before the next attempt, honouring Retry-After"""
+        if getattr(error, 'retry_after', None):
+            return error.retry_after
+        delay = self.retry_delay_base * (2 ** retries)
+        return delay + random.uniform(0, delay / 2)
+
+    def mark_retrying(self, job_id, error):
+        return self._finish(job_id, 'retrying', str(error), finished=False)
+
+    def mark_failed(self, job_id, error):
+        return self._finish(job_id, 'failed', str(error))
+
+    def _finish(self, job_id, status, error, finished=True):
+        db.session.rollback()
+        job = db.session.get(AIJob, job_id)
+        if job is None:
+            return None
+        job.status = status
+        job.error = error
+        if finished:
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return status
@@ -1,28 +1,60 @@
-import openai
-import os
 from flask import current_app
+from app.services.ai_backends import get_backend
+from app.services.ai_cache_service import AICacheService
+
+ENHANCE_SYSTEM_PROMPT = "You are a gentle editor who helps preserve family stories."
+ENHANCE_PROMPT = "Please enhance this story: {content}"
+SUMMARY_SYSTEM_PROMPT = "You create warm, family-friendly summaries of personal stories."
+SUMMARY_PROMPT = "Create a brief, warm summary (2-3 sentences) of this family story:\n\n{content}"
 
 class AIService:
-    def __init__(self):
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
-        openai.api_key = api_key
+    def __init__(self, backend=None):
+        self.backend = backend or get_backend()
+        self.model = current_app.config.get('AI_MODEL', 'gpt-3.5-turbo')
+        self.cache = AICacheService()
+    
+    def complete(self, messages, max_tokens, temperature):
+        """Model reply for messages, answered from the cache when possible"""
+        return self.cache.get_or_compute(
+            self.model, messages, max_tokens, temperature,
+            lambda: self.backend.complete(self.model, messages, max_tokens, temperature)
+        )
+    
+    def stream(self, messages, max_tokens, temperature):
+        """Yield reply fragments as they arrive; a cache hit is one fragment.
+        
+        The joined reply is cached once the model finishes, so a streamed
+        enhancement also serves later non-streaming requests.
+        """
+        cached = self.cache.lookup(self.model, messages, max_tokens, temperature)
+        if cached is not None:
+            yield cached
+            return
+        
+        fragments = []
+        for text in self.backend.stream(self.model, messages, max_tokens, temperature):
+            fragments.append(text)
+            yield text
+        self.cache.save(self.model, messages, max_tokens, temperature, ''.join(fragments).strip())
+    
+    def enhance(self, original_content, title=""):
+        """Enhanced text for a story; raises AIServiceError on failure"""
+        return self.complete(self._enhance_messages(original_content), max_tokens=1500, temperature=0.3)
+    
+    def stream_enhancement(self, original_content, title=""):
+        """Enhanced text for a story, yielded fragment by fragment"""
+        return self.stream(self._enhance_messages(original_content), max_tokens=1500, temperature=0.3)
+    
+    def _enhance_messages(self, original_content):
+        return [
+            {"role": "system", "content": ENHANCE_SYSTEM_PROMPT},
+            {"role": "user", "content": ENHANCE_PROMPT.format(content=original_content)}
+        ]
     
     def enhance_story(self, original_content, title=""):
         """Enhance a story while preserving the author's voice"""
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a gentle editor who helps preserve family stories."},
-                    {"role": "user", "content": f"Please enhance this story: {original_content}"}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            enhanced_content = response.choices[0].message.content.strip()
+            enhanced_content = self.enhance(original_content, title)
             return {
                 'success': True,
                 'enhanced_content': enhanced_content,
@@ -50,20 +82,15 @@ class AIService:
     def generate_story_summary(self, content):
         """Generate a brief summary of the story"""
         try:
-            prompt = f"Create a brief, warm summary (2-3 sentences) of this family story:\n\n{content}"
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You create warm, family-friendly summaries of personal stories."},
-                    {"role": "user", "content": prompt}
+            return self.complete(
+                [
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": SUMMARY_PROMPT.format(content=content)}
                 ],
                 max_tokens=150,
                 temperature=0.5
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             current_app.logger.error(f"Summary generation error: {str(e)}")
             return None
\ No newline at end of file
@@ -0,0 +1,184 @@
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from app import db
+from app.models.user import User
+from app.utils.cache import RedisCache, get_cache
+
+_hasher_lock = threading.Lock()
+_throttle_lock = threading.Lock()
+
+class AuthError(Exception):
+    """A login or registration that cannot go ahead"""
+
+    def __init__(self, message, status=401, retry_after=None, **details):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.details = details
+
+class PasswordHasher:
+    """Password hashing on a small, bounded thread pool.
+
+    hashlib's PBKDF2 and scrypt release the GIL, so the pool size caps how
+    many cores logins can occupy without serialising the other request
+    threads behind them. Beyond max_pending hashes in flight new requests
+    are refused instead of queueing up.
+    """
+
+    def __init__(self, method, workers, max_pending):
+        self.method = method
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Canonical form of the configured method, as stored in hashes
+        self.prefix = generate_password_hash(secrets.token_hex(8), method).split('$', 1)[0]
+        # Checked when no account matches, so unknown accounts cost the same as wrong passwords
+        self.decoy_hash = generate_password_hash(secrets.token_hex(16), method)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash or self.decoy_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split('$', 1)[0] != self.prefix
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise AuthError('Too many sign-ins in progress, try again shortly', 503, retry_after=1)
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+class LoginThrottle:
+    """Failed sign-ins counted per account and per client IP over a fixed window.
+
+    Once either count reaches its limit, further attempts are refused
+    before any password is hashed, until the window expires. A successful
+    sign-in clears the account's count.
+    """
+
+    def __init__(self, counters, window, account_limit, ip_limit):
+        self.counters = counters
+        self.window = window
+        self.account_limit = account_limit
+        self.ip_limit = ip_limit
+
+    def check(self, account, ip):
+        if (self.counters.get(f'account:{account}') or 0) >= self.account_limit or \
+                (self.counters.get(f'ip:{ip}') or 0) >= self.ip_limit:
+            raise AuthError('Too many failed sign-ins, try again later', 429, retry_after=self.window)
+
+    def record_failure(self, account, ip):
+        self.counters.incr(f'account:{account}', ex=self.window)
+        self.counters.incr(f'ip:{ip}', ex=self.window)
+
+    def reset(self, account):
+        self.counters.delete(f'account:{account}')
+
+class AuthService:
+    """Password sign-in and registration.
+
+    A sign-in resolves at most one account with a single indexed lookup
+    (username, or an email only one account uses) and checks one password
+    hash. An email shared by accounts from before usernames existed checks
+    the password against at most LOGIN_MAX_SHARED_EMAIL_ACCOUNTS of them.
+    Hashes made with older parameters are replaced with PASSWORD_HASH_METHOD
+    on the first successful sign-in.
+    """
+
+    def __init__(self):
+        self.hasher = get_hasher()
+        self.throttle = get_throttle()
+        self.max_shared_accounts = current_app.config.get('LOGIN_MAX_SHARED_EMAIL_ACCOUNTS', 5)
+
+    def authenticate(self, password, ip, email=None, username=None):
+        """The matching user, or AuthError; commits a rehash"""
+        account = (username or email or '').strip().lower()
+        self.throttle.check(account, ip)
+
+        query = User.query
+        if username:
+            query = query.filter(User.username == username)
+        if email:
+            query = query.filter(User.email == email)
+        candidates = query.order_by(User.id).limit(self.max_shared_accounts + 1).all()
+
+        if len(candidates) > 1:
+            # Accounts may share an email; only the username tells them apart,
+            # but older accounts have none, so a few of those are each tried
+            legacy = [c for c in candidates if c.username is None]
+            user = next((c for c in legacy[:self.max_shared_accounts]
+                         if self.hasher.verify(c.password_hash, password)), None)
+            if user is None and len(legacy) < len(candidates):
+                if legacy:
+                    self.throttle.record_failure(account, ip)
+                raise AuthError('Several accounts use this email; sign in with your username', 409,
+                                username_required=True)
+        else:
+            user = candidates[0] if candidates else None
+            if not self.hasher.verify(user.password_hash if user else None, password):
+                user = None
+        if user is None:
+            self.throttle.record_failure(account, ip)
+            raise AuthError('Invalid credentials')
+
+        self.throttle.reset(account)
+        if self.hasher.needs_rehash(user.password_hash):
+            user.password_hash = self.hasher.hash(password)
+            db.session.commit()
+        return user
+
+    def register(self, name, email, password, username=None):
+        """A new, committed user; accounts sharing an email need distinct usernames"""
+        if username and User.query.filter_by(username=username).first():
+            raise AuthError('Username is already taken', 409)
+        if not username and User.query.filter_by(email=email).first():
+            raise AuthError('This email already has an account; choose a username for the new one', 400,
+                            username_required=True)
+
+        user = User(name=name, email=email, username=username or None)
+        user.password_hash = self.hasher.hash(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+def get_hasher(app=None):
+    """The app-wide PasswordHasher, created on first use"""
+    app = app or current_app._get_current_object()
+    with _hasher_lock:
+        hasher = app.extensions.get('password_hasher')
+        if hasher is None:
+            hasher = PasswordHasher(
+                app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000'),
+                app.config.get('PASSWORD_HASH_WORKERS', 2),
+                app.config.get('PASSWORD_HASH_MAX_PENDING', 16)
+            )
+            app.extensions['password_hasher'] = hasher
+    return hasher
+
+def get_throttle(app=None):
+    """The app-wide LoginThrottle over LOGIN_THROTTLE_BACKEND ('memory' or 'redis')"""
+    app = app or current_app._get_current_object()
+    with _throttle_lock:
+        throttle = app.extensions.get('login_throttle')
+        if throttle is None:
+            if app.config.get('LOGIN_THROTTLE_BACKEND') == 'redis':
+                counters = RedisCache(app.config['REDIS_URL'], 'login-throttle:')
+            else:
+                counters = get_cache('login_throttle', 100000, app)
+            throttle = LoginThrottle(
+                counters,
+                app.config.get('LOGIN_THROTTLE_WINDOW', 900),
+                app.config.get('LOGIN_MAX_ACCOUNT_FAILURES', 10),
+                app.config.get('LOGIN_MAX_IP_FAILURES', 100)
+            )
+            app.extensions['login_throttle'] = throttle
+    return throttle
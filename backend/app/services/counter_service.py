@@ -0,0 +1,82 @@
+from sqlalchemy import func, or_, select
+from app import db
+from app.models.user import User
+from app.models.post import Post, Like, PostComment, SavedPost
+from app.models.follow import Follow
+
+class CounterService:
+    """Denormalized engagement and profile counters.
+
+    Increments run as a single UPDATE ... SET col = col + n inside the
+    caller's transaction so they commit (or roll back) together with the
+    row that caused them. Serializers only ever read the columns.
+    """
+
+    POST_COUNTERS = ('likes_count', 'comments_count', 'saves_count')
+    USER_COUNTERS = ('followers_count', 'following_count', 'posts_count')
+
+    def increment_post(self, post_id, counter, delta=1):
+        """Atomically adjust one of the Post counter columns"""
+        if counter not in self.POST_COUNTERS:
+            raise ValueError(f"Unknown post counter: {counter}")
+        column = getattr(Post, counter)
+        # Pin updated_at so engagement does not look like an edit to the post
+        return Post.query.filter_by(id=post_id).update(
+            {column: column + delta, Post.updated_at: Post.updated_at},
+            synchronize_session=False
+        )
+
+    def increment_user(self, user_id, counter, delta=1):
+        """Atomically adjust one of the User counter columns"""
+        if counter not in self.USER_COUNTERS:
+            raise ValueError(f"Unknown user counter: {counter}")
+        column = getattr(User, counter)
+        return User.query.filter_by(id=user_id).update(
+            {column: column + delta},
+            synchronize_session=False
+        )
+
+    def record_follow(self, follower_id, following_id, delta=1):
+        """Update both sides of a follow (delta=-1 for an unfollow)"""
+        self.increment_user(follower_id, 'following_count', delta)
+        self.increment_user(following_id, 'followers_count', delta)
+
+    def record_post(self, post, delta=1):
+        """Update the author's post count (stories are not counted)"""
+        if post.is_story:
+            return 0
+        return self.increment_user(post.user_id, 'posts_count', delta)
+
+    def reconcile_posts(self):
+        """Recompute every post counter from the source tables in bulk.
+
+        Returns the number of posts whose counters had drifted.
+        """
+        actual = {
+            'likes_count': self._count(Like.id, Like.post_id == Post.id),
+            'comments_count': self._count(PostComment.id, PostComment.post_id == Post.id),
+            'saves_count': self._count(SavedPost.id, SavedPost.post_id == Post.id),
+        }
+        return self._reconcile(Post, actual, updated_at=Post.updated_at)
+
+    def reconcile_users(self):
+        """Recompute every user counter from the source tables in bulk.
+
+        Returns the number of users whose counters had drifted.
+        """
+        actual = {
+            'followers_count': self._count(Follow.id, Follow.following_id == User.id),
+            'following_count': self._count(Follow.id, Follow.follower_id == User.id),
+            'posts_count': self._count(Post.id, Post.user_id == User.id, Post.is_story == False),
+        }
+        return self._reconcile(User, actual)
+
+    def _count(self, column, *criteria):
+        return select(func.count(column)).where(*criteria).scalar_subquery()
+
+    def _reconcile(self, model, actual, **pinned):
+        drifted = or_(*[getattr(model, counter) != subquery for counter, subquery in actual.items()])
+        result = db.session.execute(
+            db.update(model).where(drifted).values(**pinned, **actual).execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
@@ -0,0 +1,71 @@
+from flask import current_app
+from sqlalchemy import and_, or_
+from app import db
+from app.models.family import FamilyMember
+from app.models.story import Story
+from app.utils.cache import get_store
+
+class FamilyAccess:
+    """One user's family memberships, as {family_id: role_in_family}"""
+
+    __slots__ = ('user_id', 'roles')
+
+    def __init__(self, user_id, roles):
+        self.user_id = user_id
+        self.roles = roles
+
+    @property
+    def family_ids(self):
+        return list(self.roles)
+
+    def is_member(self, family_id):
+        return family_id in self.roles
+
+    def is_admin(self, family_id):
+        return self.roles.get(family_id) == 'admin'
+
+    def can_view_story(self, story):
+        if story.user_id == self.user_id:
+            return True
+        if story.visibility == 'private':
+            return False
+        if story.visibility == 'family':
+            return self.is_member(story.family_id)
+        return True
+
+    def story_filter(self):
+        """Criterion matching the stories can_view_story allows, for filtering lists in SQL"""
+        return or_(
+            Story.user_id == self.user_id,
+            Story.visibility == 'public',
+            and_(Story.visibility == 'family', Story.family_id.in_(self.family_ids))
+        )
+
+class FamilyAccessService:
+    """Family authorization from a cached copy of each user's memberships.
+
+    A user's (family_id, role) pairs are read with one indexed query and
+    kept for FAMILY_ACCESS_CACHE_TTL seconds in FAMILY_ACCESS_CACHE_BACKEND
+    ('memory', 'redis' or 'none'), so membership checks and family-scoped
+    list filters cost no query. Code that adds, removes or changes a
+    membership calls invalidate() for that user after committing.
+    """
+
+    def __init__(self):
+        self.store = get_store('family_access', 'FAMILY_ACCESS_CACHE_BACKEND', 'FAMILY_ACCESS_CACHE_MAX_ENTRIES')
+        self.ttl = current_app.config.get('FAMILY_ACCESS_CACHE_TTL', 300)
+
+    def load(self, user_id):
+        key = str(user_id)
+        pairs = self.store.get(key) if self.store is not None else None
+        if pairs is None:
+            pairs = [list(row) for row in db.session.query(
+                FamilyMember.family_id, FamilyMember.role_in_family
+            ).filter(FamilyMember.user_id == user_id).all()]
+            if self.store is not None:
+                self.store.set(key, pairs, ex=self.ttl)
+        return FamilyAccess(user_id, dict(pairs))
+
+    def invalidate(self, *user_ids):
+        if self.store is not None and user_ids:
+            self.store.delete(*[str(user_id) for user_id in user_ids])
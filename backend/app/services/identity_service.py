@@ -0,0 +1,74 @@
+from flask import current_app, jsonify
+from app import db
+from app.models.user import User
+from app.services.response_cache_service import ResponseCache
+from app.utils.cache import get_store
+
+class UserSnapshot:
+    """Read-only copy of a user's public profile, as loaded for a JWT.
+
+    It deliberately carries no password hash: anything that checks or
+    changes credentials reads the users row itself.
+    """
+
+    __slots__ = ('_profile',)
+
+    def __init__(self, profile):
+        self._profile = profile
+
+    def __getattr__(self, name):
+        try:
+            return self._profile[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def to_dict(self):
+        return dict(self._profile)
+
+class IdentityService:
+    """Users behind JWTs, cached as profile snapshots.
+
+    flask_jwt_extended calls load() once per authenticated request and
+    keeps the result as current_user for the rest of it; across requests
+    snapshots live for USER_CACHE_TTL seconds in USER_CACHE_BACKEND
+    ('memory', 'redis' or 'none'). Code that changes a user's profile or
+    counters calls invalidate() after committing, which also retires the
+    user's response version so ETags built on the profile change.
+    """
+
+    def __init__(self):
+        self.store = get_store('user_snapshots', 'USER_CACHE_BACKEND', 'USER_CACHE_MAX_ENTRIES')
+        self.ttl = current_app.config.get('USER_CACHE_TTL', 60)
+
+    def load(self, user_id):
+        """The user's snapshot, or None if the account no longer exists"""
+        key = str(user_id)
+        profile = self.store.get(key) if self.store is not None else None
+        if profile is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            profile = user.to_dict()
+            if self.store is not None:
+                self.store.set(key, profile, ex=self.ttl)
+        return UserSnapshot(profile)
+
+    def invalidate(self, *user_ids):
+        if self.store is not None and user_ids:
+            self.store.delete(*[str(user_id) for user_id in user_ids])
+        ResponseCache().invalidate('user', *user_ids)
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear()
+        ResponseCache().clear()
+
+def register_user_lookup(jwt):
+    """Load current_user for every JWT-protected request"""
+    @jwt.user_lookup_loader
+    def load_user(jwt_header, jwt_data):
+        return IdentityService().load(jwt_data['sub'])
+
+    @jwt.user_lookup_error_loader
+    def user_not_found(jwt_header, jwt_data):
+        return jsonify({'error': 'User not found'}), 401
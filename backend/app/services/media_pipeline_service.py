@@ -0,0 +1,345 @@
+import base64
+import hashlib
+import io
+import os
+import secrets
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, exists
+from PIL import Image, ImageOps
+from app import db
+from app.models.media import Media, PostMedia
+from app.models.archive import ArchivedStoryMedia
+from app.models.post import Post
+from app.services.pubsub_service import publish_to_users
+from app.services.media_service import MediaService, hash_file, READ_BLOCK_SIZE
+from app.services.storage_backends import get_storage
+
+# Longest side of a processed image, as the Cloudinary transformation did
+FULL_IMAGE_SIZE = 1080
+
+# Square crops for small and grid tiles, in pixels
+VARIANT_SIZES = {'thumb': 150, 'grid': 480}
+
+# Longest side of the inline blur placeholder
+PLACEHOLDER_SIZE = 16
+
+class MediaError(Exception):
+    """Media that cannot be attached or processed"""
+
+class MediaPipelineService:
+    """Deferred media processing.
+
+    The upload request only spools the original into MEDIA_PENDING_DIR and
+    records a pending Media row. A worker on the 'media' queue converts it,
+    renders the size variants and blur placeholder, hands them to the
+    storage backend and then fills in the media of any posts that were
+    published while it was pending.
+    Uploads whose content is already stored skip all of that and reuse it.
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage()
+        self.media_service = MediaService(self.storage)
+        self.pending_dir = current_app.config.get('MEDIA_PENDING_DIR')
+        self.max_retries = current_app.config.get('MEDIA_PROCESS_MAX_RETRIES', 3)
+        self.retry_delay_base = current_app.config.get('MEDIA_PROCESS_RETRY_DELAY', 30)
+        self.unattached_ttl = current_app.config.get('MEDIA_UNATTACHED_TTL', 86400)
+        os.makedirs(self.pending_dir, exist_ok=True)
+
+    def submit(self, user_id, media_type, folder, source, filename):
+        """Spool and queue an upload; commits and returns the pending Media.
+
+        source is either a path, which is moved into the spool, or a file
+        object, which is copied.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        path = os.path.join(self.pending_dir, f'{secrets.token_hex(16)}{extension}')
+        if isinstance(source, (str, os.PathLike)):
+            content_hash = hash_file(source)
+            shutil.move(source, path)
+        else:
+            # Hash while spooling, so the bytes are only read once
+            digest = hashlib.sha256()
+            with open(path, 'wb') as spool:
+                for block in iter(lambda: source.read(READ_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    spool.write(block)
+            content_hash = digest.hexdigest()
+
+        media = Media(user_id=user_id, media_type=media_type, folder=folder,
+                      content_hash=content_hash, source_path=path)
+        db.session.add(media)
+        db.session.commit()
+
+        # Content that is already stored needs no processing at all
+        blob = self.media_service.claim(content_hash, media_type, processed=True)
+        if blob is not None:
+            self._use_blob(media, blob)
+            self._finish(media, 'ready')
+            self._remove_source(path)
+            return media
+
+        from app.tasks.media_tasks import process_media
+        try:
+            process_media.delay(media.id)
+        except Exception as e:
+            current_app.logger.error(f"Media enqueue error: {str(e)}")
+            self.mark_failed(media.id, 'Could not queue processing')
+        db.session.refresh(media)  # An eager task updated it in its own session
+        return media
+
+    def attach(self, post, media_ids):
+        """Link the author's media to a flushed post, pending or not"""
+        if not media_ids:
+            return
+        # Lock the media rows so a worker finishing one of them waits for the
+        # link to commit, and then sees it when it updates linked posts
+        media = {m.id: m for m in Media.query.filter(
+            Media.id.in_(media_ids),
+            Media.user_id == post.user_id
+        ).with_for_update().all()}
+        if set(media_ids) - set(media):
+            raise MediaError('Unknown media')
+        if any(m.status == 'failed' for m in media.values()):
+            raise MediaError('Media processing failed')
+
+        for position, media_id in enumerate(dict.fromkeys(media_ids)):
+            db.session.add(PostMedia(post_id=post.id, media_id=media_id, position=position))
+        db.session.flush()
+        self.sync_post(post)
+
+    def process(self, media_id):
+        """Worker side: convert, store and publish one upload.
+
+        StorageError propagates with the source kept, so the task can retry;
+        MediaError means the file itself is unusable.
+        """
+        media = Media.query.filter_by(id=media_id).with_for_update().first()
+        if media is None or media.status not in ('pending', 'processing'):
+            return None
+        media.status = 'processing'
+        db.session.commit()
+
+        source = media.source_path
+        content_hash = media.content_hash or hash_file(source)
+        # An identical upload may have finished since this one was queued
+        blob = self.media_service.claim(content_hash, media.media_type, processed=True)
+        if blob is None:
+            blob = self._store(media, source, content_hash)
+        if not self._lock(media_id):
+            # Its post was deleted while it was processing; nothing will use the file
+            self.media_service.release(blob.public_id, media.media_type)
+            self._remove_source(source)
+            return None
+        self._use_blob(media, blob)
+        self._finish(media, 'ready')
+        self._remove_source(source)
+        return media.to_dict()
+
+    def _store(self, media, source, content_hash):
+        """Convert and store an upload with its size variants; returns its new MediaBlob"""
+        details = {'size': os.path.getsize(source), 'variant_public_ids': []}
+        with tempfile.TemporaryDirectory(dir=self.pending_dir) as workdir:
+            upload_path, variant_paths = source, {}
+            if media.media_type == 'image':
+                upload_path, variant_paths, details['placeholder'], (details['width'], details['height']) = \
+                    self.render_image(source, workdir)
+            stored = self.storage.save(upload_path, media.folder, media.media_type)
+
+            variants = {}
+            for name, size in VARIANT_SIZES.items():
+                # Prefer a variant the backend derives itself; otherwise store ours
+                variants[name] = self.storage.variant_url(stored['public_id'], media.media_type, size)
+                if variants[name] is None and name in variant_paths:
+                    variant = self.storage.save(variant_paths[name], f'{media.folder}/{name}', 'image')
+                    variants[name] = variant['url']
+                    details['variant_public_ids'].append(variant['public_id'])
+            if media.media_type == 'image':
+                variants['full'] = stored['url']
+            variants = {name: url for name, url in variants.items() if url}
+
+        return self.media_service.record(
+            content_hash, media.media_type, stored,
+            processed=True,
+            thumbnail_url=variants.get('thumb'),
+            variants=variants or None,
+            **details
+        )
+
+    def render_image(self, source, workdir):
+        """Resize an image into JPEG variants.
+
+        Returns the full-size path, the square variant paths by name, a
+        placeholder data URI and the full-size dimensions.
+        """
+        try:
+            image = Image.open(source)
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+            raise MediaError('Unreadable image') from e
+        with image:
+            # Let the JPEG decoder downscale while reading large photos
+            image.draft('RGB', (FULL_IMAGE_SIZE, FULL_IMAGE_SIZE))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                flattened = Image.new('RGB', image.size, 'white')
+                flattened.paste(image, mask=image.getchannel('A'))
+                image = flattened
+            else:
+                image = image.convert('RGB')
+
+            image.thumbnail((FULL_IMAGE_SIZE, FULL_IMAGE_SIZE), Image.LANCZOS)
+            full_path = os.path.join(workdir, 'full.jpg')
+            image.save(full_path, 'JPEG', quality=85, optimize=True, progressive=True)
+
+            # Largest first, each resized from the previous one rather than the full image
+            variant_paths = {}
+            square = image
+            for name, size in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+                square = ImageOps.fit(square, (size, size), Image.LANCZOS)
+                variant_paths[name] = os.path.join(workdir, f'{name}.jpg')
+                square.save(variant_paths[name], 'JPEG', quality=80, optimize=True)
+
+            tiny = image.copy()
+            tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            buffer = io.BytesIO()
+            tiny.save(buffer, 'JPEG', quality=50)
+            placeholder = 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+        return full_path, variant_paths, placeholder, image.size
+
+    def retry_delay(self, retries):
+        return self.retry_delay_base * (2 ** retries)
+
+    def mark_failed(self, media_id, error):
+        db.session.rollback()
+        media = db.session.get(Media, media_id)
+        if media is None or media.status in ('ready', 'failed'):
+            return None
+        media.error = str(error)
+        source = media.source_path
+        self._finish(media, 'failed')
+        self._remove_source(source)
+        return media.to_dict()
+
+    def sync_post(self, post):
+        """Recompute a post's media_urls, variants and pending count from its linked media.
+
+        URLs the post was created with directly are kept in front.
+        """
+        linked = db.session.query(Media).join(
+            PostMedia, PostMedia.media_id == Media.id
+        ).filter(PostMedia.post_id == post.id).order_by(PostMedia.position).all()
+        linked_urls = {m.url for m in linked if m.url}
+        kept = [url for url in (post.media_urls or []) if url not in linked_urls]
+        ready = [m for m in linked if m.status == 'ready']
+        kept_variants = (post.media_variants or [None] * len(post.media_urls or []))[:len(kept)]
+        post.media_urls = kept + [m.url for m in ready]
+        post.media_variants = kept_variants + [self.variants_entry(m) for m in ready]
+        post.pending_media = sum(1 for m in linked if m.status in ('pending', 'processing'))
+
+    def detach(self, post):
+        """Unlink a post's media before it is deleted.
+
+        Media no other post uses is deleted; returns the public_ids whose
+        references the caller should release once the deletion commits.
+        Media still being processed is deleted too, and the worker releases
+        what it stored when it finds its row gone.
+        """
+        released = self.detach_posts([post.id])
+        db.session.expire(post, ['media_links'])  # Its links are gone already
+        return released
+
+    def detach_posts(self, post_ids):
+        """detach() for many posts at once, removed with bulk DELETEs"""
+        media_ids = [row[0] for row in db.session.query(PostMedia.media_id).filter(
+            PostMedia.post_id.in_(post_ids)
+        ).distinct().all()]
+        if not media_ids:
+            return []
+        db.session.execute(delete(PostMedia).where(PostMedia.post_id.in_(post_ids)))
+        return self.delete_unlinked(media_ids)
+
+    def delete_unlinked(self, media_ids):
+        """Delete those of media_ids that no post or archived story links any more.
+
+        Returns the public_ids whose references the caller should release
+        once the deletion commits.
+        """
+        unlinked = Media.query.filter(
+            Media.id.in_(media_ids),
+            ~exists().where(PostMedia.media_id == Media.id),
+            ~exists().where(ArchivedStoryMedia.media_id == Media.id)
+        )
+        released = []
+        # Locked so a worker either finishes a media first or finds it gone, see process()
+        for media in unlinked.with_for_update().all():
+            if media.status == 'pending':
+                self._remove_source(media.source_path)  # No worker has started on it
+            elif media.status != 'processing' and media.public_id:
+                released.append(media.public_id)
+            db.session.delete(media)
+        return released
+
+    def purge_unattached(self, now=None):
+        """Delete uploads no post was published with within MEDIA_UNATTACHED_TTL; returns how many"""
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=self.unattached_ttl)
+        media_ids = [row[0] for row in db.session.query(Media.id).filter(
+            Media.created_at <= cutoff,
+            ~exists().where(PostMedia.media_id == Media.id),
+            ~exists().where(ArchivedStoryMedia.media_id == Media.id)
+        ).all()]
+        released = self.delete_unlinked(media_ids) if media_ids else []
+        db.session.commit()
+
+        for public_id in released:
+            self.media_service.delete_media(public_id)
+        return len(media_ids)
+
+    def variants_entry(self, media):
+        """A post's media_variants entry for one media: sized URLs, placeholder and dimensions"""
+        if not media.variants and not media.placeholder:
+            return None
+        return {
+            **(media.variants or {}),
+            'placeholder': media.placeholder,
+            'width': media.width,
+            'height': media.height
+        }
+
+    def _lock(self, media_id):
+        """Lock a media row until the next commit; False if it has been deleted"""
+        return db.session.query(Media.id).filter(Media.id == media_id).with_for_update().first() is not None
+
+    def _use_blob(self, media, blob):
+        media.url = blob.url
+        media.public_id = blob.public_id
+        media.duration = blob.duration
+        media.thumbnail_url = blob.thumbnail_url
+        media.variants = blob.variants
+        media.placeholder = blob.placeholder
+        media.width = blob.width
+        media.height = blob.height
+
+    def _finish(self, media, status):
+        media.status = status
+        media.source_path = None
+        media.processed_at = datetime.utcnow()
+        db.session.flush()
+        # Row locks serialise workers finishing different media of one post
+        posts = Post.query.join(PostMedia, PostMedia.post_id == Post.id).filter(
+            PostMedia.media_id == media.id
+        ).with_for_update(of=Post).all()
+        for post in posts:
+            self.sync_post(post)
+        db.session.commit()
+        publish_to_users([media.user_id], 'media', media.to_dict())
+
+    def _remove_source(self, source):
+        try:
+            if source:
+                os.remove(source)
+        except FileNotFoundError:
+            pass
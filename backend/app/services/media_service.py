@@ -1,78 +1,155 @@
-import cloudinary
-import cloudinary.uploader
+import hashlib
 import os
 from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.media import MediaBlob
+from app.services.storage_backends import StorageError, get_storage
+
+READ_BLOCK_SIZE = 64 * 1024
+
+def hash_file(file):
+    """SHA-256 hex digest of a path or file object, read in small blocks.
+
+    File objects are rewound afterwards so they can still be stored.
+    """
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        file.seek(0)
+        for block in iter(lambda: file.read(READ_BLOCK_SIZE), b''):
+            digest.update(block)
+        file.seek(0)
+    return digest.hexdigest()
 
 class MediaService:
-    def __init__(self):
-        cloudinary.config(
-            cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
-            api_key=os.getenv('CLOUDINARY_API_KEY'),
-            api_secret=os.getenv('CLOUDINARY_API_SECRET')
-        )
-    
+    """Uploads through the configured storage backend, deduplicated by content.
+
+    Every stored file has a MediaBlob keyed by the SHA-256 of the original
+    upload (and whether the pipeline processed it). Uploading the same
+    bytes again returns the existing URL and public_id and bumps the blob's
+    reference count instead of storing a copy; delete_media only removes
+    the file once no references are left.
+
+    The upload_* methods are synchronous, for callers that need the final
+    URL straight away (profile pictures, message attachments); post media
+    goes through MediaPipelineService instead.
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage()
+
     def upload_image(self, file, folder="posts"):
-        """Upload image to Cloudinary"""
-        try:
-            result = cloudinary.uploader.upload(
-                file,
-                folder=f"kinkeep/{folder}",
-                resource_type="image",
-                transformation=[
-                    {'width': 1080, 'height': 1080, 'crop': 'limit', 'quality': 'auto'},
-                    {'format': 'jpg'}
-                ]
-            )
-            return {
-                'success': True,
-                'url': result['secure_url'],
-                'public_id': result['public_id']
-            }
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
-    
+        """Upload image to storage"""
+        return self._upload(file, folder, 'image')
+
     def upload_video(self, file, folder="posts"):
-        """Upload video to Cloudinary"""
-        try:
-            result = cloudinary.uploader.upload(
-                file,
-                folder=f"kinkeep/{folder}",
-                resource_type="video",
-                transformation=[
-                    {'width': 1080, 'height': 1920, 'crop': 'limit', 'quality': 'auto'},
-                    {'format': 'mp4'}
-                ]
-            )
-            return {
-                'success': True,
-                'url': result['secure_url'],
-                'public_id': result['public_id'],
-                'duration': result.get('duration', 0)
-            }
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
-    
+        """Upload video to storage"""
+        return self._upload(file, folder, 'video')
+
     def upload_audio(self, file, folder="messages"):
-        """Upload audio to Cloudinary"""
+        """Upload audio to storage"""
+        return self._upload(file, folder, 'audio')
+
+    def delete_media(self, public_id, resource_type="image"):
+        """Drop one reference to stored media, deleting it with the last one"""
         try:
-            result = cloudinary.uploader.upload(
-                file,
-                folder=f"kinkeep/{folder}",
-                resource_type="video"  # Cloudinary treats audio as video
-            )
-            return {
-                'success': True,
-                'url': result['secure_url'],
-                'public_id': result['public_id'],
-                'duration': result.get('duration', 0)
-            }
-        except Exception as e:
+            references = self.release(public_id, resource_type)
+        except StorageError as e:
             return {'success': False, 'error': str(e)}
-    
-    def delete_media(self, public_id, resource_type="image"):
-        """Delete media from Cloudinary"""
+        return {'success': True, 'result': 'deleted' if references == 0 else 'in use', 'references': references}
+
+    def claim(self, content_hash, media_type, processed=False):
+        """Take a reference to already-stored content; returns its MediaBlob or None"""
+        blob = MediaBlob.query.filter_by(content_hash=content_hash, media_type=media_type, processed=processed).first()
+        if blob is None:
+            return None
+        # A blob at zero references is being deleted; treat it as missing
+        claimed = MediaBlob.query.filter(
+            MediaBlob.id == blob.id,
+            MediaBlob.ref_count > 0
+        ).update({'ref_count': MediaBlob.ref_count + 1}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return None
+        db.session.refresh(blob)
+        return blob
+
+    def record(self, content_hash, media_type, stored, processed=False, **details):
+        """Register newly stored content with one reference; returns its MediaBlob.
+
+        details are further MediaBlob columns (size, variants, placeholder...).
+        If an identical upload was recorded meanwhile, that one wins: the
+        copy just stored is deleted and the existing blob is claimed.
+        """
+        blob = MediaBlob(
+            content_hash=content_hash,
+            media_type=media_type,
+            processed=processed,
+            public_id=stored['public_id'],
+            url=stored['url'],
+            duration=stored.get('duration'),
+            **details
+        )
+        db.session.add(blob)
+        try:
+            db.session.commit()
+            return blob
+        except IntegrityError:
+            db.session.rollback()
+
+        existing = self.claim(content_hash, media_type, processed)
+        if existing is None:
+            raise StorageError('Duplicate media was deleted while storing')
+        self._delete_stored(stored['public_id'], details.get('variant_public_ids'), media_type)
+        return existing
+
+    def release(self, public_id, resource_type='image'):
+        """Drop a reference; returns the references left.
+
+        Files stored before deduplication have no blob and are deleted
+        outright.
+        """
+        blob = MediaBlob.query.filter_by(public_id=public_id).first()
+        if blob is None:
+            self.storage.delete(public_id, resource_type)
+            return 0
+        variant_public_ids, media_type = blob.variant_public_ids, blob.media_type
+
+        MediaBlob.query.filter_by(id=blob.id).update(
+            {'ref_count': MediaBlob.ref_count - 1}, synchronize_session=False
+        )
+        # Conditional delete, so only one of two racing releases removes the files
+        deleted = MediaBlob.query.filter(
+            MediaBlob.id == blob.id,
+            MediaBlob.ref_count <= 0
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        if not deleted:
+            db.session.refresh(blob)
+            return blob.ref_count
+
+        self._delete_stored(public_id, variant_public_ids, media_type)
+        return 0
+
+    def _upload(self, file, folder, media_type):
         try:
-            result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
-            return {'success': True, 'result': result}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
\ No newline at end of file
+            content_hash = hash_file(file)
+            blob = self.claim(content_hash, media_type)
+            if blob is not None:
+                return {'success': True, 'duplicate': True, **blob.to_result()}
+
+            stored = self.storage.save(file, folder, media_type)
+            blob = self.record(content_hash, media_type, stored)
+        except StorageError as e:
+            current_app.logger.error(f"Media upload error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+        return {'success': True, 'duplicate': False, **blob.to_result()}
+
+    def _delete_stored(self, public_id, variant_public_ids, media_type):
+        self.storage.delete(public_id, media_type)
+        for variant_public_id in variant_public_ids or []:
+            self.storage.delete(variant_public_id, 'image')
@@ -0,0 +1,128 @@
+import json
+import queue
+import threading
+import time
+from flask import current_app
+
+_broker_lock = threading.Lock()
+
+class InProcessBroker:
+    """Pub/sub inside a single worker process.
+
+    Each subscription owns a bounded queue; a subscriber that stops reading
+    drops events instead of growing memory without limit.
+    """
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return len(subscribers)
+
+    def subscribe(self, *channels):
+        subscription = InProcessSubscription(self, channels, self.max_pending)
+        with self._lock:
+            for channel in channels:
+                self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._channels[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._channels.values())
+
+class InProcessSubscription:
+    """A subscriber's view of one or more channels"""
+
+    def __init__(self, broker, channels, max_pending):
+        self.broker = broker
+        self.channels = channels
+        self._queue = queue.Queue(maxsize=max_pending)
+
+    def deliver(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            pass
+
+    def get(self, timeout=None):
+        """Next event dict, or None if nothing arrived within timeout"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class RedisBroker:
+    """Pub/sub over any server speaking the Redis protocol (multi-worker)"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel, event):
+        return self.client.publish(channel, json.dumps(event))
+
+    def subscribe(self, *channels):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*channels)
+        return RedisSubscription(pubsub)
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def get(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            message = self.pubsub.get_message(timeout=remaining)
+            if message and message['type'] == 'message':
+                return json.loads(message['data'])
+
+    def close(self):
+        self.pubsub.close()
+
+def get_broker(app=None):
+    """The app-wide broker selected by PUBSUB_BACKEND ('memory' or 'redis')"""
+    app = app or current_app._get_current_object()
+    with _broker_lock:
+        broker = app.extensions.get('pubsub')
+        if broker is None:
+            if app.config.get('PUBSUB_BACKEND') == 'redis':
+                broker = RedisBroker(app.config['REDIS_URL'])
+            else:
+                broker = InProcessBroker(app.config.get('PUBSUB_MAX_PENDING', 1000))
+            app.extensions['pubsub'] = broker
+    return broker
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+def publish_to_users(user_ids, event_type, data):
+    """Push an event to each user's channel; delivery is best effort"""
+    try:
+        broker = get_broker()
+        event = {'type': event_type, 'data': data}
+        for user_id in set(user_ids):
+            broker.publish(user_channel(user_id), event)
+    except Exception as e:
+        current_app.logger.error(f"Event publish error: {str(e)}")
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import insert, select
+from app import db
+from app.models.post import Post, Like, PostComment, SavedPost
+from app.models.ranking import PostRank
+from app.utils.pagination import page_size
+
+SURFACES = ('explore', 'reels')
+
+class RankingService:
+    """Precomputed explore and reels rankings.
+
+    A periodic job scores every public post from the last
+    RANKING_WINDOW_DAYS in one vectorised pass and stores the top
+    RANKING_MAX_POSTS per surface in post_ranks. Each like, comment and
+    save adds its weight, halved for every RANKING_HALF_LIFE_HOURS since it
+    happened; the post itself counts as one interaction at its creation
+    time, so new posts surface before they collect engagement. Requests
+    then read a range of ranks instead of scoring anything.
+    """
+
+    def __init__(self):
+        self.window = timedelta(days=current_app.config.get('RANKING_WINDOW_DAYS', 14))
+        self.half_life = current_app.config.get('RANKING_HALF_LIFE_HOURS', 24)
+        self.max_posts = current_app.config.get('RANKING_MAX_POSTS', 5000)
+        self.chunk_size = current_app.config.get('RANKING_CHUNK_SIZE', 50000)
+        self.weights = {
+            Like: current_app.config.get('RANKING_LIKE_WEIGHT', 1.0),
+            PostComment: current_app.config.get('RANKING_COMMENT_WEIGHT', 3.0),
+            SavedPost: current_app.config.get('RANKING_SAVE_WEIGHT', 4.0),
+        }
+
+    def rebuild(self, now=None):
+        """Rescore recent posts and replace every surface's ranking; commits"""
+        now = now or datetime.utcnow()
+        since = now - self.window
+
+        rows = db.session.execute(
+            select(Post.id, Post.created_at, Post.is_reel).where(*self._candidate_filter(since)).order_by(Post.id)
+        ).all()
+        post_ids = np.array([r[0] for r in rows], dtype=np.int64)
+        is_reel = np.array([bool(r[2]) for r in rows], dtype=bool)
+        scores = self._decay([r[1] for r in rows], now)
+        for model, weight in self.weights.items():
+            scores += self._engagement(model, weight, post_ids, since, now)
+
+        # Highest score first; newer posts win ties
+        order = np.lexsort((-post_ids, -scores))
+        counts = {}
+        for surface in SURFACES:
+            ranked = order[is_reel[order]] if surface == 'reels' else order
+            ranked = ranked[:self.max_posts]
+            PostRank.query.filter_by(surface=surface).delete(synchronize_session=False)
+            for start in range(0, len(ranked), self.chunk_size):
+                chunk = ranked[start:start + self.chunk_size]
+                db.session.execute(insert(PostRank), [{
+                    'surface': surface,
+                    'rank': start + position + 1,
+                    'post_id': int(post_ids[i]),
+                    'score': float(scores[i]),
+                    'computed_at': now
+                } for position, i in enumerate(chunk)])
+            counts[surface] = len(ranked)
+        db.session.commit()  # Readers switch to the new ranking all at once
+        return counts
+
+    def is_ranked(self, surface):
+        return db.session.query(PostRank.id).filter_by(surface=surface).first() is not None
+
+    def ranked_query(self, surface):
+        """Ranked posts of a surface, best first"""
+        return Post.query.join(PostRank, PostRank.post_id == Post.id).filter(
+            PostRank.surface == surface
+        ).order_by(PostRank.rank)
+
+    def page(self, surface, cursor=None, limit=10):
+        """Posts ranked after the cursor (the last rank seen); returns (posts, next_cursor).
+
+        Raises ValueError for a malformed cursor; limit is clamped by page_size().
+        """
+        limit = page_size(limit)
+        after_rank = int(cursor) if cursor else 0
+        rows = db.session.query(Post, PostRank.rank).join(
+            PostRank, PostRank.post_id == Post.id
+        ).filter(
+            PostRank.surface == surface,
+            PostRank.rank > after_rank
+        ).order_by(PostRank.rank).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1][1])
+        return [post for post, _ in rows], next_cursor
+
+    def remove_post(self, post_id):
+        """Drop a deleted post from every ranking; the gap closes on the next rebuild"""
+        return PostRank.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+
+    def _candidate_filter(self, since):
+        return (
+            Post.created_at >= since,
+            Post.is_story == False,
+            Post.visibility == 'public'
+        )
+
+    def _engagement(self, model, weight, post_ids, since, now):
+        """Decayed, weighted interaction totals per candidate post"""
+        totals = np.zeros(len(post_ids))
+        if not len(post_ids):
+            return totals
+
+        result = db.session.execute(
+            select(model.post_id, model.created_at).join(
+                Post, Post.id == model.post_id
+            ).where(*self._candidate_filter(since)).execution_options(yield_per=self.chunk_size)
+        )
+        for chunk in result.partitions():
+            ids = np.array([r[0] for r in chunk], dtype=np.int64)
+            index = np.searchsorted(post_ids, ids)
+            totals += np.bincount(index, weights=weight * self._decay([r[1] for r in chunk], now),
+                                  minlength=len(post_ids))
+        return totals
+
+    def _decay(self, timestamps, now):
+        """2^(-age / half-life) for each timestamp, as an array"""
+        times = np.array(timestamps, dtype='datetime64[us]')
+        ages = (np.datetime64(now, 'us') - times) / np.timedelta64(1, 'h')
+        return np.exp2(-np.maximum(ages, 0) / self.half_life)
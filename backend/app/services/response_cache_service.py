@@ -0,0 +1,80 @@
+import hashlib
+import json
+import secrets
+from flask import current_app, request, Response
+from app.utils.cache import get_store
+
+class ResponseCache:
+    """Strong ETags and rendered JSON for read-heavy GET resources.
+
+    A response's ETag hashes the version stamps of everything its body is
+    built from. Rows that change on every edit stamp themselves (a post's
+    updated_at and counters, a story's updated_at); users, whose rows have
+    no such column, get a random version token in RESPONSE_CACHE_BACKEND
+    ('memory', 'redis' or 'none') that invalidate() discards after a write
+    commits. A request whose If-None-Match still matches is answered 304
+    without rendering anything, and with RESPONSE_CACHE_STORE_BODIES the
+    rendered JSON is kept under its ETag for other clients.
+
+    Tokens expire after RESPONSE_CACHE_TTL seconds and a missing one is
+    minted afresh, so losing a token only costs a full response.
+    """
+
+    def __init__(self):
+        self.versions = get_store('response_versions', 'RESPONSE_CACHE_BACKEND', 'RESPONSE_CACHE_MAX_ENTRIES')
+        self.bodies = None
+        if self.versions is not None and current_app.config.get('RESPONSE_CACHE_STORE_BODIES', True):
+            self.bodies = get_store('response_bodies', 'RESPONSE_CACHE_BACKEND', 'RESPONSE_CACHE_MAX_BODIES')
+        self.ttl = current_app.config.get('RESPONSE_CACHE_TTL', 300)
+
+    @property
+    def enabled(self):
+        return self.versions is not None
+
+    def tokens(self, kind, ids):
+        """Current version token of each entity, minting any that are missing"""
+        if not self.enabled:
+            return []
+        keys = [f'{kind}:{entity_id}' for entity_id in ids]
+        values = self.versions.mget(keys)
+        if values is None:
+            # Unknown versions must never match an old ETag
+            return [secrets.token_hex(8) for _ in keys]
+        for i, value in enumerate(values):
+            if value is None:
+                values[i] = secrets.token_hex(8)
+                self.versions.set(keys[i], values[i], ex=self.ttl)
+        return values
+
+    def respond(self, render, *stamps):
+        """The response for a GET whose body render() builds from the entities stamps identify.
+
+        304 if the client already holds it; otherwise the JSON, from the body
+        store when another request has rendered it already.
+        """
+        if not self.enabled:
+            return render()
+
+        etag = hashlib.sha256(repr(stamps).encode()).hexdigest()[:32]
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = self.bodies.get(etag) if self.bodies is not None else None
+            if body is None:
+                body = json.dumps(render())
+                if self.bodies is not None:
+                    self.bodies.set(etag, body, ex=self.ttl)
+            response = Response(body + '\n', mimetype='application/json')
+        response.set_etag(etag)
+        # Browsers keep the copy but revalidate it on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def invalidate(self, kind, *ids):
+        """Retire the version tokens of changed entities; call after committing"""
+        if self.enabled and ids:
+            self.versions.delete(*[f'{kind}:{entity_id}' for entity_id in ids])
+
+    def clear(self):
+        if self.enabled:
+            self.versions.clear()
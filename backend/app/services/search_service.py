@@ -0,0 +1,227 @@
+import re
+from flask import current_app
+from sqlalchemy import and_, column, exists, func, insert, literal, literal_column, null, or_, select, table
+from app import db
+from app.models.story import Story, Comment
+from app.models.post import Post, PostComment
+from app.models.follow import CloseFriend
+from app.models.search import SearchDocument, SEARCH_VECTOR
+from app.services.family_access_service import FamilyAccessService
+
+KINDS = {
+    'stories': ('story',),
+    'posts': ('post',),
+    'comments': ('story_comment', 'post_comment'),
+}
+
+def search_terms(query, limit=8):
+    """The words of a user's query, lowercased; punctuation and operators are dropped"""
+    return re.findall(r'[^\W_]+', query.lower())[:limit]
+
+def story_body(content, enhanced_content):
+    return (content or '') + ('\n\n' + enhanced_content if enhanced_content is not None else '')
+
+def excerpt(text, terms, width=160):
+    """About width characters of text, starting shortly before the first term found in it"""
+    lowered = text.lower()
+    positions = [p for p in (lowered.find(term) for term in terms) if p >= 0]
+    start = max(min(positions) - width // 4, 0) if positions else 0
+    return ('…' if start else '') + text[start:start + width].strip() + ('…' if start + width < len(text) else '')
+
+class SQLiteSearchIndex:
+    """FTS5 over search_documents, kept in step by triggers; ranked by bm25"""
+
+    fts = table('search_documents_fts', column('rowid'))
+
+    def ranked(self, terms):
+        """select(SearchDocument, score) matching every term as a prefix, higher scores better"""
+        match = ' '.join(f'"{term}"*' for term in terms)
+        score = -func.bm25(literal_column('search_documents_fts'), 2.5, 1.0)
+        return select(SearchDocument, score.label('score')).join(
+            self.fts, self.fts.c.rowid == SearchDocument.id
+        ).where(literal_column('search_documents_fts').op('MATCH')(match))
+
+    def rebuild(self):
+        db.session.execute(db.text(
+            "INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')"
+        ))
+
+class PostgresSearchIndex:
+    """GIN index on a weighted tsvector expression (titles A, text B); ranked by ts_rank_cd"""
+
+    def ranked(self, terms):
+        # Same expression as the index, so the planner can use it
+        vector = literal_column(SEARCH_VECTOR)
+        query = func.to_tsquery(literal_column("'english'"), ' & '.join(f'{term}:*' for term in terms))
+        return select(SearchDocument, func.ts_rank_cd(vector, query).label('score')).where(
+            vector.op('@@')(query)
+        )
+
+    def rebuild(self):
+        pass  # The GIN index follows the table
+
+class SearchService:
+    """Full-text search over family stories, post captions and comments.
+
+    Each searchable item has a row in search_documents, written inside the
+    caller's transaction by index_story/index_post/index_comment (or
+    remove) whenever its text or visibility changes. The inverted index is
+    FTS5 on SQLite and a tsvector GIN index on PostgreSQL. Results are
+    ranked by relevance and limited in SQL to what the user may see: their
+    own, public, their families' and close-friend items.
+    """
+
+    def __init__(self):
+        self.index = get_index()
+        self.max_limit = current_app.config.get('SEARCH_MAX_LIMIT', 50)
+
+    def search(self, user_id, query, kinds=None, family_id=None, page=1, limit=20):
+        """(documents with score and excerpt, has_more) for one page of results"""
+        terms = search_terms(query)
+        if not terms:
+            raise ValueError('Search query has no words')
+        limit = max(1, min(limit, self.max_limit))
+
+        statement = self.index.ranked(terms).where(self._visible_to(user_id))
+        if kinds:
+            statement = statement.where(SearchDocument.kind.in_(kinds))
+        if family_id is not None:
+            statement = statement.where(SearchDocument.family_id == family_id)
+        rows = db.session.execute(
+            statement.order_by(literal_column('score').desc(), SearchDocument.id.desc())
+            .offset((max(page, 1) - 1) * limit).limit(limit + 1)
+        ).all()
+
+        results = [
+            dict(document.to_dict(), score=round(float(score), 4), excerpt=excerpt(document.body, terms))
+            for document, score in rows[:limit]
+        ]
+        return results, len(rows) > limit
+
+    def index_story(self, story):
+        """Add or refresh a flushed story's document; its comments take on its visibility"""
+        visibility = story.visibility or 'private'
+        self._retarget('story', story.id, story.user_id, story.family_id, visibility)
+        self._upsert('story', story.id, {
+            'target_type': 'story', 'target_id': story.id,
+            'owner_id': story.user_id, 'author_id': story.user_id,
+            'family_id': story.family_id, 'visibility': visibility,
+            'title': story.title, 'body': story_body(story.content, story.enhanced_content),
+            'created_at': story.created_at
+        })
+
+    def index_stories(self, story_ids):
+        """Refresh stories changed by bulk UPDATEs the session has not seen"""
+        for story in Story.query.filter(Story.id.in_(story_ids)).execution_options(populate_existing=True):
+            self.index_story(story)
+
+    def index_post(self, post):
+        """Add or refresh a flushed post's caption; stories expire, so they are not indexed"""
+        if post.is_story:
+            return
+        visibility = post.visibility or 'public'
+        self._retarget('post', post.id, post.user_id, post.family_id, visibility)
+        self._upsert('post', post.id, {
+            'target_type': 'post', 'target_id': post.id,
+            'owner_id': post.user_id, 'author_id': post.user_id,
+            'family_id': post.family_id, 'visibility': visibility,
+            'title': None, 'body': post.caption or '',
+            'created_at': post.created_at
+        })
+
+    def index_comment(self, comment):
+        """Add a flushed story Comment or PostComment under the item it was left on"""
+        if isinstance(comment, PostComment):
+            kind, target_type, target = 'post_comment', 'post', comment.post
+            if target is None or target.is_story:
+                return
+            default_visibility = 'public'
+        else:
+            kind, target_type, target = 'story_comment', 'story', comment.story
+            default_visibility = 'private'
+        self._upsert(kind, comment.id, {
+            'target_type': target_type, 'target_id': target.id,
+            'owner_id': target.user_id, 'author_id': comment.user_id,
+            'family_id': target.family_id, 'visibility': target.visibility or default_visibility,
+            'title': None, 'body': comment.content,
+            'created_at': comment.created_at
+        })
+
+    def remove(self, target_type, target_id):
+        """Drop a story or post and the comments on it from the index"""
+        SearchDocument.query.filter_by(
+            target_type=target_type, target_id=target_id
+        ).delete(synchronize_session=False)
+
+    def reindex(self):
+        """Rebuild every document from the source tables in bulk; returns how many were indexed"""
+        SearchDocument.query.delete(synchronize_session=False)
+        columns = ['kind', 'source_id', 'target_type', 'target_id', 'owner_id', 'author_id',
+                   'family_id', 'visibility', 'title', 'body', 'created_at']
+        for source in self._sources():
+            db.session.execute(insert(SearchDocument.__table__).from_select(columns, source))
+        self.index.rebuild()
+        return db.session.query(func.count(SearchDocument.id)).scalar()
+
+    def _visible_to(self, user_id):
+        family_ids = FamilyAccessService().load(user_id).family_ids
+        return or_(
+            SearchDocument.owner_id == user_id,
+            SearchDocument.visibility == 'public',
+            and_(SearchDocument.visibility == 'family', SearchDocument.family_id.in_(family_ids)),
+            and_(SearchDocument.visibility == 'close_friends', exists().where(
+                CloseFriend.user_id == SearchDocument.owner_id,
+                CloseFriend.friend_id == user_id
+            ))
+        )
+
+    def _retarget(self, target_type, target_id, owner_id, family_id, visibility):
+        # Comments follow the visibility of what they were left on
+        SearchDocument.query.filter(
+            SearchDocument.target_type == target_type,
+            SearchDocument.target_id == target_id,
+            SearchDocument.kind != target_type
+        ).update({
+            'owner_id': owner_id, 'family_id': family_id, 'visibility': visibility
+        }, synchronize_session=False)
+
+    def _upsert(self, kind, source_id, fields):
+        document = SearchDocument.query.filter_by(kind=kind, source_id=source_id).first()
+        if not fields['title'] and not fields['body']:
+            if document is not None:
+                db.session.delete(document)
+            return
+        if document is None:
+            document = SearchDocument(kind=kind, source_id=source_id)
+            db.session.add(document)
+        for name, value in fields.items():
+            setattr(document, name, value)
+
+    def _sources(self):
+        """One SELECT per kind producing search_documents rows, matching the index_* methods"""
+        story_text = func.coalesce(Story.content, '') + func.coalesce(literal('\n\n') + Story.enhanced_content, '')
+        yield select(
+            literal('story'), Story.id, literal('story'), Story.id, Story.user_id, Story.user_id,
+            Story.family_id, func.coalesce(Story.visibility, 'private'), Story.title, story_text, Story.created_at
+        )
+        yield select(
+            literal('post'), Post.id, literal('post'), Post.id, Post.user_id, Post.user_id,
+            Post.family_id, func.coalesce(Post.visibility, 'public'), null(), Post.caption, Post.created_at
+        ).where(Post.is_story == False, Post.caption != '')
+        yield select(
+            literal('story_comment'), Comment.id, literal('story'), Story.id, Story.user_id, Comment.user_id,
+            Story.family_id, func.coalesce(Story.visibility, 'private'), null(), Comment.content, Comment.created_at
+        ).join(Story, Story.id == Comment.story_id)
+        yield select(
+            literal('post_comment'), PostComment.id, literal('post'), Post.id, Post.user_id, PostComment.user_id,
+            Post.family_id, func.coalesce(Post.visibility, 'public'), null(), PostComment.content, PostComment.created_at
+        ).join(Post, Post.id == PostComment.post_id).where(Post.is_story == False)
+
+def get_index(app=None):
+    """Search index implementation for the database in use, created once per app"""
+    app = app or current_app
+    index = app.extensions.get('search_index')
+    if index is None:
+        index = SQLiteSearchIndex() if db.engine.dialect.name == 'sqlite' else PostgresSearchIndex()
+        app.extensions['search_index'] = index
+    return index
@@ -0,0 +1,134 @@
+import os
+import secrets
+import shutil
+import cloudinary
+import cloudinary.uploader
+import cloudinary.utils
+from flask import current_app
+
+class StorageError(Exception):
+    """A media file could not be stored or removed"""
+
+class CloudinaryStorage:
+    """Media stored (and transcoded) by Cloudinary"""
+
+    # Applied by Cloudinary on upload
+    TRANSFORMATIONS = {
+        'image': [
+            {'width': 1080, 'height': 1080, 'crop': 'limit', 'quality': 'auto'},
+            {'format': 'jpg'}
+        ],
+        'video': [
+            {'width': 1080, 'height': 1920, 'crop': 'limit', 'quality': 'auto'},
+            {'format': 'mp4'}
+        ],
+    }
+
+    def __init__(self, cloud_name=None, api_key=None, api_secret=None):
+        cloudinary.config(cloud_name=cloud_name, api_key=api_key, api_secret=api_secret)
+
+    def save(self, file, folder, media_type):
+        """Store a path or file object; returns url, public_id and duration"""
+        try:
+            result = cloudinary.uploader.upload(
+                file,
+                folder=f"kinkeep/{folder}",
+                resource_type=self.resource_type(media_type),
+                transformation=self.TRANSFORMATIONS.get(media_type)
+            )
+        except Exception as e:
+            raise StorageError(str(e)) from e
+        return {
+            'url': result['secure_url'],
+            'public_id': result['public_id'],
+            'duration': result.get('duration')
+        }
+
+    def delete(self, public_id, media_type='image'):
+        try:
+            return cloudinary.uploader.destroy(public_id, resource_type=self.resource_type(media_type))
+        except Exception as e:
+            raise StorageError(str(e)) from e
+
+    def variant_url(self, public_id, media_type, size):
+        """Square JPEG variant (a poster frame for video), rendered by Cloudinary on first request"""
+        if media_type == 'audio':
+            return None
+        url, _ = cloudinary.utils.cloudinary_url(
+            public_id,
+            resource_type=self.resource_type(media_type),
+            format='jpg',
+            secure=True,
+            transformation=[{'width': size, 'height': size, 'crop': 'fill', 'quality': 'auto'}]
+        )
+        return url
+
+    def resource_type(self, media_type):
+        return 'image' if media_type == 'image' else 'video'  # Cloudinary treats audio as video
+
+class LocalStorage:
+    """Media kept on the local filesystem and served from base_url.
+
+    For tests and self-hosting. Files are stored as-is; any conversion
+    happens before save() is called.
+    """
+
+    def __init__(self, root, base_url='/media/files'):
+        self.root = root
+        self.base_url = base_url.rstrip('/')
+        os.makedirs(self.root, exist_ok=True)
+
+    def save(self, file, folder, media_type):
+        name = getattr(file, 'filename', None) or getattr(file, 'name', None) or file
+        extension = os.path.splitext(str(name))[1].lower()
+        public_id = f'kinkeep/{folder}/{secrets.token_hex(12)}'
+        path = self.path(public_id + extension)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if isinstance(file, (str, os.PathLike)):
+                shutil.copyfile(file, path)
+            else:
+                with open(path, 'wb') as target:
+                    shutil.copyfileobj(file, target)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+        return {
+            'url': f'{self.base_url}/{public_id}{extension}',
+            'public_id': public_id,
+            'duration': None
+        }
+
+    def delete(self, public_id, media_type='image'):
+        directory, prefix = os.path.split(self.path(public_id))
+        try:
+            for name in os.listdir(directory):
+                if os.path.splitext(name)[0] == prefix:
+                    os.remove(os.path.join(directory, name))
+        except OSError as e:
+            raise StorageError(str(e)) from e
+        return {'result': 'ok'}
+
+    def variant_url(self, public_id, media_type, size):
+        return None  # Only variants generated by the pipeline exist locally
+
+    def path(self, relative):
+        path = os.path.abspath(os.path.join(self.root, relative))
+        if not path.startswith(os.path.abspath(self.root) + os.sep):
+            raise StorageError('Invalid media path')
+        return path
+
+def get_storage(app=None):
+    """Storage backend for MEDIA_STORAGE_BACKEND, created once per app"""
+    app = app or current_app
+    storage = app.extensions.get('media_storage')
+    if storage is None:
+        if app.config.get('MEDIA_STORAGE_BACKEND', 'cloudinary') == 'local':
+            storage = LocalStorage(app.config['MEDIA_ROOT'], app.config.get('MEDIA_URL', '/media/files'))
+        else:
+            storage = CloudinaryStorage(
+                app.config.get('CLOUDINARY_CLOUD_NAME'),
+                app.config.get('CLOUDINARY_API_KEY'),
+                app.config.get('CLOUDINARY_API_SECRET')
+            )
+        app.extensions['media_storage'] = storage
+    return storage
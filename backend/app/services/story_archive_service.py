@@ -0,0 +1,81 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, insert, literal, select
+from app import db
+from app.models.post import Post, Like, PostComment, SavedPost, StoryView
+from app.models.timeline import TimelineEntry
+from app.models.media import PostMedia
+from app.models.archive import ArchivedStory, ArchivedStoryMedia
+from app.services.media_pipeline_service import MediaPipelineService
+
+class StoryArchiveService:
+    """Moves expired stories out of the posts table in bulk batches.
+
+    Each batch is copied into archived_stories with INSERT ... SELECT, its
+    dependent rows are deleted, and the batch commits on its own so a long
+    sweep never holds one huge transaction. Pipeline media moves with the
+    story, so its files stay referenced until the archived story is deleted.
+    """
+
+    ARCHIVED_COLUMNS = [
+        'id', 'user_id', 'family_id', 'caption', 'media_urls', 'media_variants', 'media_type',
+        'location', 'visibility', 'likes_count', 'comments_count', 'created_at', 'expired_at', 'archived_at'
+    ]
+
+    def __init__(self):
+        self.batch_size = current_app.config.get('STORY_ARCHIVE_BATCH_SIZE', 500)
+        self.pipeline = MediaPipelineService()
+
+    def archive_expired(self, now=None, max_batches=None):
+        """Archive every story that expired before now; returns the number moved"""
+        now = now or datetime.utcnow()
+        total = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            ids = [r[0] for r in db.session.query(Post.id).filter(
+                Post.is_story == True,
+                Post.story_expires_at <= now
+            ).order_by(Post.story_expires_at).limit(self.batch_size).all()]
+            if not ids:
+                break
+
+            self._archive_batch(ids, now)
+            db.session.commit()
+            total += len(ids)
+            batches += 1
+
+        return total
+
+    def _archive_batch(self, ids, now):
+        expired = select(
+            Post.id, Post.user_id, Post.family_id, Post.caption, Post.media_urls,
+            Post.media_variants, Post.media_type, Post.location, Post.visibility,
+            Post.likes_count, Post.comments_count, Post.created_at, Post.story_expires_at,
+            literal(now, db.DateTime)
+        ).where(Post.id.in_(ids))
+        db.session.execute(insert(ArchivedStory).from_select(self.ARCHIVED_COLUMNS, expired))
+
+        # Media links move to the archived story, so its stored files stay referenced
+        db.session.execute(insert(ArchivedStoryMedia).from_select(
+            ['archived_story_id', 'media_id', 'position'],
+            select(PostMedia.post_id, PostMedia.media_id, PostMedia.position).where(PostMedia.post_id.in_(ids))
+        ))
+
+        for model in (Like, PostComment, PostMedia, SavedPost, StoryView, TimelineEntry):
+            db.session.execute(delete(model).where(model.post_id.in_(ids)))
+        db.session.execute(delete(Post).where(Post.id.in_(ids)))
+
+    def delete(self, story):
+        """Delete an archived story and commit; its media is released once nothing else uses it"""
+        media_ids = [row[0] for row in db.session.query(ArchivedStoryMedia.media_id).filter(
+            ArchivedStoryMedia.archived_story_id == story.id
+        ).all()]
+        db.session.execute(delete(ArchivedStoryMedia).where(ArchivedStoryMedia.archived_story_id == story.id))
+        released_media = self.pipeline.delete_unlinked(media_ids) if media_ids else []
+        db.session.delete(story)
+        db.session.commit()
+
+        # Stored files shared with other uploads stay until their last reference goes
+        for public_id in released_media:
+            self.pipeline.media_service.delete_media(public_id)
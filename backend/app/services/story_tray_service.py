@@ -0,0 +1,98 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, func, literal, select
+from app import db
+from app.models.user import User
+from app.models.post import Post, StoryView
+from app.models.follow import Follow
+from app.utils.cache import get_store
+
+class StoryTrayService:
+    """One story ring per author, computed with a single grouped query.
+
+    A user's tray is cached in STORY_TRAY_CACHE_BACKEND ('memory', 'redis'
+    or 'none') until its earliest story expires (capped by
+    STORY_TRAY_CACHE_TTL) and dropped whenever a new story, a view or a
+    follow change could alter it.
+    """
+
+    def __init__(self):
+        self.cache = get_store('story_tray', 'STORY_TRAY_CACHE_BACKEND', 'STORY_TRAY_CACHE_MAX_ENTRIES')
+        self.max_ttl = current_app.config.get('STORY_TRAY_CACHE_TTL', 300)
+
+    def get_tray(self, user_id):
+        tray = self.cache.get(self._key(user_id)) if self.cache is not None else None
+        if tray is not None:
+            return tray
+
+        now = datetime.utcnow()
+        tray, earliest_expiry = self._build_tray(user_id, now)
+
+        ttl = self.max_ttl
+        if earliest_expiry:
+            ttl = min(ttl, max((earliest_expiry - now).total_seconds(), 0))
+        if self.cache is not None:
+            self.cache.set(self._key(user_id), tray, ex=ttl)
+        return tray
+
+    def mark_viewed(self, user_id, post):
+        """Record that user_id has seen a story; returns False if already seen"""
+        existing = StoryView.query.filter_by(user_id=user_id, post_id=post.id).first()
+        if existing:
+            return False
+        db.session.add(StoryView(user_id=user_id, post_id=post.id))
+        self.invalidate(user_id)
+        return True
+
+    def invalidate(self, *user_ids):
+        if self.cache is not None and user_ids:
+            self.cache.delete(*[self._key(user_id) for user_id in user_ids])
+
+    def invalidate_followers(self, author_id):
+        """Drop the trays of everyone who can see author_id's stories"""
+        follower_ids = [r[0] for r in db.session.query(Follow.follower_id).filter_by(following_id=author_id).all()]
+        self.invalidate(author_id, *follower_ids)
+
+    def _build_tray(self, user_id, now):
+        visible_authors = select(Follow.following_id).where(
+            Follow.follower_id == user_id
+        ).union(select(literal(user_id)))
+
+        rows = db.session.query(
+            User.id, User.name, User.username, User.profile_image,
+            func.count(Post.id),
+            func.max(Post.created_at),
+            func.min(Post.story_expires_at),
+            func.count(StoryView.id)
+        ).join(
+            Post, Post.user_id == User.id
+        ).outerjoin(
+            StoryView, and_(StoryView.post_id == Post.id, StoryView.user_id == user_id)
+        ).filter(
+            Post.is_story == True,
+            Post.story_expires_at > now,
+            Post.user_id.in_(visible_authors)
+        ).group_by(User.id, User.name, User.username, User.profile_image).all()
+
+        tray = [{
+            'user': {
+                'id': author_id,
+                'name': name,
+                'username': username,
+                'profile_image': profile_image
+            },
+            'story_count': story_count,
+            'latest_at': latest_at.isoformat(),
+            'expires_at': expires_at.isoformat(),
+            'seen': viewed_count >= story_count
+        } for author_id, name, username, profile_image, story_count, latest_at, expires_at, viewed_count in rows]
+
+        # Own ring first, then unseen rings, newest first
+        tray.sort(key=lambda entry: entry['latest_at'], reverse=True)
+        tray.sort(key=lambda entry: (entry['user']['id'] != user_id, entry['seen']))
+
+        earliest_expiry = min((r[6] for r in rows), default=None)
+        return tray, earliest_expiry
+
+    def _key(self, user_id):
+        return str(user_id)
@@ -0,0 +1,255 @@
+from datetime import datetime
+from itertools import chain
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, exists, func, insert, select
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.user import User
+from app.models.follow import Follow
+from app.models.family import FamilyMember
+from app.models.suggestion import FollowSuggestion
+
+NO_IDS = np.zeros(0, dtype=np.int64)
+
+def build_csr(rows, columns, size):
+    """CSR adjacency (indptr, indices) of the edges rows[i] -> columns[i], rows indexed 0..size-1"""
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, columns[order]
+
+def gather(indptr, indices, rows):
+    """Neighbours of every row in rows, concatenated (repeats kept)"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return NO_IDS
+    # Position i of the output belongs to row k: starts[k] + (i - lengths before k)
+    ends = np.cumsum(lengths)
+    return indices[np.repeat(starts - ends + lengths, lengths) + np.arange(total)]
+
+class FollowGraph:
+    """Follows and family memberships as CSR arrays indexed by user and family id"""
+
+    def __init__(self, follows, memberships):
+        followers, followings = follows
+        members, families = memberships
+        self.size = int(max(followers.max(initial=0), followings.max(initial=0), members.max(initial=0))) + 1
+        self.following = build_csr(followers, followings, self.size)
+        self.user_families = build_csr(members, families, self.size)
+        self.family_users = build_csr(families, members, int(families.max(initial=0)) + 1)
+
+    @classmethod
+    def load(cls, chunk_size=100000):
+        """Read both edge lists from the database, chunk_size rows at a time"""
+        return cls(
+            cls._edges(Follow.follower_id, Follow.following_id, chunk_size),
+            cls._edges(FamilyMember.user_id, FamilyMember.family_id, chunk_size)
+        )
+
+    @staticmethod
+    def _edges(source, target, chunk_size):
+        result = db.session.execute(select(source, target).execution_options(yield_per=chunk_size))
+        chunks = [
+            np.fromiter(chain.from_iterable(chunk), dtype=np.int64, count=2 * len(chunk)).reshape(-1, 2)
+            for chunk in result.partitions()
+        ]
+        edges = np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int64)
+        return edges[:, 0], edges[:, 1]
+
+    def candidates(self, user_id):
+        """(followed ids, friends of friends, family co-members) of a user; the last two with repeats"""
+        if user_id >= self.size:
+            return NO_IDS, NO_IDS, NO_IDS
+        user = np.array([user_id])
+        following = gather(*self.following, user)
+        return (
+            following,
+            gather(*self.following, following),
+            gather(*self.family_users, gather(*self.user_families, user))
+        )
+
+class SuggestionService:
+    """Follow suggestions ("suggested for you"), precomputed per user.
+
+    A candidate is someone followed by people the user follows, or who is
+    in one of the user's families. It scores SUGGESTION_MUTUAL_WEIGHT per
+    such mutual connection plus SUGGESTION_FAMILY_WEIGHT per shared family,
+    and the top SUGGESTION_LIMIT are stored in follow_suggestions.
+
+    A periodic rebuild scores everyone from an in-memory CSR copy of the
+    graph. In between, each follow or unfollow is applied incrementally by
+    update_for_follow.
+    """
+
+    def __init__(self):
+        self.limit = current_app.config.get('SUGGESTION_LIMIT', 20)
+        self.mutual_weight = current_app.config.get('SUGGESTION_MUTUAL_WEIGHT', 1.0)
+        self.family_weight = current_app.config.get('SUGGESTION_FAMILY_WEIGHT', 5.0)
+        self.fanout_limit = current_app.config.get('SUGGESTION_FANOUT_LIMIT', 1000)
+        self.batch_size = current_app.config.get('SUGGESTION_BATCH_SIZE', 1000)
+        self.chunk_size = current_app.config.get('SUGGESTION_CHUNK_SIZE', 100000)
+
+    def get_suggestions(self, user_id, limit=None):
+        """Stored suggestions, best first, minus anyone followed since they were computed"""
+        return FollowSuggestion.query.filter(
+            FollowSuggestion.user_id == user_id,
+            ~exists().where(
+                Follow.follower_id == user_id,
+                Follow.following_id == FollowSuggestion.suggested_id
+            )
+        ).order_by(
+            FollowSuggestion.score.desc(), FollowSuggestion.suggested_id
+        ).limit(limit or self.limit).all()
+
+    def rebuild(self, graph=None, now=None):
+        """Recompute every user's suggestions; commits per batch of users and returns the rows stored"""
+        graph = graph or FollowGraph.load(self.chunk_size)
+        now = now or datetime.utcnow()
+        user_ids = [r[0] for r in db.session.query(User.id).order_by(User.id).all()]
+
+        stored = 0
+        for start in range(0, len(user_ids), self.batch_size):
+            batch = user_ids[start:start + self.batch_size]
+            rows = []
+            for user_id in batch:
+                rows += self._rows(user_id, self.rank(user_id, *graph.candidates(user_id)), now)
+            self._replace(batch, rows)
+            db.session.commit()
+            stored += len(rows)
+        return stored
+
+    def refresh_user(self, user_id):
+        """Recompute one user's suggestions with indexed queries instead of the whole graph"""
+        hop = aliased(Follow)
+        relative = aliased(FamilyMember)
+        following = self._ids(select(Follow.following_id).where(Follow.follower_id == user_id))
+        friends_of_friends = self._ids(
+            select(hop.following_id).join(Follow, Follow.following_id == hop.follower_id).where(
+                Follow.follower_id == user_id
+            )
+        )
+        relatives = self._ids(
+            select(relative.user_id).join(FamilyMember, FamilyMember.family_id == relative.family_id).where(
+                FamilyMember.user_id == user_id
+            )
+        )
+        ranked = self.rank(user_id, following, friends_of_friends, relatives)
+        self._replace([user_id], self._rows(user_id, ranked, datetime.utcnow()))
+
+    def update_for_follow(self, follower_id, following_id):
+        """Apply one follow or unfollow to the stored suggestions; commits.
+
+        The follower's own list is recomputed. For everyone who follows the
+        follower only the entry for following_id changes (one mutual
+        connection more or less), so that entry alone is recomputed and
+        fitted into their list; a list can fall short of its exact top N
+        until the next rebuild. Followers of accounts with more than
+        SUGGESTION_FANOUT_LIMIT followers are left to the rebuild as well.
+        """
+        self.refresh_user(follower_id)
+        followers = db.session.query(User.followers_count).filter(User.id == follower_id).scalar()
+        if (followers or 0) <= self.fanout_limit:
+            viewer_ids = [r[0] for r in db.session.query(Follow.follower_id).filter(
+                Follow.following_id == follower_id
+            ).all()]
+            self._update_entries(viewer_ids, following_id)
+        db.session.commit()
+
+    def queue_update(self, follower_id, following_id):
+        """Hand update_for_follow to a worker; the periodic rebuild covers a failed enqueue"""
+        from app.tasks.suggestion_tasks import update_follow_suggestions
+        try:
+            update_follow_suggestions.delay(follower_id, following_id)
+        except Exception as e:
+            current_app.logger.error(f"Suggestion update enqueue error: {str(e)}")
+
+    def rank(self, user_id, following, friends_of_friends, relatives):
+        """Score candidate id arrays; returns (ids, scores, mutual counts, shared families) of the top ones"""
+        ids, inverse = np.unique(np.concatenate([friends_of_friends, relatives]), return_inverse=True)
+        mutual = np.bincount(inverse[:len(friends_of_friends)], minlength=len(ids))
+        shared = np.bincount(inverse[len(friends_of_friends):], minlength=len(ids))
+
+        keep = (ids != user_id) & ~np.isin(ids, following)
+        ids, mutual, shared = ids[keep], mutual[keep], shared[keep]
+        scores = self.mutual_weight * mutual + self.family_weight * shared
+        top = np.lexsort((ids, -scores))[:self.limit]
+        return ids[top], scores[top], mutual[top], shared[top]
+
+    def _update_entries(self, viewer_ids, target_id):
+        """Recompute each viewer's entry for target_id and fit it into their stored list"""
+        if not viewer_ids:
+            return
+        hop = aliased(Follow)
+        relative = aliased(FamilyMember)
+        mutual = dict(db.session.query(Follow.follower_id, func.count()).join(
+            hop, and_(hop.follower_id == Follow.following_id, hop.following_id == target_id)
+        ).filter(Follow.follower_id.in_(viewer_ids)).group_by(Follow.follower_id).all())
+        shared = dict(db.session.query(FamilyMember.user_id, func.count()).join(
+            relative, and_(relative.family_id == FamilyMember.family_id, relative.user_id == target_id)
+        ).filter(FamilyMember.user_id.in_(viewer_ids)).group_by(FamilyMember.user_id).all())
+        following_target = {r[0] for r in db.session.query(Follow.follower_id).filter(
+            Follow.follower_id.in_(viewer_ids),
+            Follow.following_id == target_id
+        ).all()}
+        entries = {s.user_id: s for s in FollowSuggestion.query.filter(
+            FollowSuggestion.user_id.in_(viewer_ids),
+            FollowSuggestion.suggested_id == target_id
+        ).all()}
+        lists = {r[0]: (r[1], r[2]) for r in db.session.query(
+            FollowSuggestion.user_id, func.count(), func.min(FollowSuggestion.score)
+        ).filter(FollowSuggestion.user_id.in_(viewer_ids)).group_by(FollowSuggestion.user_id).all()}
+
+        now = datetime.utcnow()
+        for viewer_id in viewer_ids:
+            entry = entries.get(viewer_id)
+            score = self.mutual_weight * mutual.get(viewer_id, 0) + self.family_weight * shared.get(viewer_id, 0)
+            if viewer_id == target_id or viewer_id in following_target or score <= 0:
+                if entry is not None:
+                    db.session.delete(entry)
+                continue
+            if entry is not None:
+                entry.score = score
+                entry.mutual_count = mutual.get(viewer_id, 0)
+                entry.shared_families = shared.get(viewer_id, 0)
+                entry.computed_at = now
+                continue
+
+            count, lowest = lists.get(viewer_id, (0, None))
+            if count >= self.limit:
+                if score <= lowest:
+                    continue
+                # Make room by dropping the weakest entry
+                weakest = FollowSuggestion.query.filter_by(user_id=viewer_id).order_by(
+                    FollowSuggestion.score, FollowSuggestion.suggested_id.desc()
+                ).first()
+                db.session.delete(weakest)
+            db.session.add(FollowSuggestion(
+                user_id=viewer_id,
+                suggested_id=target_id,
+                score=score,
+                mutual_count=mutual.get(viewer_id, 0),
+                shared_families=shared.get(viewer_id, 0),
+                computed_at=now
+            ))
+
+    def _ids(self, statement):
+        return np.array(db.session.execute(statement).scalars().all(), dtype=np.int64)
+
+    def _rows(self, user_id, ranked, now):
+        return [{
+            'user_id': user_id,
+            'suggested_id': int(suggested_id),
+            'score': float(score),
+            'mutual_count': int(mutual),
+            'shared_families': int(shared),
+            'computed_at': now
+        } for suggested_id, score, mutual, shared in zip(*ranked)]
+
+    def _replace(self, user_ids, rows):
+        FollowSuggestion.query.filter(FollowSuggestion.user_id.in_(user_ids)).delete(synchronize_session=False)
+        if rows:
+            # Core insert: these rows never need to become ORM objects
+            db.session.execute(insert(FollowSuggestion.__table__), rows)
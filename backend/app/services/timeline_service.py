@@ -0,0 +1,138 @@
+from flask import current_app
+from sqlalchemy import and_, or_, insert, select, literal
+from app import db
+from app.models.user import User
+from app.models.post import Post
+from app.models.follow import Follow
+from app.models.timeline import TimelineEntry
+from app.utils.pagination import keyset_paginate
+
+class TimelineService:
+    """Materialized home timelines (fan-out-on-write).
+
+    Every non-story post is copied into the timeline of its author and of
+    each follower when it is created. Authors with more followers than
+    TIMELINE_FANOUT_LIMIT are skipped at write time and merged into the
+    feed at read time instead.
+    """
+
+    def __init__(self):
+        self.fanout_limit = current_app.config.get('TIMELINE_FANOUT_LIMIT', 5000)
+        self.backfill_limit = current_app.config.get('TIMELINE_BACKFILL_LIMIT', 200)
+
+    def is_popular(self, author_id):
+        """Authors above the fan-out limit are read on demand"""
+        followers = db.session.query(User.followers_count).filter(User.id == author_id).scalar()
+        return (followers or 0) > self.fanout_limit
+
+    def popular_following_ids(self, user_id):
+        """IDs of followed authors whose posts are not fanned out"""
+        rows = db.session.query(Follow.following_id).join(
+            User, User.id == Follow.following_id
+        ).filter(
+            Follow.follower_id == user_id,
+            User.followers_count > self.fanout_limit
+        ).all()
+        return [r[0] for r in rows]
+
+    def fan_out_post(self, post):
+        """Push a freshly flushed post into the author's and followers' timelines"""
+        if post.is_story:
+            return 0
+
+        db.session.add(TimelineEntry(
+            user_id=post.user_id,
+            post_id=post.id,
+            author_id=post.user_id,
+            created_at=post.created_at
+        ))
+
+        if self.is_popular(post.user_id):
+            return 1
+
+        followers = select(
+            Follow.follower_id,
+            literal(post.id),
+            literal(post.user_id),
+            literal(post.created_at, db.DateTime)
+        ).where(Follow.following_id == post.user_id)
+
+        result = db.session.execute(
+            insert(TimelineEntry).from_select(
+                ['user_id', 'post_id', 'author_id', 'created_at'], followers
+            )
+        )
+        return 1 + (result.rowcount or 0)
+
+    def backfill(self, user_id, author_id):
+        """Copy an author's recent posts into a timeline after a follow"""
+        if user_id != author_id and self.is_popular(author_id):
+            return 0
+
+        existing = db.session.query(TimelineEntry.post_id).filter(TimelineEntry.user_id == user_id)
+        recent_posts = select(
+            literal(user_id),
+            Post.id,
+            Post.user_id,
+            Post.created_at
+        ).where(
+            Post.user_id == author_id,
+            Post.is_story == False,
+            ~Post.id.in_(existing)
+        ).order_by(Post.created_at.desc()).limit(self.backfill_limit)
+
+        result = db.session.execute(
+            insert(TimelineEntry).from_select(
+                ['user_id', 'post_id', 'author_id', 'created_at'], recent_posts
+            )
+        )
+        return result.rowcount or 0
+
+    def prune(self, user_id, author_id):
+        """Drop an author's posts from a timeline after an unfollow"""
+        return TimelineEntry.query.filter_by(
+            user_id=user_id,
+            author_id=author_id
+        ).delete(synchronize_session=False)
+
+    def remove_post(self, post_id):
+        """Drop a deleted post from every timeline"""
+        return TimelineEntry.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+
+    def rebuild(self, user_id):
+        """Recreate a user's timeline from the follow graph"""
+        TimelineEntry.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+        following_ids = db.session.query(Follow.following_id).filter_by(follower_id=user_id).all()
+        total = self.backfill(user_id, user_id)
+        for (author_id,) in following_ids:
+            total += self.backfill(user_id, author_id)
+        return total
+
+    def feed_query(self, user_id):
+        """Post query for a user's home feed, newest first"""
+        query, created_column, id_column = self._feed_source(user_id)
+        return query.order_by(created_column.desc(), id_column.desc())
+
+    def feed_page(self, user_id, cursor=None, limit=10):
+        """Keyset-paginated home feed; returns (posts, next_cursor)"""
+        query, created_column, id_column = self._feed_source(user_id)
+        return keyset_paginate(query, created_column, id_column, cursor, limit)
+
+    def _feed_source(self, user_id):
+        """Unordered feed query plus the (created_at, id) columns to sort on"""
+        popular_ids = self.popular_following_ids(user_id)
+
+        if not popular_ids:
+            query = Post.query.join(
+                TimelineEntry, TimelineEntry.post_id == Post.id
+            ).filter(TimelineEntry.user_id == user_id)
+            return query, TimelineEntry.created_at, TimelineEntry.post_id
+
+        # Fan-out-on-read for popular authors
+        timeline_post_ids = db.session.query(TimelineEntry.post_id).filter(TimelineEntry.user_id == user_id)
+        query = Post.query.filter(or_(
+            Post.id.in_(timeline_post_ids),
+            and_(Post.is_story == False, Post.user_id.in_(popular_ids))
+        ))
+        return query, Post.created_at, Post.id
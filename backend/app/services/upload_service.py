@@ -0,0 +1,194 @@
+import os
+import secrets
+from datetime import datetime, timedelta
+from flask import current_app
+from werkzeug.exceptions import ClientDisconnected
+from app import db
+from app.models.upload import UploadSession
+from app.services.media_service import MediaService
+from app.services.media_pipeline_service import MediaPipelineService
+
+ALLOWED_EXTENSIONS = {
+    'image': {'jpg', 'jpeg', 'png', 'gif', 'webp'},
+    'video': {'mp4', 'mov', 'avi', 'mkv', 'webm'},
+    'audio': {'mp3', 'wav', 'ogg', 'm4a', 'aac'}
+}
+
+# 10MB for images, 100MB for videos, 25MB for audio
+MAX_SIZES = {'image': 10 * 1024 * 1024, 'video': 100 * 1024 * 1024, 'audio': 25 * 1024 * 1024}
+
+UPLOAD_FOLDERS = {'posts', 'stories', 'messages', 'profiles'}
+
+READ_BLOCK_SIZE = 64 * 1024
+
+class UploadError(Exception):
+    """A rejected upload request, carrying the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+def validate_upload(upload_type, filename, size=None):
+    """Error message for a disallowed type, extension or size, else None"""
+    if upload_type not in ALLOWED_EXTENSIONS:
+        return 'Invalid upload type'
+    file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    if file_ext not in ALLOWED_EXTENSIONS[upload_type]:
+        return f'Invalid file type for {upload_type}'
+    if size is not None and size > MAX_SIZES[upload_type]:
+        return f'File too large for {upload_type}'
+    return None
+
+class UploadService:
+    """Chunked, resumable uploads.
+
+    Each session owns a spool file on local disk. Parts are written at
+    explicit offsets, streamed from the request in small blocks so memory
+    stays flat, and a client that loses its connection asks for the current
+    offset and carries on from there. Completing the session hands the file
+    to MediaService in one go, or queues it on the media pipeline.
+    """
+
+    def __init__(self):
+        self.spool_dir = current_app.config.get('UPLOAD_SPOOL_DIR')
+        self.max_part_size = current_app.config.get('UPLOAD_MAX_PART_SIZE', 8 * 1024 * 1024)
+        self.session_ttl = current_app.config.get('UPLOAD_SESSION_TTL', 86400)
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def spool_path(self, upload):
+        # Keep the extension so the media backend can recognise the format
+        extension = os.path.splitext(upload.filename)[1].lower()
+        return os.path.join(self.spool_dir, f'{upload.id}{extension}')
+
+    def create(self, user_id, upload_type, folder, filename, total_size):
+        error = validate_upload(upload_type, filename, total_size)
+        if error:
+            raise UploadError(error, 413 if error.startswith('File too large') else 400)
+        if total_size <= 0:
+            raise UploadError('size must be positive')
+        if folder not in UPLOAD_FOLDERS:
+            raise UploadError('Invalid folder')
+
+        upload = UploadSession(
+            id=secrets.token_hex(16),
+            user_id=user_id,
+            upload_type=upload_type,
+            folder=folder,
+            filename=filename,
+            total_size=total_size,
+            expires_at=datetime.utcnow() + timedelta(seconds=self.session_ttl)
+        )
+        open(self.spool_path(upload), 'wb').close()
+        db.session.add(upload)
+        db.session.commit()
+        return upload
+
+    def write_part(self, upload, offset, stream, content_length=None):
+        """Append bytes from stream at offset; returns the new offset.
+
+        The offset must equal the bytes already received, so retried or
+        out-of-order parts are rejected with the offset to resume from.
+        """
+        if upload.status != 'uploading':
+            raise UploadError('Upload is not accepting parts', 409, offset=upload.received_size)
+        if offset != upload.received_size:
+            raise UploadError('Offset does not match received bytes', 409, offset=upload.received_size)
+
+        remaining = upload.total_size - offset
+        limit = min(remaining, self.max_part_size)
+        if content_length is not None and content_length > limit:
+            raise UploadError('Part too large', 413, offset=offset, max_part_size=limit)
+
+        written = 0
+        interrupted = False
+        with open(self.spool_path(upload), 'r+b') as spool:
+            spool.seek(offset)
+            try:
+                while True:
+                    block = stream.read(READ_BLOCK_SIZE)
+                    if not block:
+                        break
+                    written += len(block)
+                    if written > limit:
+                        # Drop what was written; the client resumes from the old offset
+                        spool.truncate(offset)
+                        raise UploadError('Part too large', 413, offset=offset, max_part_size=limit)
+                    spool.write(block)
+            except ClientDisconnected:
+                # Keep the bytes that did arrive so the client can resume after them
+                interrupted = True
+
+        # Conditional update so two racing parts cannot both advance the offset
+        new_offset = offset + written
+        updated = UploadSession.query.filter_by(id=upload.id, received_size=offset).update({
+            'received_size': new_offset,
+            'expires_at': datetime.utcnow() + timedelta(seconds=self.session_ttl)
+        }, synchronize_session=False)
+        db.session.commit()
+        if not updated:
+            db.session.refresh(upload)
+            raise UploadError('Offset does not match received bytes', 409, offset=upload.received_size)
+        if interrupted:
+            raise UploadError('Part interrupted', 400, offset=new_offset)
+        return new_offset
+
+    def complete(self, upload):
+        """Upload the assembled file to media storage; returns the media result"""
+        self._check_complete(upload)
+
+        path = self.spool_path(upload)
+        media_service = MediaService()
+        if upload.upload_type == 'image':
+            result = media_service.upload_image(path, upload.folder)
+        elif upload.upload_type == 'video':
+            result = media_service.upload_video(path, upload.folder)
+        else:
+            result = media_service.upload_audio(path, upload.folder)
+
+        if not result['success']:
+            # Keep the spooled file so completion can be retried
+            raise UploadError(result['error'], 502)
+
+        upload.status = 'complete'
+        db.session.commit()
+        self._remove_spool(upload)
+        return result
+
+    def queue(self, upload):
+        """Hand the assembled file to the media pipeline; returns the pending Media"""
+        self._check_complete(upload)
+
+        media = MediaPipelineService().submit(
+            upload.user_id, upload.upload_type, upload.folder, self.spool_path(upload), upload.filename
+        )
+        upload.status = 'complete'
+        db.session.commit()
+        return media
+
+    def abort(self, upload):
+        self._remove_spool(upload)
+        db.session.delete(upload)
+        db.session.commit()
+
+    def purge_expired(self, now=None):
+        """Delete sessions (and spool files) not touched within the TTL"""
+        now = now or datetime.utcnow()
+        expired = UploadSession.query.filter(UploadSession.expires_at <= now).all()
+        for upload in expired:
+            self._remove_spool(upload)
+            db.session.delete(upload)
+        db.session.commit()
+        return len(expired)
+
+    def _check_complete(self, upload):
+        if upload.status != 'uploading':
+            raise UploadError('Upload is not in progress', 409)
+        if upload.received_size != upload.total_size:
+            raise UploadError('Upload is incomplete', 409, offset=upload.received_size)
+
+    def _remove_spool(self, upload):
+        try:
+            os.remove(self.spool_path(upload))
+        except FileNotFoundError:
+            pass
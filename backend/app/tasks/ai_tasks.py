@@ -0,0 +1,38 @@
+from celery import shared_task
+from app.services.ai_backends import AIServiceError
+from app.services.ai_job_service import AIJobService
+from app.services.ai_cache_service import AICacheService
+from app.services.ai_batch_service import AIBatchService
+
+@shared_task(bind=True, name='ai.enhance_story')
+def enhance_story(self, job_id):
+    """Enhance a story for an AIJob, retrying transient model errors"""
+    job_service = AIJobService()
+    try:
+        return job_service.run_enhancement(job_id)
+    except AIServiceError as e:
+        if e.retryable and self.request.retries < job_service.max_retries:
+            job_service.mark_retrying(job_id, e)
+            retry = self.retry(
+                exc=e,
+                countdown=job_service.retry_delay(e, self.request.retries),
+                max_retries=job_service.max_retries,
+                throw=False
+            )
+            if self.request.is_eager:
+                return retry  # apply() re-runs the task in-process
+            raise retry
+        return job_service.mark_failed(job_id, e)
+    except Exception:
+        job_service.mark_failed(job_id, 'Enhancement failed')
+        raise
+
+@shared_task(name='ai.enhance_batch')
+def enhance_batch(batch_id):
+    """Enhance every story in an AIBatch through the bounded pool"""
+    return AIBatchService().run(batch_id)
+
+@shared_task(name='ai.prune_cache')
+def prune_ai_cache():
+    """Drop expired and least recently used AI cache entries"""
+    return AICacheService().prune()
@@ -0,0 +1,32 @@
+from celery import shared_task
+from app.services.media_pipeline_service import MediaPipelineService, MediaError
+from app.services.storage_backends import StorageError
+
+@shared_task(bind=True, name='media.process')
+def process_media(self, media_id):
+    """Convert, resize and store an upload, retrying storage errors"""
+    pipeline = MediaPipelineService()
+    try:
+        return pipeline.process(media_id)
+    except StorageError as e:
+        if self.request.retries < pipeline.max_retries:
+            retry = self.retry(
+                exc=e,
+                countdown=pipeline.retry_delay(self.request.retries),
+                max_retries=pipeline.max_retries,
+                throw=False
+            )
+            if self.request.is_eager:
+                return retry  # apply() re-runs the task in-process
+            raise retry
+        return pipeline.mark_failed(media_id, e)
+    except MediaError as e:
+        return pipeline.mark_failed(media_id, e)
+    except Exception:
+        pipeline.mark_failed(media_id, 'Processing failed')
+        raise
+
+@shared_task(name='media.purge_unattached')
+def purge_unattached_media():
+    """Remove uploads that were never attached to a post, with their files"""
+    return MediaPipelineService().purge_unattached()
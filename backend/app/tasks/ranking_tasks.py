@@ -0,0 +1,7 @@
+from celery import shared_task
+from app.services.ranking_service import RankingService
+
+@shared_task(name='ranking.rebuild')
+def rebuild_rankings():
+    """Periodic rescoring of the explore and reels rankings"""
+    return RankingService().rebuild()
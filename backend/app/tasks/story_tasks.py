@@ -0,0 +1,7 @@
+from celery import shared_task
+from app.services.story_archive_service import StoryArchiveService
+
+@shared_task(name='stories.archive_expired')
+def archive_expired_stories():
+    """Periodic sweep that moves expired stories into the archive"""
+    return StoryArchiveService().archive_expired()
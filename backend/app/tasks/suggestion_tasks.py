@@ -0,0 +1,12 @@
+from celery import shared_task
+from app.services.suggestion_service import SuggestionService
+
+@shared_task(name='suggestions.rebuild')
+def rebuild_follow_suggestions():
+    """Periodic full recomputation of follow suggestions"""
+    return SuggestionService().rebuild()
+
+@shared_task(name='suggestions.update_follow')
+def update_follow_suggestions(follower_id, following_id):
+    """Apply one follow or unfollow to the stored suggestions"""
+    SuggestionService().update_for_follow(follower_id, following_id)
@@ -0,0 +1,7 @@
+from celery import shared_task
+from app.services.upload_service import UploadService
+
+@shared_task(name='uploads.purge_expired')
+def purge_expired_uploads():
+    """Remove abandoned chunked uploads and their spool files"""
+    return UploadService().purge_expired()
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+class LRUCache:
+    """Thread-safe in-process cache with per-key TTL and LRU eviction.
+
+    Method names follow the Redis client (get/set(ex=)/delete) so a
+    Redis-backed cache can be dropped in where several workers need to
+    share entries.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def mget(self, keys):
+        """Values of several keys, None for any that are missing"""
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        """Store value; ex is a TTL in seconds (None keeps it until evicted)"""
+        expires_at = time.monotonic() + ex if ex is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return True
+
+    def incr(self, key, ex=None):
+        """Add one to a counter and return it; a new counter expires after ex seconds"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                entry = (0, time.monotonic() + ex if ex is not None else None)
+            self._data[key] = (entry[0] + 1, entry[1])
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return entry[0] + 1
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+_cache_lock = threading.Lock()
+
+def get_cache(name, max_entries=1024, app=None):
+    """The app-wide cache registered under name, created on first use"""
+    app = app or current_app._get_current_object()
+    with _cache_lock:
+        caches = app.extensions.setdefault('caches', {})
+        if name not in caches:
+            caches[name] = LRUCache(max_entries)
+        return caches[name]
+
+class RedisCache:
+    """The LRUCache interface over a Redis-compatible server, shared by every worker.
+
+    Keys are stored under prefix and values as JSON.
+    """
+
+    def __init__(self, url, prefix):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def mget(self, keys):
+        values = self.client.mget([self.prefix + key for key in keys]) if keys else []
+        return [json.loads(value) if value is not None else None for value in values]
+
+    def set(self, key, value, ex=None):
+        # Milliseconds, so entries with under a second to live still expire
+        px = max(int(ex * 1000), 1) if ex is not None else None
+        return self.client.set(self.prefix + key, json.dumps(value), px=px)
+
+    def incr(self, key, ex=None):
+        value = self.client.incr(self.prefix + key)
+        if value == 1 and ex is not None:
+            self.client.expire(self.prefix + key, ex)
+        return value
+
+    def delete(self, *keys):
+        return self.client.delete(*[self.prefix + key for key in keys]) if keys else 0
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + '*'))
+
+class SafeCache:
+    """A cache whose errors are logged and read as misses.
+
+    Caches are an optimization, so an unreachable store must only cost
+    the work it would have saved.
+    """
+
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+
+    def get(self, key):
+        return self._call(self.cache.get, key)
+
+    def mget(self, keys):
+        """Values of several keys, or None (not a list) if the store failed"""
+        return self._call(self.cache.mget, keys)
+
+    def set(self, key, value, ex=None):
+        return self._call(self.cache.set, key, value, ex=ex)
+
+    def delete(self, *keys):
+        return self._call(self.cache.delete, *keys) if keys else 0
+
+    def clear(self):
+        return self._call(self.cache.clear)
+
+    def __len__(self):
+        return self._call(len, self.cache) or 0
+
+    def _call(self, func, *args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            current_app.logger.error(f"Cache error in {self.name}: {str(e)}")
+            return None
+
+def get_store(name, backend_key, max_entries_key, app=None):
+    """The SafeCache named name on the backend the backend_key setting selects, or None.
+
+    'memory' (the default) is a per-process LRUCache of max_entries_key
+    entries; 'redis' shares entries and invalidation between workers
+    through REDIS_URL; 'none' disables the cache.
+    """
+    app = app or current_app._get_current_object()
+    backend = app.config.get(backend_key, 'memory')
+    if backend == 'none':
+        return None
+    with _cache_lock:
+        stores = app.extensions.setdefault('cache_stores', {})
+        if (name, backend) not in stores:
+            if backend == 'redis':
+                cache = RedisCache(app.config['REDIS_URL'], name.replace('_', '-') + ':')
+            else:
+                caches = app.extensions.setdefault('caches', {})
+                cache = caches.setdefault(name, LRUCache(app.config.get(max_entries_key, 10000)))
+            stores[(name, backend)] = SafeCache(cache, name)
+        return stores[(name, backend)]
@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+# Largest page a keyset caller may ask for
+MAX_PAGE_SIZE = 100
+
+def page_size(limit):
+    """A requested page size clamped to 1..MAX_PAGE_SIZE"""
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def encode_cursor(created_at, item_id):
+    """Encode a (created_at, id) position as an opaque URL-safe token"""
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a token from encode_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def keyset_paginate(query, created_column, id_column, cursor=None, limit=10, descending=True):
+    """Paginate a query by (created_at, id) without OFFSET or COUNT(*).
+
+    `cursor` is the next_cursor of the previous page (None or '' for the
+    first page). Returns (items, next_cursor); next_cursor is None on the
+    last page. Items must expose `created_at` and `id` matching the two
+    columns. `limit` is clamped by page_size().
+    """
+    limit = page_size(limit)
+    if descending:
+        query = query.order_by(None).order_by(created_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(created_column.asc(), id_column.asc())
+
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(
+                created_column < created_at,
+                and_(created_column == created_at, id_column < item_id)
+            ))
+        else:
+            query = query.filter(or_(
+                created_column > created_at,
+                and_(created_column == created_at, id_column > item_id)
+            ))
+
+    # Fetch one extra row to learn whether another page exists
+    items = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return items, next_cursor
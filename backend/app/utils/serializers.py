@@ -0,0 +1,64 @@
+"""Batch serializers for list endpoints.
+
+Each function takes a list of model instances, loads the related rows the
+model's to_dict() needs with one IN query per relationship, attaches them
+to the instances and then calls to_dict(). The JSON shape is exactly the
+per-instance one, but a page costs a fixed number of queries instead of
+one or more per row.
+"""
+from collections import defaultdict
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.user import User
+from app.models.family import FamilyMember
+
+def prefetch_related(instances, fk_attr, relationship, model):
+    """Populate a many-to-one relationship on every instance with one IN query"""
+    pending = [i for i in instances if relationship in inspect(i).unloaded]
+    ids = {getattr(i, fk_attr) for i in pending} - {None}
+    if not ids:
+        return
+
+    related = {obj.id: obj for obj in model.query.filter(model.id.in_(ids)).all()}
+    for instance in pending:
+        set_committed_value(instance, relationship, related.get(getattr(instance, fk_attr)))
+
+def prefetch_children(instances, relationship, model, fk_attr):
+    """Populate a one-to-many relationship on every instance with one IN query"""
+    pending = [i for i in instances if relationship in inspect(i).unloaded]
+    if not pending:
+        return
+
+    fk_column = getattr(model, fk_attr)
+    children = defaultdict(list)
+    for child in model.query.filter(fk_column.in_([i.id for i in pending])).order_by(model.id).all():
+        children[getattr(child, fk_attr)].append(child)
+    for instance in pending:
+        set_committed_value(instance, relationship, children[instance.id])
+
+def serialize_users(users):
+    return [user.to_dict() for user in users]
+
+def serialize_posts(posts):
+    prefetch_related(posts, 'user_id', 'author', User)
+    return [post.to_dict() for post in posts]
+
+def serialize_stories(stories):
+    prefetch_related(stories, 'user_id', 'author', User)
+    return [story.to_dict() for story in stories]
+
+def serialize_messages(messages):
+    prefetch_related(messages, 'sender_id', 'sender', User)
+    return [message.to_dict() for message in messages]
+
+def serialize_family_members(members):
+    prefetch_related(members, 'user_id', 'user', User)
+    return [member.to_dict() for member in members]
+
+def serialize_families(families):
+    prefetch_children(families, 'members', FamilyMember, 'family_id')
+    return [family.to_dict() for family in families]
+
+def serialize_suggestions(suggestions):
+    prefetch_related(suggestions, 'suggested_id', 'suggested', User)
+    return [suggestion.to_dict() for suggestion in suggestions]
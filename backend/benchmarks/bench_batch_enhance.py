@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Batch story enhancement against the local fake model server.
+
+Seeds a family archive, then enhances it once one story at a time (the old
+per-request path) and once through AIBatchService's bounded pool. The fake
+server rate-limits beyond --server-limit concurrent calls, so the batch run
+also exercises Retry-After backoff.
+
+Usage: python benchmarks/bench_batch_enhance.py [stories] [concurrency] [latency]
+"""
+
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+from config import Config
+from app import create_app, db
+from fake_model_server import start_server
+
+def seed(stories):
+    from app.models.user import User
+    from app.models.family import Family
+    from app.models.story import Story
+
+    db.session.execute(insert(User), [{'id': 1, 'name': 'archivist', 'email': 'a@example.com', 'password_hash': 'x'}])
+    db.session.execute(insert(Family), [{'id': 1, 'name': 'family', 'created_by': 1}])
+    db.session.execute(insert(Story), [
+        {'user_id': 1, 'family_id': 1, 'title': f'story {i}', 'content': f'An old family story, number {i}.'}
+        for i in range(stories)
+    ])
+    db.session.commit()
+
+def reset():
+    from app.models.story import Story
+    from app.models.ai_cache import AICacheEntry
+
+    Story.query.update({'enhanced_content': None, 'ai_enhanced': False})
+    AICacheEntry.query.delete()
+    db.session.commit()
+
+def main():
+    stories = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    server = start_server(latency=latency, max_concurrent=max(concurrency // 2, 1), retry_after=latency)
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        AI_BACKEND = 'openai'
+        OPENAI_API_KEY = 'fake-key'
+        AI_API_BASE = server.api_base
+        AI_JOB_RETRY_DELAY = latency
+        AI_JOB_MAX_RETRIES = 10
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        from app.models import user, family, story, post, follow, message, timeline, archive, ai_job, ai_cache, upload, media, ranking, suggestion, search  # noqa: F401
+        from app.models.story import Story
+        from app.services.ai_service import AIService
+        from app.services.ai_batch_service import AIBatchService
+        db.create_all()
+        seed(stories)
+        story_ids = [s.id for s in Story.query.all()]
+        print(f'{stories} stories, {latency * 1000:.0f} ms per call, server allows {server.max_concurrent} at once\n')
+
+        start = time.perf_counter()
+        for story in Story.query.all():
+            story.enhanced_content = AIService().enhance(story.content, story.title)
+            story.ai_enhanced = True
+            db.session.commit()
+        print(f'{"sequential":<24} {time.perf_counter() - start:7.2f} s')
+
+        reset()
+        server.stats.update(completed=0, rate_limited=0, peak_concurrency=0)
+        batch_service = AIBatchService()
+        batch_service.concurrency = concurrency
+        start = time.perf_counter()
+        completed, failed, skipped = batch_service.enhance_stories(story_ids)
+        elapsed = time.perf_counter() - start
+        print(f'{f"batch x{concurrency}":<24} {elapsed:7.2f} s  '
+              f'({completed} ok, {failed} failed, {server.stats["rate_limited"]} rate-limited calls, '
+              f'peak {server.stats["peak_concurrency"]} concurrent)')
+        assert Story.query.filter_by(ai_enhanced=True).count() == completed
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Follow suggestions over a synthetic follow graph.
+
+Seeds users, a follow graph with a skewed (Zipf-like) popularity and small
+families, then times a full SuggestionService rebuild from the CSR arrays
+against per-user recomputation with indexed queries (what the incremental
+path does for one user), and the cost of applying a single follow.
+
+Usage: python benchmarks/bench_follow_suggestions.py [edges] [users] [samples]
+"""
+
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import insert
+from config import Config
+from app import create_app, db
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+def synthetic_graph(edges, users, rng):
+    """Unique follower -> following pairs, popular accounts followed far more often"""
+    weights = 1.0 / np.arange(1, users + 1) ** 0.8
+    pairs = np.zeros((0, 2), dtype=np.int64)
+    while len(pairs) < edges:
+        needed = int((edges - len(pairs)) * 1.2) + 1000
+        batch = np.stack([
+            rng.integers(1, users + 1, needed),
+            rng.choice(np.arange(1, users + 1), needed, p=weights / weights.sum())
+        ], axis=1)
+        batch = batch[batch[:, 0] != batch[:, 1]]
+        pairs = np.unique(np.concatenate([pairs, batch]), axis=0)
+    return pairs[rng.permutation(len(pairs))[:edges]]
+
+def seed(edges, users, rng):
+    from app.models.user import User
+    from app.models.family import Family, FamilyMember
+    from app.models.follow import Follow
+
+    pairs = synthetic_graph(edges, users, rng)
+    followers = np.bincount(pairs[:, 1], minlength=users + 1)
+    following = np.bincount(pairs[:, 0], minlength=users + 1)
+    db.session.execute(insert(User), [
+        {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x',
+         'followers_count': int(followers[i]), 'following_count': int(following[i])}
+        for i in range(1, users + 1)
+    ])
+    for start in range(0, len(pairs), 100000):
+        db.session.execute(insert(Follow), [
+            {'follower_id': int(a), 'following_id': int(b)} for a, b in pairs[start:start + 100000]
+        ])
+
+    # A third of the users in families of 2-8
+    members = rng.permutation(np.arange(1, users + 1))[:users // 3]
+    sizes = rng.integers(2, 9, len(members))
+    family_of = np.repeat(np.arange(1, len(sizes) + 1), sizes)[:len(members)]
+    db.session.execute(insert(Family), [
+        {'id': int(f), 'name': f'family{f}', 'created_by': int(members[np.argmax(family_of == f)])}
+        for f in np.unique(family_of)
+    ])
+    db.session.execute(insert(FamilyMember), [
+        {'family_id': int(f), 'user_id': int(u)} for f, u in zip(family_of, members)
+    ])
+    db.session.commit()
+    return pairs
+
+def timed(label, fn, count=1):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    per = f'  ({elapsed / count * 1000:.2f} ms each)' if count > 1 else ''
+    print(f'{label:<34} {elapsed:8.2f} s{per}')
+    return result, elapsed
+
+def main():
+    edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    samples = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = np.random.default_rng(7)
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        from app.models import user, family, story, post, follow, message, timeline, archive, ai_job, ai_cache, upload, media, ranking, suggestion, search  # noqa: F401
+        from app.models.suggestion import FollowSuggestion
+        from app.services.suggestion_service import FollowGraph, SuggestionService
+        db.create_all()
+
+        timed('seed', lambda: seed(edges, users, rng))
+        print(f'{edges} follows between {users} users\n')
+
+        service = SuggestionService()
+        graph, load_seconds = timed('load graph into CSR', lambda: FollowGraph.load(service.chunk_size))
+        stored, rebuild_seconds = timed('score and store everyone', lambda: service.rebuild(graph))
+        print(f'{stored} suggestions stored, {load_seconds + rebuild_seconds:.2f} s for a full rebuild\n')
+
+        sample = rng.choice(np.arange(1, users + 1), samples, replace=False)
+        _, seconds = timed(f'refresh_user x {samples}', lambda: [service.refresh_user(int(u)) for u in sample], samples)
+        db.session.commit()
+        print(f'{"  extrapolated to every user":<34} {seconds / samples * users:8.2f} s\n')
+
+        # The incremental path must agree with the rebuild it replaces
+        user_id = int(sample[0])
+        expected = [(s.suggested_id, s.score) for s in service.get_suggestions(user_id)]
+        graph_rows = service.rank(user_id, *graph.candidates(user_id))
+        assert expected == [(int(i), float(s)) for i, s in zip(graph_rows[0], graph_rows[1])], 'CSR and SQL scores disagree'
+
+        follows = rng.integers(1, users + 1, (samples, 2))
+        follows = follows[follows[:, 0] != follows[:, 1]]
+        def apply_follows():
+            from app.models.follow import Follow
+            for a, b in follows:
+                if Follow.query.filter_by(follower_id=int(a), following_id=int(b)).first():
+                    continue
+                db.session.add(Follow(follower_id=int(a), following_id=int(b)))
+                db.session.commit()
+                service.update_for_follow(int(a), int(b))
+        timed(f'follow + update x {len(follows)}', apply_follows, len(follows))
+        print(f'\n{FollowSuggestion.query.count()} suggestions stored')
+
+if __name__ == '__main__':
+    main()
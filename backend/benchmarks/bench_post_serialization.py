@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Compare post counter serialization: len(relationship) vs denormalized columns.
+
+Usage: python benchmarks/bench_post_serialization.py [posts] [likes_per_post]
+"""
+
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert
+from config import Config
+from app import create_app, db
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+def seed(posts, likes_per_post):
+    from app.models.user import User
+    from app.models.post import Post, Like, PostComment
+    
+    db.session.execute(insert(User), [
+        {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, likes_per_post + 1)
+    ])
+    db.session.execute(insert(Post), [
+        {'id': p, 'user_id': 1, 'caption': f'post {p}', 'is_story': False,
+         'likes_count': likes_per_post, 'comments_count': likes_per_post}
+        for p in range(1, posts + 1)
+    ])
+    db.session.execute(insert(Like), [
+        {'user_id': u, 'post_id': p}
+        for p in range(1, posts + 1) for u in range(1, likes_per_post + 1)
+    ])
+    db.session.execute(insert(PostComment), [
+        {'user_id': u, 'post_id': p, 'content': 'nice'}
+        for p in range(1, posts + 1) for u in range(1, likes_per_post + 1)
+    ])
+    db.session.commit()
+
+def measure(label, serialize):
+    from app.models.post import Post
+    
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    db.session.expunge_all()
+    
+    start = time.perf_counter()
+    posts = Post.query.order_by(Post.id).all()
+    rows = [serialize(post) for post in posts]
+    elapsed = time.perf_counter() - start
+    
+    event.remove(db.engine, 'before_cursor_execute', listener)
+    loaded = len(db.session.identity_map)
+    print(f'{label:<24} {elapsed * 1000:9.1f} ms  {len(statements):5d} queries  {loaded:7d} ORM objects')
+    return rows
+
+def main():
+    posts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    likes_per_post = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    
+    app = create_app(BenchConfig)
+    with app.app_context():
+        from app.models import user, family, story, post, follow, message, timeline, archive, ai_job, ai_cache, upload, media, ranking, suggestion, search  # noqa: F401
+        db.create_all()
+        seed(posts, likes_per_post)
+        print(f'{posts} posts x {likes_per_post} likes + {likes_per_post} comments\n')
+        
+        old = measure('len(relationship)', lambda p: (len(p.likes), len(p.comments)))
+        new = measure('counter columns', lambda p: (p.likes_count, p.comments_count))
+        assert old == new, 'counter columns disagree with relationships'
+
+if __name__ == '__main__':
+    main()
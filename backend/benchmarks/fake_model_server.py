@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI chat completions API.
+
+Answers POST /v1/chat/completions after a fixed latency (word by word when
+stream=true) and returns 429 with Retry-After once more than
+--max-concurrent requests are in flight, so batch enhancement, streaming,
+retries and backoff can be exercised offline. Point the app at it with
+AI_API_BASE=http://127.0.0.1:<port>/v1.
+
+Usage: python benchmarks/fake_model_server.py [--port 8089] [--latency 0.5] [--max-concurrent 4] [--token-delay 0.02]
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeModelServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.5, max_concurrent=4, retry_after=1, token_delay=0.02):
+        super().__init__(address, FakeModelHandler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.stats = {'completed': 0, 'rate_limited': 0, 'peak_concurrency': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def api_base(self):
+        return f'http://{self.server_address[0]}:{self.server_address[1]}/v1'
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        with server.lock:
+            if server.in_flight >= server.max_concurrent:
+                server.stats['rate_limited'] += 1
+                return self._reply(429, {'error': {
+                    'message': 'Rate limit reached for requests', 'type': 'requests'
+                }}, {'Retry-After': str(server.retry_after)})
+            server.in_flight += 1
+            server.stats['peak_concurrency'] = max(server.stats['peak_concurrency'], server.in_flight)
+
+        try:
+            time.sleep(server.latency)
+            content = body.get('messages', [{}])[-1].get('content', '')
+            if body.get('stream'):
+                return self._stream(body.get('model'), f'[fake] {content}')
+            self._reply(200, {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body.get('model'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': f'[fake] {content}'},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.stats['completed'] += 1
+
+    def _stream(self, model, text):
+        # Server-sent chunks in the API's format; the connection closes at the end
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for word in re.findall(r'\S+\s*', text):
+            time.sleep(self.server.token_delay)
+            chunk = {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}]
+            }
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port=0, **options):
+    """Run a FakeModelServer on a background thread; returns the server"""
+    server = FakeModelServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--max-concurrent', type=int, default=4)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = FakeModelServer(('127.0.0.1', args.port), args.latency, args.max_concurrent,
+                             token_delay=args.token_delay)
+    print(f'Fake model server on {server.api_base}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
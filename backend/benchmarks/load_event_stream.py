@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Load test for the /events/stream SSE endpoint on a single worker.
+
+Starts the app on a threaded development server backed by a temporary
+SQLite database and opens N concurrent event streams. It then sends one
+message to a group conversation containing every listener and reports how
+long fan-out took, plus the threads and memory each open connection costs.
+
+Usage: python benchmarks/load_event_stream.py [connections]
+"""
+
+import logging
+import os
+import selectors
+import socket
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+from config import Config
+from app import create_app, db
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def open_stream(port, token):
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall(
+        f'GET /events/stream?jwt={token} HTTP/1.1\r\nHost: localhost\r\n'
+        f'Accept: text/event-stream\r\n\r\n'.encode()
+    )
+    buffer = b''
+    while b': connected' not in buffer:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise RuntimeError('stream closed before connecting')
+        buffer += chunk
+    sock.setblocking(False)
+    return sock
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+
+    class LoadConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_file.name}'
+        PUBSUB_BACKEND = 'memory'
+
+    app = create_app(LoadConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        from app.models import user, family, story, post, follow, message, timeline, archive, ai_job, ai_cache, upload, media, ranking, suggestion, search  # noqa: F401
+        db.create_all()
+
+    tokens = []
+    for i in range(connections + 1):
+        response = client.post('/auth/register', json={
+            'name': f'listener{i}', 'email': f'listener{i}@example.com', 'password': 'secret'
+        })
+        tokens.append((response.json['user']['id'], response.json['access_token']))
+
+    sender_id, sender_token = tokens[0]
+    headers = {'Authorization': f'Bearer {sender_token}'}
+    conversation_id = client.post('/conversations', headers=headers, json={
+        'participant_ids': [uid for uid, _ in tokens[1:]], 'name': 'load test'
+    }).json['conversation_id']
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    threads_before, rss_before = threading.active_count(), rss_kb()
+    start = time.perf_counter()
+    streams = [open_stream(server.port, token) for _, token in tokens[1:]]
+    connect_time = time.perf_counter() - start
+    threads_after, rss_after = threading.active_count(), rss_kb()
+
+    selector = selectors.DefaultSelector()
+    for sock in streams:
+        selector.register(sock, selectors.EVENT_READ, bytearray())
+
+    sent = time.perf_counter()
+    client.post(f'/conversations/{conversation_id}/messages', headers=headers, json={'content': 'ping'})
+
+    latencies = []
+    pending = len(streams)
+    deadline = sent + 30
+    while pending and time.perf_counter() < deadline:
+        for key, _ in selector.select(timeout=1):
+            key.data.extend(key.fileobj.recv(65536))
+            if b'event: message' in key.data:
+                latencies.append(time.perf_counter() - sent)
+                selector.unregister(key.fileobj)
+                pending -= 1
+
+    latencies.sort()
+    print(f'connections open:       {len(streams)} (in {connect_time:.2f}s)')
+    print(f'worker threads added:   {threads_after - threads_before}')
+    print(f'memory per connection:  {(rss_after - rss_before) / max(len(streams), 1):.1f} KB')
+    print(f'events delivered:       {len(latencies)}/{len(streams)}')
+    if latencies:
+        print(f'fan-out latency p50:    {latencies[len(latencies) // 2] * 1000:.1f} ms')
+        print(f'fan-out latency max:    {latencies[-1] * 1000:.1f} ms')
+
+    for sock in streams:
+        sock.close()
+    server.shutdown()
+    os.unlink(db_file.name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# Worker entry point:
+#   celery -A celery_worker worker --loglevel=info
+#   celery -A celery_worker beat --loglevel=info
+from app import create_app
+
+app = create_app()
+celery = app.extensions['celery']
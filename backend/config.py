@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -9,6 +10,35 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # Password hashing (older hashes are upgraded to PASSWORD_HASH_METHOD at sign-in)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+    
+    # Snapshots of JWT users ('memory', 'redis' to share invalidation between workers, or 'none')
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+    
+    # Family memberships behind authorization checks ('memory', 'redis' to share invalidation between workers, or 'none')
+    FAMILY_ACCESS_CACHE_BACKEND = os.environ.get('FAMILY_ACCESS_CACHE_BACKEND', 'memory')
+    FAMILY_ACCESS_CACHE_TTL = int(os.environ.get('FAMILY_ACCESS_CACHE_TTL', 300))
+    FAMILY_ACCESS_CACHE_MAX_ENTRIES = int(os.environ.get('FAMILY_ACCESS_CACHE_MAX_ENTRIES', 10000))
+    
+    # Conditional GETs ('memory' for a single worker, 'redis' for several, or 'none' to turn ETags off)
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 10000))
+    RESPONSE_CACHE_STORE_BODIES = os.environ.get('RESPONSE_CACHE_STORE_BODIES', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_BODIES = int(os.environ.get('RESPONSE_CACHE_MAX_BODIES', 2000))
+    
+    # Sign-in throttling ('memory' for a single worker, 'redis' for several)
+    LOGIN_THROTTLE_BACKEND = os.environ.get('LOGIN_THROTTLE_BACKEND', 'memory')
+    LOGIN_THROTTLE_WINDOW = int(os.environ.get('LOGIN_THROTTLE_WINDOW', 900))
+    LOGIN_MAX_ACCOUNT_FAILURES = int(os.environ.get('LOGIN_MAX_ACCOUNT_FAILURES', 10))
+    LOGIN_MAX_IP_FAILURES = int(os.environ.get('LOGIN_MAX_IP_FAILURES', 100))
+    LOGIN_MAX_SHARED_EMAIL_ACCOUNTS = int(os.environ.get('LOGIN_MAX_SHARED_EMAIL_ACCOUNTS', 5))
+    
     # Cloudinary
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
@@ -18,4 +48,117 @@ class Config:
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
     
     # OpenAI
-    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
\ No newline at end of file
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    
+    # AI enhancement ('openai', or 'fake' for a local stand-in model)
+    AI_BACKEND = os.environ.get('AI_BACKEND', 'openai')
+    AI_MODEL = os.environ.get('AI_MODEL', 'gpt-3.5-turbo')
+    AI_API_BASE = os.environ.get('AI_API_BASE')  # OpenAI-compatible server, e.g. a local fake
+    AI_REQUEST_TIMEOUT = int(os.environ.get('AI_REQUEST_TIMEOUT', 60))
+    AI_FAKE_LATENCY = float(os.environ.get('AI_FAKE_LATENCY', 0))
+    AI_FAKE_TOKEN_DELAY = float(os.environ.get('AI_FAKE_TOKEN_DELAY', 0))
+    AI_MAX_ACTIVE_JOBS_PER_USER = int(os.environ.get('AI_MAX_ACTIVE_JOBS_PER_USER', 3))
+    AI_JOB_MAX_RETRIES = int(os.environ.get('AI_JOB_MAX_RETRIES', 3))
+    AI_JOB_RETRY_DELAY = int(os.environ.get('AI_JOB_RETRY_DELAY', 10))
+    AI_JOB_TIMEOUT = int(os.environ.get('AI_JOB_TIMEOUT', 900))
+    AI_BATCH_CONCURRENCY = int(os.environ.get('AI_BATCH_CONCURRENCY', 4))
+    AI_BATCH_COMMIT_SIZE = int(os.environ.get('AI_BATCH_COMMIT_SIZE', 20))
+    AI_BATCH_MAX_STORIES = int(os.environ.get('AI_BATCH_MAX_STORIES', 500))
+    AI_BATCH_TIMEOUT = int(os.environ.get('AI_BATCH_TIMEOUT', 3600))
+    
+    # AI response cache ('db', 'redis', 'memory' or 'none')
+    AI_CACHE_BACKEND = os.environ.get('AI_CACHE_BACKEND', 'db')
+    AI_CACHE_TTL = int(os.environ.get('AI_CACHE_TTL', 30 * 86400))
+    AI_CACHE_MAX_ENTRIES = int(os.environ.get('AI_CACHE_MAX_ENTRIES', 10000))
+    
+    # Home timeline
+    TIMELINE_FANOUT_LIMIT = int(os.environ.get('TIMELINE_FANOUT_LIMIT', 5000))
+    TIMELINE_BACKFILL_LIMIT = int(os.environ.get('TIMELINE_BACKFILL_LIMIT', 200))
+    
+    # Real-time events ('memory' for a single worker, 'redis' for several)
+    PUBSUB_BACKEND = os.environ.get('PUBSUB_BACKEND', 'memory')
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379')
+    EVENT_STREAM_KEEPALIVE = int(os.environ.get('EVENT_STREAM_KEEPALIVE', 15))
+    
+    # Story tray cache ('memory', 'redis' to share invalidation between workers, or 'none';
+    # entries also expire with their earliest story)
+    STORY_TRAY_CACHE_BACKEND = os.environ.get('STORY_TRAY_CACHE_BACKEND', 'memory')
+    STORY_TRAY_CACHE_TTL = int(os.environ.get('STORY_TRAY_CACHE_TTL', 300))
+    STORY_TRAY_CACHE_MAX_ENTRIES = int(os.environ.get('STORY_TRAY_CACHE_MAX_ENTRIES', 10000))
+    
+    # Background jobs (CELERY_TASK_ALWAYS_EAGER=true runs tasks in-process)
+    CELERY = {
+        'broker_url': os.environ.get('CELERY_BROKER_URL', REDIS_URL),
+        'result_backend': os.environ.get('CELERY_RESULT_BACKEND', REDIS_URL),
+        'task_always_eager': os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'false').lower() == 'true',
+        'task_eager_propagates': True,
+        'task_ignore_result': True,
+        # Model calls get their own queue so a dedicated worker's --concurrency caps them
+        'task_routes': {'ai.*': {'queue': 'ai'}, 'media.*': {'queue': 'media'}},
+        'task_annotations': {'ai.enhance_story': {'rate_limit': os.environ.get('AI_TASK_RATE_LIMIT', '60/m')}},
+        'beat_schedule': {
+            'archive-expired-stories': {
+                'task': 'stories.archive_expired',
+                'schedule': float(os.environ.get('STORY_ARCHIVE_INTERVAL', 600)),
+            },
+            'prune-ai-cache': {
+                'task': 'ai.prune_cache',
+                'schedule': 3600.0,
+            },
+            'purge-expired-uploads': {
+                'task': 'uploads.purge_expired',
+                'schedule': 3600.0,
+            },
+            'purge-unattached-media': {
+                'task': 'media.purge_unattached',
+                'schedule': 3600.0,
+            },
+            'rebuild-rankings': {
+                'task': 'ranking.rebuild',
+                'schedule': float(os.environ.get('RANKING_INTERVAL', 600)),
+            },
+            'rebuild-follow-suggestions': {
+                'task': 'suggestions.rebuild',
+                'schedule': float(os.environ.get('SUGGESTION_INTERVAL', 86400)),
+            },
+        },
+    }
+    
+    # Chunked uploads (spool files must be on disk shared by every web worker)
+    UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'kinkeep-uploads'))
+    UPLOAD_MAX_PART_SIZE = int(os.environ.get('UPLOAD_MAX_PART_SIZE', 8 * 1024 * 1024))
+    UPLOAD_SESSION_TTL = int(os.environ.get('UPLOAD_SESSION_TTL', 86400))
+    
+    # Media storage ('cloudinary', or 'local' to keep files under MEDIA_ROOT and serve them at MEDIA_URL)
+    MEDIA_STORAGE_BACKEND = os.environ.get('MEDIA_STORAGE_BACKEND', 'cloudinary')
+    MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media'))
+    MEDIA_URL = os.environ.get('MEDIA_URL', '/media/files')
+    
+    # Media processing pipeline (originals wait in MEDIA_PENDING_DIR for a 'media' queue worker)
+    MEDIA_PENDING_DIR = os.environ.get('MEDIA_PENDING_DIR', os.path.join(tempfile.gettempdir(), 'kinkeep-media'))
+    MEDIA_PROCESS_MAX_RETRIES = int(os.environ.get('MEDIA_PROCESS_MAX_RETRIES', 3))
+    MEDIA_PROCESS_RETRY_DELAY = int(os.environ.get('MEDIA_PROCESS_RETRY_DELAY', 30))
+    MEDIA_UNATTACHED_TTL = int(os.environ.get('MEDIA_UNATTACHED_TTL', 86400))
+    
+    # Expired story archive
+    STORY_ARCHIVE_BATCH_SIZE = int(os.environ.get('STORY_ARCHIVE_BATCH_SIZE', 500))
+    
+    # Explore and reels ranking (rebuilt by the 'rebuild-rankings' beat task)
+    RANKING_WINDOW_DAYS = int(os.environ.get('RANKING_WINDOW_DAYS', 14))
+    RANKING_HALF_LIFE_HOURS = float(os.environ.get('RANKING_HALF_LIFE_HOURS', 24))
+    RANKING_MAX_POSTS = int(os.environ.get('RANKING_MAX_POSTS', 5000))
+    RANKING_CHUNK_SIZE = int(os.environ.get('RANKING_CHUNK_SIZE', 50000))
+    RANKING_LIKE_WEIGHT = float(os.environ.get('RANKING_LIKE_WEIGHT', 1))
+    RANKING_COMMENT_WEIGHT = float(os.environ.get('RANKING_COMMENT_WEIGHT', 3))
+    RANKING_SAVE_WEIGHT = float(os.environ.get('RANKING_SAVE_WEIGHT', 4))
+    
+    # Follow suggestions (rebuilt by the 'rebuild-follow-suggestions' beat task, updated on each follow)
+    SUGGESTION_LIMIT = int(os.environ.get('SUGGESTION_LIMIT', 20))
+    SUGGESTION_MUTUAL_WEIGHT = float(os.environ.get('SUGGESTION_MUTUAL_WEIGHT', 1))
+    SUGGESTION_FAMILY_WEIGHT = float(os.environ.get('SUGGESTION_FAMILY_WEIGHT', 5))
+    SUGGESTION_FANOUT_LIMIT = int(os.environ.get('SUGGESTION_FANOUT_LIMIT', 1000))
+    SUGGESTION_BATCH_SIZE = int(os.environ.get('SUGGESTION_BATCH_SIZE', 1000))
+    SUGGESTION_CHUNK_SIZE = int(os.environ.get('SUGGESTION_CHUNK_SIZE', 100000))
+    
+    # Full-text search (FTS5 on SQLite, a tsvector GIN index on PostgreSQL; 'flask reindex-search' rebuilds it)
+    SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', 50))
\ No newline at end of file
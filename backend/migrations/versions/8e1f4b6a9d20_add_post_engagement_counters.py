@@ -0,0 +1,38 @@
+"""Add post engagement counters
+
+Revision ID: 8e1f4b6a9d20
+Revises: 5c2e9a7d41b3
+Create Date: 2026-10-18 10:03:51.207716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1f4b6a9d20'
+down_revision = '5c2e9a7d41b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('saves_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the source tables
+    op.execute(
+        "UPDATE posts SET "
+        "likes_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id), "
+        "comments_count = (SELECT COUNT(*) FROM post_comments WHERE post_comments.post_id = posts.id), "
+        "saves_count = (SELECT COUNT(*) FROM saved_posts WHERE saved_posts.post_id = posts.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('saves_count')
+        batch_op.drop_column('comments_count')
+        batch_op.drop_column('likes_count')
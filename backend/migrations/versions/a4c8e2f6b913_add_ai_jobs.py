@@ -0,0 +1,42 @@
+"""Add AI jobs
+
+Revision ID: a4c8e2f6b913
+Revises: f1a3e7b5c9d2
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f6b913'
+down_revision = 'f1a3e7b5c9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('story_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['story_id'], ['stories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_jobs_story_status', 'ai_jobs', ['story_id', 'status'], unique=False)
+    op.create_index('ix_ai_jobs_user_status', 'ai_jobs', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ai_jobs_user_status', table_name='ai_jobs')
+    op.drop_index('ix_ai_jobs_story_status', table_name='ai_jobs')
+    op.drop_table('ai_jobs')
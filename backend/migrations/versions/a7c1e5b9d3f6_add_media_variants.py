@@ -0,0 +1,85 @@
+"""Add media variants
+
+Revision ID: a7c1e5b9d3f6
+Revises: f3b7d1a5c9e2
+Create Date: 2026-10-18 18:47:13.592046
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c1e5b9d3f6'
+down_revision = 'f3b7d1a5c9e2'
+branch_labels = None
+depends_on = None
+
+
+media_blobs = sa.table('media_blobs',
+    sa.column('id', sa.Integer()),
+    sa.column('thumbnail_public_id', sa.String()),
+    sa.column('variant_public_ids', sa.JSON())
+)
+
+
+def upgrade():
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('variants', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('placeholder', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('width', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('height', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('media_blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('variants', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('variant_public_ids', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('placeholder', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('width', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('height', sa.Integer(), nullable=True))
+
+    # Stored thumbnails become the blob's only separately stored variant
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(media_blobs.c.id, media_blobs.c.thumbnail_public_id).where(
+        media_blobs.c.thumbnail_public_id.isnot(None)
+    )).all()
+    for blob_id, thumbnail_public_id in rows:
+        connection.execute(media_blobs.update().where(media_blobs.c.id == blob_id).values(
+            variant_public_ids=[thumbnail_public_id]
+        ))
+
+    with op.batch_alter_table('media_blobs', schema=None) as batch_op:
+        batch_op.drop_column('thumbnail_public_id')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('media_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('media_variants')
+
+    with op.batch_alter_table('media_blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('thumbnail_public_id', sa.String(length=255), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(media_blobs.c.id, media_blobs.c.variant_public_ids).where(
+        media_blobs.c.variant_public_ids.isnot(None)
+    )).all()
+    for blob_id, variant_public_ids in rows:
+        if variant_public_ids:
+            connection.execute(media_blobs.update().where(media_blobs.c.id == blob_id).values(
+                thumbnail_public_id=variant_public_ids[-1]
+            ))
+
+    with op.batch_alter_table('media_blobs', schema=None) as batch_op:
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
+        batch_op.drop_column('placeholder')
+        batch_op.drop_column('variant_public_ids')
+        batch_op.drop_column('variants')
+
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
+        batch_op.drop_column('placeholder')
+        batch_op.drop_column('variants')
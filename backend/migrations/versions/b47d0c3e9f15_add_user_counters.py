@@ -0,0 +1,38 @@
+"""Add user counters
+
+Revision ID: b47d0c3e9f15
+Revises: 8e1f4b6a9d20
+Create Date: 2026-10-18 10:41:17.930412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b47d0c3e9f15'
+down_revision = '8e1f4b6a9d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('followers_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('following_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('posts_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the source tables
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT COUNT(*) FROM follows WHERE follows.following_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM follows WHERE follows.follower_id = users.id), "
+        "posts_count = (SELECT COUNT(*) FROM posts WHERE posts.user_id = users.id AND posts.is_story = false)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('posts_count')
+        batch_op.drop_column('following_count')
+        batch_op.drop_column('followers_count')
@@ -0,0 +1,36 @@
+"""Add post ranks
+
+Revision ID: b4d8f2a6c0e3
+Revises: a7c1e5b9d3f6
+Create Date: 2026-10-18 19:26:41.870352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d8f2a6c0e3'
+down_revision = 'a7c1e5b9d3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('post_ranks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('surface', sa.String(length=20), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('surface', 'rank')
+    )
+    op.create_index(op.f('ix_post_ranks_post_id'), 'post_ranks', ['post_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_post_ranks_post_id'), table_name='post_ranks')
+    op.drop_table('post_ranks')
@@ -0,0 +1,36 @@
+"""Add AI cache entries
+
+Revision ID: b6d0f4a8c2e7
+Revises: a4c8e2f6b913
+Create Date: 2026-10-18 14:41:09.264815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d0f4a8c2e7'
+down_revision = 'a4c8e2f6b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_ai_cache_entries_expires_at'), 'ai_cache_entries', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_ai_cache_entries_last_used_at'), 'ai_cache_entries', ['last_used_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_ai_cache_entries_last_used_at'), table_name='ai_cache_entries')
+    op.drop_index(op.f('ix_ai_cache_entries_expires_at'), table_name='ai_cache_entries')
+    op.drop_table('ai_cache_entries')
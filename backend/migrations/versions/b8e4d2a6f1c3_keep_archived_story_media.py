@@ -0,0 +1,43 @@
+"""Keep archived story media
+
+Revision ID: b8e4d2a6f1c3
+Revises: e7c3a9f1b5d2
+Create Date: 2026-10-19 10:14:37.206815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4d2a6f1c3'
+down_revision = 'e7c3a9f1b5d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('archived_story_media',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('archived_story_id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['archived_story_id'], ['archived_stories.id'], ),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('archived_story_id', 'media_id')
+    )
+    op.create_index(op.f('ix_archived_story_media_archived_story_id'), 'archived_story_media', ['archived_story_id'], unique=False)
+    op.create_index(op.f('ix_archived_story_media_media_id'), 'archived_story_media', ['media_id'], unique=False)
+
+    with op.batch_alter_table('archived_stories', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('media_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('archived_stories', schema=None) as batch_op:
+        batch_op.drop_column('media_variants')
+
+    op.drop_index(op.f('ix_archived_story_media_media_id'), table_name='archived_story_media')
+    op.drop_index(op.f('ix_archived_story_media_archived_story_id'), table_name='archived_story_media')
+    op.drop_table('archived_story_media')
@@ -0,0 +1,49 @@
+"""Add inbox pointers
+
+Revision ID: c83a15f2e6d7
+Revises: b47d0c3e9f15
+Create Date: 2026-10-18 11:20:45.611904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c83a15f2e6d7'
+down_revision = 'b47d0c3e9f15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_message_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_conversations_last_message_id', 'messages', ['last_message_id'], ['id'])
+
+    with op.batch_alter_table('conversation_participants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing messages
+    op.execute(
+        "UPDATE conversations SET last_message_id = ("
+        "SELECT messages.id FROM messages WHERE messages.conversation_id = conversations.id "
+        "ORDER BY messages.created_at DESC, messages.id DESC LIMIT 1)"
+    )
+    op.execute(
+        "UPDATE conversation_participants SET unread_count = ("
+        "SELECT COUNT(*) FROM messages "
+        "WHERE messages.conversation_id = conversation_participants.conversation_id "
+        "AND messages.sender_id != conversation_participants.user_id "
+        "AND (conversation_participants.last_read_at IS NULL "
+        "OR messages.created_at > conversation_participants.last_read_at))"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('conversation_participants', schema=None) as batch_op:
+        batch_op.drop_column('unread_count')
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_conversations_last_message_id', type_='foreignkey')
+        batch_op.drop_column('last_message_id')
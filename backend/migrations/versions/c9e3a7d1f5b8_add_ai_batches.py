@@ -0,0 +1,43 @@
+"""Add AI batches
+
+Revision ID: c9e3a7d1f5b8
+Revises: b6d0f4a8c2e7
+Create Date: 2026-10-18 15:20:44.907316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3a7d1f5b8'
+down_revision = 'b6d0f4a8c2e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('family_id', sa.Integer(), nullable=True),
+    sa.Column('story_ids', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('skipped', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['family_id'], ['families.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_batches_user_status', 'ai_batches', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ai_batches_user_status', table_name='ai_batches')
+    op.drop_table('ai_batches')
@@ -0,0 +1,55 @@
+"""Add hot path indexes
+
+Revision ID: d2f6a8c0b951
+Revises: c83a15f2e6d7
+Create Date: 2026-10-18 11:58:32.104587
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6a8c0b951'
+down_revision = 'c83a15f2e6d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
+    op.create_index('ix_follows_following_follower', 'follows', ['following_id', 'follower_id'], unique=False)
+    op.create_index('ix_posts_user_story_created', 'posts', ['user_id', 'is_story', 'created_at'], unique=False)
+    op.create_index('ix_posts_reel_created', 'posts', ['is_reel', 'created_at'], unique=False)
+    op.create_index('ix_posts_active_stories', 'posts', ['user_id', 'story_expires_at'], unique=False,
+                    sqlite_where=sa.text('is_story = 1'), postgresql_where=sa.text('is_story = true'))
+    op.create_index(op.f('ix_likes_post_id'), 'likes', ['post_id'], unique=False)
+    op.create_index('ix_post_comments_post_created', 'post_comments', ['post_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_saved_posts_post_id'), 'saved_posts', ['post_id'], unique=False)
+    op.create_index('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'], unique=False)
+    op.create_index('ix_conversation_participants_user_conversation', 'conversation_participants', ['user_id', 'conversation_id'], unique=False)
+    op.create_index('ix_conversation_participants_conversation_user', 'conversation_participants', ['conversation_id', 'user_id'], unique=False)
+    op.create_index('ix_family_members_family_user', 'family_members', ['family_id', 'user_id'], unique=False)
+    op.create_index('ix_family_members_user_family', 'family_members', ['user_id', 'family_id'], unique=False)
+    op.create_index('ix_stories_family_created', 'stories', ['family_id', 'created_at'], unique=False)
+    op.create_index('ix_stories_user_created', 'stories', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_comments_story_id'), 'comments', ['story_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_comments_story_id'), table_name='comments')
+    op.drop_index('ix_stories_user_created', table_name='stories')
+    op.drop_index('ix_stories_family_created', table_name='stories')
+    op.drop_index('ix_family_members_user_family', table_name='family_members')
+    op.drop_index('ix_family_members_family_user', table_name='family_members')
+    op.drop_index('ix_conversation_participants_conversation_user', table_name='conversation_participants')
+    op.drop_index('ix_conversation_participants_user_conversation', table_name='conversation_participants')
+    op.drop_index('ix_messages_conversation_created', table_name='messages')
+    op.drop_index(op.f('ix_saved_posts_post_id'), table_name='saved_posts')
+    op.drop_index('ix_post_comments_post_created', table_name='post_comments')
+    op.drop_index(op.f('ix_likes_post_id'), table_name='likes')
+    op.drop_index('ix_posts_active_stories', table_name='posts')
+    op.drop_index('ix_posts_reel_created', table_name='posts')
+    op.drop_index('ix_posts_user_story_created', table_name='posts')
+    op.drop_index('ix_follows_following_follower', table_name='follows')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
@@ -0,0 +1,38 @@
+"""Add follow suggestions
+
+Revision ID: d2f6b0e4a8c1
+Revises: b4d8f2a6c0e3
+Create Date: 2026-10-18 20:14:08.227519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b0e4a8c1'
+down_revision = 'b4d8f2a6c0e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('follow_suggestions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('suggested_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('mutual_count', sa.Integer(), nullable=False),
+    sa.Column('shared_families', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['suggested_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'suggested_id')
+    )
+    op.create_index('ix_follow_suggestions_user_score', 'follow_suggestions', ['user_id', 'score'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_follow_suggestions_user_score', table_name='follow_suggestions')
+    op.drop_table('follow_suggestions')
@@ -0,0 +1,62 @@
+"""Add media pipeline
+
+Revision ID: e8a2c6f0b4d9
+Revises: d5f1b9e3a7c4
+Create Date: 2026-10-18 17:21:40.118372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a2c6f0b4d9'
+down_revision = 'd5f1b9e3a7c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('media_type', sa.String(length=20), nullable=False),
+    sa.Column('folder', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('source_path', sa.String(length=500), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('thumbnail_url', sa.String(length=500), nullable=True),
+    sa.Column('public_id', sa.String(length=255), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_media_user_id'), 'media', ['user_id'], unique=False)
+    op.create_table('post_media',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id', 'media_id')
+    )
+    op.create_index(op.f('ix_post_media_media_id'), 'post_media', ['media_id'], unique=False)
+    op.create_index(op.f('ix_post_media_post_id'), 'post_media', ['post_id'], unique=False)
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pending_media', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('pending_media')
+
+    op.drop_index(op.f('ix_post_media_post_id'), table_name='post_media')
+    op.drop_index(op.f('ix_post_media_media_id'), table_name='post_media')
+    op.drop_table('post_media')
+    op.drop_index(op.f('ix_media_user_id'), table_name='media')
+    op.drop_table('media')
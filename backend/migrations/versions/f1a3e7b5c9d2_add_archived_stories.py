@@ -0,0 +1,46 @@
+"""Add archived stories
+
+Revision ID: f1a3e7b5c9d2
+Revises: e5b9c1d7a3f4
+Create Date: 2026-10-18 13:14:52.381960
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a3e7b5c9d2'
+down_revision = 'e5b9c1d7a3f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('archived_stories',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('family_id', sa.Integer(), nullable=True),
+    sa.Column('caption', sa.Text(), nullable=True),
+    sa.Column('media_urls', sa.JSON(), nullable=True),
+    sa.Column('media_type', sa.String(length=20), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('visibility', sa.String(length=20), nullable=True),
+    sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expired_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['family_id'], ['families.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_stories_user_created', 'archived_stories', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_posts_story_expiry', 'posts', ['story_expires_at'], unique=False,
+                    sqlite_where=sa.text('is_story = 1'), postgresql_where=sa.text('is_story = true'))
+
+
+def downgrade():
+    op.drop_index('ix_posts_story_expiry', table_name='posts')
+    op.drop_index('ix_archived_stories_user_created', table_name='archived_stories')
+    op.drop_table('archived_stories')
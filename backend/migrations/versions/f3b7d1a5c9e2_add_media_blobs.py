@@ -0,0 +1,45 @@
+"""Add media blobs
+
+Revision ID: f3b7d1a5c9e2
+Revises: e8a2c6f0b4d9
+Create Date: 2026-10-18 18:02:57.304816
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7d1a5c9e2'
+down_revision = 'e8a2c6f0b4d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_blobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('media_type', sa.String(length=20), nullable=False),
+    sa.Column('processed', sa.Boolean(), server_default='0', nullable=False),
+    sa.Column('public_id', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('thumbnail_url', sa.String(length=500), nullable=True),
+    sa.Column('thumbnail_public_id', sa.String(length=255), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=True),
+    sa.Column('ref_count', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash', 'media_type', 'processed'),
+    sa.UniqueConstraint('public_id')
+    )
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
+
+    op.drop_table('media_blobs')
@@ -2,9 +2,18 @@ from app import create_app, db
 from app.models.user import User
 from app.models.family import Family, FamilyMember
 from app.models.story import Story, Comment
-from app.models.post import Post, Like, PostComment, SavedPost
+from app.models.post import Post, Like, PostComment, SavedPost, StoryView
 from app.models.follow import Follow, CloseFriend
 from app.models.message import Conversation, ConversationParticipant, Message
+from app.models.timeline import TimelineEntry
+from app.models.archive import ArchivedStory
+from app.models.ai_job import AIJob, AIBatch
+from app.models.ai_cache import AICacheEntry
+from app.models.upload import UploadSession
+from app.models.media import Media, PostMedia, MediaBlob
+from app.models.ranking import PostRank
+from app.models.suggestion import FollowSuggestion
+from app.models.search import SearchDocument
 
 app = create_app()
 
@@ -21,10 +30,23 @@ def make_shell_context():
         'Like': Like,
         'PostComment': PostComment,
         'SavedPost': SavedPost,
+        'StoryView': StoryView,
         'Follow': Follow,
         'CloseFriend': CloseFriend,
         'Conversation': Conversation,
-        'Message': Message
+        'Message': Message,
+        'TimelineEntry': TimelineEntry,
+        'ArchivedStory': ArchivedStory,
+        'AIJob': AIJob,
+        'AIBatch': AIBatch,
+        'AICacheEntry': AICacheEntry,
+        'UploadSession': UploadSession,
+        'Media': Media,
+        'PostMedia': PostMedia,
+        'MediaBlob': MediaBlob,
+        'PostRank': PostRank,
+        'FollowSuggestion': FollowSuggestion,
+        'SearchDocument': SearchDocument
     }
 
 if __name__ == '__main__':
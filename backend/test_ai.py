@@ -7,11 +7,14 @@ sys.path.append('.')
 from dotenv import load_dotenv
 load_dotenv()
 
+from app import create_app
 from app.services.ai_service import AIService
 
 # Test the AI service
 def test_ai():
     try:
+        app = create_app()
+        app.app_context().push()
         ai_service = AIService()
         result = ai_service.enhance_story("This is a test story about my grandmother.", "Test Story")
         print("AI Service Test Result:")
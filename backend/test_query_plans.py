@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Query-plan regression check for the hot filter/sort paths.
+
+Builds the schema in an in-memory SQLite database, runs EXPLAIN QUERY PLAN
+on the queries the routes issue, and fails if any of them falls back to a
+full table scan or sorts in a temporary B-tree.
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from sqlalchemy.dialects import sqlite
+from config import Config
+from app import create_app, db
+
+class QueryPlanConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+def hot_queries():
+    """(label, query, ordered) for every path that must stay indexed"""
+    from app.models.user import User
+    from app.models.family import FamilyMember
+    from app.models.story import Story, Comment
+    from app.models.post import Post, Like, PostComment, SavedPost
+    from app.models.follow import Follow
+    from app.models.message import ConversationParticipant, Message
+    from app.models.timeline import TimelineEntry
+    from app.models.archive import ArchivedStory
+    from app.models.ai_job import AIJob
+    from app.models.ranking import PostRank
+    from app.models.suggestion import FollowSuggestion
+    from app.services.family_access_service import FamilyAccess
+
+    now = datetime.utcnow()
+    return [
+        ('users by email', User.query.filter_by(email='a@example.com'), False),
+        ('follows by follower', Follow.query.filter_by(follower_id=1), False),
+        ('follows by following', Follow.query.filter_by(following_id=1), False),
+        ('follower ids', db.session.query(Follow.follower_id).filter(
+            Follow.following_id == 1
+        ).order_by(Follow.follower_id), True),
+        ('following ids', db.session.query(Follow.following_id).filter(
+            Follow.follower_id == 1
+        ).order_by(Follow.following_id), True),
+        ('posts by user', Post.query.filter(
+            Post.is_story == False, Post.user_id == 1
+        ).order_by(Post.created_at.desc()), True),
+        ('active stories by user', Post.query.filter(
+            Post.is_story == True, Post.user_id == 1, Post.story_expires_at > now
+        ), False),
+        ('active stories by followed users', Post.query.filter(
+            Post.is_story == True, Post.user_id.in_([1, 2, 3]), Post.story_expires_at > now
+        ), False),
+        ('expired story sweep', Post.query.filter(
+            Post.is_story == True, Post.story_expires_at <= now
+        ).order_by(Post.story_expires_at), True),
+        ('reels', Post.query.filter_by(is_reel=True).order_by(Post.created_at.desc()), True),
+        ('ranked page', Post.query.join(PostRank, PostRank.post_id == Post.id).filter(
+            PostRank.surface == 'explore', PostRank.rank > 20
+        ).order_by(PostRank.rank), True),
+        ('ranks by post', PostRank.query.filter_by(post_id=1), False),
+        ('follow suggestions by user', FollowSuggestion.query.filter_by(user_id=1), False),
+        ('likes by post', Like.query.filter_by(post_id=1), False),
+        ('comments by post', PostComment.query.filter_by(post_id=1).order_by(PostComment.created_at), True),
+        ('saves by post', SavedPost.query.filter_by(post_id=1), False),
+        ('messages by conversation', Message.query.filter_by(
+            conversation_id=1
+        ).order_by(Message.created_at.asc()), True),
+        ('conversations by participant', ConversationParticipant.query.filter_by(user_id=1), False),
+        ('participant membership', ConversationParticipant.query.filter_by(conversation_id=1, user_id=1), False),
+        ('family membership', FamilyMember.query.filter_by(family_id=1, user_id=1), False),
+        ('families by member', FamilyMember.query.filter_by(user_id=1), False),
+        ('stories by family', Story.query.filter_by(family_id=1).order_by(Story.created_at.desc()), True),
+        ('visible stories by family', Story.query.filter(
+            Story.family_id == 1, FamilyAccess(1, {1: 'member'}).story_filter()
+        ).order_by(Story.created_at.desc()), True),
+        ('stories by author', Story.query.filter_by(user_id=1).order_by(Story.created_at.desc()), True),
+        ('story comments', Comment.query.filter_by(story_id=1), False),
+        ('story archive', ArchivedStory.query.filter_by(
+            user_id=1
+        ).order_by(ArchivedStory.created_at.desc()), True),
+        ('active ai jobs by user', AIJob.query.filter(
+            AIJob.user_id == 1, AIJob.status.in_(AIJob.ACTIVE_STATUSES)
+        ), False),
+        ('active ai jobs by story', AIJob.query.filter(
+            AIJob.story_id == 1, AIJob.status.in_(AIJob.ACTIVE_STATUSES)
+        ), False),
+        ('home timeline', TimelineEntry.query.filter_by(user_id=1).order_by(TimelineEntry.created_at.desc()), True),
+    ]
+
+def explain(query):
+    compiled = query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={'render_postcompile': True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params).all()
+    return [row[-1] for row in rows]
+
+def plan_problems(plan, ordered):
+    problems = [step for step in plan if step.startswith('SCAN ')]
+    if ordered:
+        problems += [step for step in plan if 'TEMP B-TREE' in step]
+    return problems
+
+def test_query_plans():
+    app = create_app(QueryPlanConfig)
+    with app.app_context():
+        from app.models import user, family, story, post, follow, message, timeline, archive, ai_job, ai_cache, upload, media, ranking, suggestion, search  # noqa: F401
+        db.create_all()
+
+        failures = []
+        for label, query, ordered in hot_queries():
+            plan = explain(query)
+            problems = plan_problems(plan, ordered)
+            print(f"{'FAIL' if problems else 'ok  '} {label}: {' | '.join(plan)}")
+            if problems:
+                failures.append(label)
+
+        assert not failures, f"Unindexed query plans: {', '.join(failures)}"
+
+if __name__ == "__main__":
+    try:
+        test_query_plans()
+    except AssertionError as e:
+        print(e)
+        sys.exit(1)
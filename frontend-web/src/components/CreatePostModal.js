@@ -2,6 +2,8 @@ import React, { useState, useRef } from 'react';
 import apiService from '../services/api';
 import FilterCamera from './FilterCamera';
 
+const CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024;
+
 const CreatePostModal = ({ isOpen, onClose, onPostCreated }) => {
   const [step, setStep] = useState(1); // 1: select media, 2: add details
   const [selectedFiles, setSelectedFiles] = useState([]);
@@ -53,15 +55,28 @@ const CreatePostModal = ({ isOpen, onClose, onPostCreated }) => {
     setStep(2);
   };
 
+  // Uploads are queued for processing; the post references the pending
+  // media ids and picks up the URLs once the server has processed them
   const uploadFiles = async () => {
-    const uploadedUrls = [];
+    const mediaIds = [];
     
     for (const file of selectedFiles) {
+      const type = file.type.startsWith('image/') ? 'image' :
+                   file.type.startsWith('video/') ? 'video' : 'audio';
+      const folder = isStory ? 'stories' : 'posts';
+      
+      // Large files (mostly video) go up in resumable chunks
+      if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+        const result = await apiService.uploadChunked(file, { type, folder, deferred: true });
+        mediaIds.push(result.media.id);
+        continue;
+      }
+      
       const formData = new FormData();
       formData.append('file', file);
-      formData.append('type', file.type.startsWith('image/') ? 'image' : 
-                              file.type.startsWith('video/') ? 'video' : 'audio');
-      formData.append('folder', isStory ? 'stories' : 'posts');
+      formData.append('type', type);
+      formData.append('folder', folder);
+      formData.append('async', 'true');
       
       try {
         const response = await fetch(`${process.env.REACT_APP_API_URL || 'http://localhost:5001'}/upload`, {
@@ -73,8 +88,8 @@ const CreatePostModal = ({ isOpen, onClose, onPostCreated }) => {
         });
         
         const result = await response.json();
-        if (result.url) {
-          uploadedUrls.push(result.url);
+        if (result.media) {
+          mediaIds.push(result.media.id);
         }
       } catch (error) {
         console.error('Upload error:', error);
@@ -82,7 +97,7 @@ const CreatePostModal = ({ isOpen, onClose, onPostCreated }) => {
       }
     }
     
-    return uploadedUrls;
+    return mediaIds;
   };
 
   const handleSubmit = async () => {
@@ -91,13 +106,13 @@ const CreatePostModal = ({ isOpen, onClose, onPostCreated }) => {
     setUploading(true);
     try {
       // Upload files first
-      const mediaUrls = await uploadFiles();
+      const mediaIds = await uploadFiles();
       
       // Create post
       const postData = {
         caption,
         location,
-        media_urls: mediaUrls,
+        media_ids: mediaIds,
         media_type: previews.length === 1 ? previews[0].type : 'carousel',
         is_story: isStory,
         is_reel: isReel,
@@ -58,8 +58,13 @@ const OnboardingFlow = ({ user, onComplete }) => {
 
   const fetchSuggestedUsers = async () => {
     try {
-      const response = await apiService.getPosts({ limit: 10 });
-      const users = response.posts?.map(post => post.author).filter(Boolean) || [];
+      const suggestions = await apiService.getFollowSuggestions(6);
+      let users = suggestions.suggestions?.map(suggestion => suggestion.user) || [];
+      if (users.length === 0) {
+        // Nothing computed yet for a brand new account; fall back to recent authors
+        const response = await apiService.getPosts({ limit: 10 });
+        users = response.posts?.map(post => post.author).filter(Boolean) || [];
+      }
       setSuggestedUsers(users.slice(0, 6));
     } catch (error) {
       console.error('Error fetching suggested users:', error);
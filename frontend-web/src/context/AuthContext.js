@@ -52,7 +52,8 @@ export const AuthProvider = ({ children }) => {
     } catch (error) {
       return { 
         success: false, 
-        error: error.response?.data?.error || 'Login failed' 
+        error: error.response?.data?.error || 'Login failed',
+        usernameRequired: !!error.response?.data?.username_required
       };
     }
   };
@@ -72,7 +73,8 @@ export const AuthProvider = ({ children }) => {
     } catch (error) {
       return { 
         success: false, 
-        error: error.response?.data?.error || 'Registration failed' 
+        error: error.response?.data?.error || 'Registration failed',
+        usernameRequired: !!error.response?.data?.username_required
       };
     }
   };
@@ -61,9 +61,11 @@ const ExplorePage = () => {
         <div key={post.id} className="aspect-square bg-gray-200 relative group cursor-pointer">
           {post.media_urls && post.media_urls[0] ? (
             <img
-              src={post.media_urls[0]}
+              src={post.media_variants?.[0]?.grid || post.media_urls[0]}
               alt="Post"
-              className="w-full h-full object-cover"
+              loading="lazy"
+              className="w-full h-full object-cover bg-cover bg-center"
+              style={post.media_variants?.[0]?.placeholder ? { backgroundImage: `url(${post.media_variants[0].placeholder})` } : undefined}
               onError={(e) => {
                 e.target.src = `https://picsum.photos/300/300?random=${post.id}`;
               }}
@@ -65,12 +65,20 @@ const PostCard = ({ post, onLike, onComment, onShare }) => {
           ) : (
             <img
               src={post.media_urls[0]}
+              srcSet={post.media_variants?.[0]?.grid ? `${post.media_variants[0].grid} 480w, ${post.media_urls[0]} 1080w` : undefined}
+              sizes="(max-width: 640px) 100vw, 600px"
               alt="Post content"
-              className="w-full h-full object-cover"
+              className="w-full h-full object-cover bg-cover bg-center"
+              style={post.media_variants?.[0]?.placeholder ? { backgroundImage: `url(${post.media_variants[0].placeholder})` } : undefined}
             />
           )}
         </div>
       )}
+      {post.media_pending && (!post.media_urls || post.media_urls.length === 0) && (
+        <div className="aspect-square bg-gray-100 flex items-center justify-center text-sm text-gray-500">
+          Processing media...
+        </div>
+      )}
 
       {/* Post Actions */}
       <div className="p-4">
@@ -150,7 +158,8 @@ const PostCard = ({ post, onLike, onComment, onShare }) => {
 
 const FeedPage = () => {
   const [posts, setPosts] = useState([]);
-  const [stories, setStories] = useState([]);
+  const [storyTray, setStoryTray] = useState([]);
+  const [activeStories, setActiveStories] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showShareModal, setShowShareModal] = useState(false);
   const [shareData, setShareData] = useState(null);
@@ -180,13 +189,46 @@ const FeedPage = () => {
 
   const fetchStories = async () => {
     try {
-      const response = await apiService.getPosts({ type: 'stories' });
-      setStories(response.stories || []);
+      // One ring per author; individual stories are loaded when a ring is opened
+      const response = await apiService.getStoryTray();
+      setStoryTray(response.tray || []);
     } catch (error) {
       console.error('Error fetching stories:', error);
     }
   };
 
+  const openStories = async (entry) => {
+    try {
+      const response = await apiService.getPosts({ type: 'stories', user_id: entry.user.id });
+      const stories = (response.stories || []).slice().reverse();
+      setActiveStories({ user: entry.user, stories, index: 0 });
+      if (stories.length > 0) {
+        markViewed(stories[0].id);
+      }
+    } catch (error) {
+      console.error('Error fetching stories:', error);
+    }
+  };
+
+  const showNextStory = () => {
+    const next = activeStories.index + 1;
+    if (next >= activeStories.stories.length) {
+      setActiveStories(null);
+      fetchStories();
+      return;
+    }
+    setActiveStories({ ...activeStories, index: next });
+    markViewed(activeStories.stories[next].id);
+  };
+
+  const markViewed = async (postId) => {
+    try {
+      await apiService.markStoryViewed(postId);
+    } catch (error) {
+      console.error('Error marking story viewed:', error);
+    }
+  };
+
   const handleLike = async (postId) => {
     try {
       await apiService.likePost(postId);
@@ -237,25 +279,48 @@ const FeedPage = () => {
     <InstagramLayout>
       <div className="max-w-2xl mx-auto pt-8 px-4">
         {/* Stories */}
-        {stories.length > 0 && (
+        {storyTray.length > 0 && (
           <div className="bg-white border border-gray-300 rounded-lg p-4 mb-6">
             <div className="flex space-x-4 overflow-x-auto">
-              {stories.map((story) => (
-                <div key={story.id} className="flex-shrink-0 text-center">
-                  <div className="w-16 h-16 instagram-gradient rounded-full p-0.5">
+              {storyTray.map((entry) => (
+                <div
+                  key={entry.user.id}
+                  className="flex-shrink-0 text-center cursor-pointer"
+                  onClick={() => openStories(entry)}
+                >
+                  <div className={`w-16 h-16 rounded-full p-0.5 ${entry.seen ? 'bg-gray-300' : 'instagram-gradient'}`}>
                     <div className="w-full h-full bg-white rounded-full flex items-center justify-center">
                       <span className="text-sm font-medium">
-                        {story.author?.name?.charAt(0)}
+                        {entry.user.name?.charAt(0)}
                       </span>
                     </div>
                   </div>
-                  <p className="text-xs mt-1 truncate w-16">{story.author?.name}</p>
+                  <p className="text-xs mt-1 truncate w-16">{entry.user.name}</p>
                 </div>
               ))}
             </div>
           </div>
         )}
 
+        {activeStories && activeStories.stories.length > 0 && (
+          <div
+            className="fixed inset-0 bg-black bg-opacity-90 z-50 flex items-center justify-center"
+            onClick={showNextStory}
+          >
+            <div className="max-w-md w-full text-center text-white px-4">
+              <p className="text-sm font-semibold mb-4">{activeStories.user.name}</p>
+              {activeStories.stories[activeStories.index].media_urls?.[0] && (
+                <img
+                  src={activeStories.stories[activeStories.index].media_urls[0]}
+                  alt=""
+                  className="w-full rounded-lg mb-4"
+                />
+              )}
+              <p>{activeStories.stories[activeStories.index].caption}</p>
+            </div>
+          </div>
+        )}
+
         {/* Posts */}
         {posts.length === 0 ? (
           <div className="bg-white border border-gray-300 rounded-lg p-8 text-center">
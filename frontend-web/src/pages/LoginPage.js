@@ -12,6 +12,8 @@ const LoginSchema = Yup.object().shape({
 const LoginPage = () => {
   const { login } = useAuth();
   const [error, setError] = useState('');
+  // Shown once the server says the email is shared by several accounts
+  const [showUsername, setShowUsername] = useState(false);
 
   const handleSubmit = async (values, { setSubmitting }) => {
     setError('');
@@ -19,6 +21,9 @@ const LoginPage = () => {
     
     if (!result.success) {
       setError(result.error);
+      if (result.usernameRequired) {
+        setShowUsername(true);
+      }
     }
     setSubmitting(false);
   };
@@ -38,7 +43,7 @@ const LoginPage = () => {
         <div className="bg-white border border-gray-300 rounded-lg p-6 mb-4">
         
           <Formik
-            initialValues={{ email: '', password: '' }}
+            initialValues={{ email: '', username: '', password: '' }}
             validationSchema={LoginSchema}
             onSubmit={handleSubmit}
           >
@@ -60,6 +65,19 @@ const LoginPage = () => {
                   />
                   <ErrorMessage name="email" component="div" className="text-red-500 text-xs" />
                   
+                  {showUsername && (
+                    <>
+                      <Field
+                        id="username"
+                        name="username"
+                        type="text"
+                        className="input-field"
+                        placeholder="Username"
+                      />
+                      <ErrorMessage name="username" component="div" className="text-red-500 text-xs" />
+                    </>
+                  )}
+                  
                   <Field
                     id="password"
                     name="password"
@@ -81,9 +81,11 @@ const ProfilePage = () => {
                 />
               ) : (
                 <img
-                  src={post.media_urls[0]}
+                  src={post.media_variants?.[0]?.grid || post.media_urls[0]}
                   alt="Post"
-                  className="w-full h-full object-cover"
+                  loading="lazy"
+                  className="w-full h-full object-cover bg-cover bg-center"
+                  style={post.media_variants?.[0]?.placeholder ? { backgroundImage: `url(${post.media_variants[0].placeholder})` } : undefined}
                   onError={(e) => {
                     e.target.style.display = 'none';
                     e.target.parentElement.innerHTML = '<div class="w-full h-full bg-gray-300 flex items-center justify-center text-gray-500">Image failed to load</div>';
@@ -13,6 +13,8 @@ const RegisterSchema = Yup.object().shape({
 const RegisterPage = () => {
   const { register } = useAuth();
   const [error, setError] = useState('');
+  // Shown once the server says the email is shared by several accounts
+  const [showUsername, setShowUsername] = useState(false);
 
   const handleSubmit = async (values, { setSubmitting }) => {
     setError('');
@@ -20,6 +22,9 @@ const RegisterPage = () => {
     
     if (!result.success) {
       setError(result.error);
+      if (result.usernameRequired) {
+        setShowUsername(true);
+      }
     }
     setSubmitting(false);
   };
@@ -39,7 +44,7 @@ const RegisterPage = () => {
         <div className="bg-white border border-gray-300 rounded-lg p-6 mb-4">
         
           <Formik
-            initialValues={{ name: '', email: '', password: '' }}
+            initialValues={{ name: '', email: '', username: '', password: '' }}
             validationSchema={RegisterSchema}
             onSubmit={handleSubmit}
           >
@@ -70,6 +75,19 @@ const RegisterPage = () => {
                   />
                   <ErrorMessage name="email" component="div" className="text-red-500 text-xs" />
                   
+                  {showUsername && (
+                    <>
+                      <Field
+                        id="username"
+                        name="username"
+                        type="text"
+                        className="input-field"
+                        placeholder="Username"
+                      />
+                      <ErrorMessage name="username" component="div" className="text-red-500 text-xs" />
+                    </>
+                  )}
+                  
                   <Field
                     id="password"
                     name="password"
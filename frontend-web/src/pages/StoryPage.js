@@ -7,6 +7,7 @@ const StoryPage = () => {
   const [story, setStory] = useState(null);
   const [loading, setLoading] = useState(true);
   const [enhancing, setEnhancing] = useState(false);
+  const [streamedText, setStreamedText] = useState('');
 
   useEffect(() => {
     fetchStory();
@@ -38,10 +39,30 @@ const StoryPage = () => {
     });
   };
 
+  const waitForEnhancementJob = async () => {
+    const response = await apiService.enhanceStory(storyId);
+    // Enhancement runs in the background; poll the job until it finishes
+    let job = response.job;
+    while (!['succeeded', 'failed'].includes(job.status)) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      job = (await apiService.getAIJob(job.id)).job;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error);
+    }
+  };
+
   const handleEnhanceStory = async () => {
     setEnhancing(true);
+    setStreamedText('');
     try {
-      const response = await apiService.enhanceStory(storyId);
+      try {
+        // Show the enhancement as it is written
+        await apiService.streamEnhancement(storyId, (text) => setStreamedText((prev) => prev + text));
+      } catch (streamError) {
+        console.error('Streaming enhancement failed, falling back to a background job:', streamError);
+        await waitForEnhancementJob();
+      }
       // Refresh story to show enhanced content
       await fetchStory();
       alert('Story enhanced successfully! Review the changes below.');
@@ -50,6 +71,7 @@ const StoryPage = () => {
       alert('Failed to enhance story. Please try again.');
     } finally {
       setEnhancing(false);
+      setStreamedText('');
     }
   };
 
@@ -226,6 +248,11 @@ const StoryPage = () => {
                     {enhancing ? 'Enhancing...' : 'Enhance Story'}
                   </button>
                 </div>
+                {streamedText && (
+                  <div className="mt-4 bg-white p-4 rounded border text-sm text-gray-900 whitespace-pre-wrap">
+                    {streamedText}
+                  </div>
+                )}
               </div>
             )}
           </article>
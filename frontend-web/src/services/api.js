@@ -153,6 +153,52 @@ class ApiService {
     return response.data;
   }
 
+  // Streams the enhancement as Server-Sent Events; onToken receives each fragment.
+  // Uses fetch because axios and EventSource cannot read a streamed POST body.
+  async streamEnhancement(storyId, onToken) {
+    const response = await fetch(`${API_BASE_URL}/stories/${storyId}/enhance/stream`, {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${localStorage.getItem('access_token')}` },
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Enhancement stream failed (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+      for (const raw of events) {
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+        if (event === 'token') onToken(data.text);
+        if (event === 'done') return data;
+        if (event === 'error') throw new Error(data.details || data.error);
+      }
+    }
+    throw new Error('Enhancement stream ended early');
+  }
+
+  async getAIJob(jobId) {
+    const response = await this.api.get(`/ai/jobs/${jobId}`);
+    return response.data;
+  }
+
+  async enhanceStories({ familyId, storyIds } = {}) {
+    const response = await this.api.post('/ai/batches', { family_id: familyId, story_ids: storyIds });
+    return response.data;
+  }
+
+  async getAIBatch(batchId) {
+    const response = await this.api.get(`/ai/batches/${batchId}`);
+    return response.data;
+  }
+
   async acceptEnhancement(storyId, accept) {
     const response = await this.api.post(`/stories/${storyId}/accept-enhancement`, { accept });
     return response.data;
@@ -169,6 +215,16 @@ class ApiService {
     return response.data;
   }
 
+  async getStoryTray() {
+    const response = await this.api.get('/posts/stories/tray');
+    return response.data;
+  }
+
+  async markStoryViewed(postId) {
+    const response = await this.api.post(`/posts/${postId}/view`);
+    return response.data;
+  }
+
   async likePost(postId) {
     const response = await this.api.post(`/posts/${postId}/like`);
     return response.data;
@@ -195,6 +251,11 @@ class ApiService {
     return response.data;
   }
 
+  async getFollowSuggestions(limit) {
+    const response = await this.api.get('/users/suggestions', { params: { limit } });
+    return response.data;
+  }
+
   // Messaging
   async getConversations() {
     const response = await this.api.get('/conversations');
@@ -215,6 +276,43 @@ class ApiService {
     const response = await this.api.post(`/conversations/${conversationId}/messages`, messageData);
     return response.data;
   }
+
+  // Chunked, resumable upload for large media. A failed part is retried from
+  // the offset the server reports, so a dropped connection does not restart the file.
+  // With deferred, the server answers at once with a pending media record
+  // (see getMedia) instead of waiting for storage and processing.
+  async uploadChunked(file, { type, folder = 'posts', onProgress, maxAttempts = 5, deferred = false } = {}) {
+    const started = await this.api.post('/uploads', { filename: file.name, size: file.size, type, folder });
+    const uploadId = started.data.upload.upload_id;
+    const partSize = started.data.max_part_size;
+
+    let offset = 0;
+    let failures = 0;
+    while (offset < file.size) {
+      try {
+        const response = await this.api.put(`/uploads/${uploadId}`, file.slice(offset, offset + partSize), {
+          params: { offset },
+          headers: { 'Content-Type': 'application/octet-stream' },
+        });
+        offset = response.data.offset;
+        failures = 0;
+        if (onProgress) onProgress(offset / file.size);
+      } catch (error) {
+        if (++failures >= maxAttempts) throw error;
+        await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** failures));
+        const status = await this.api.get(`/uploads/${uploadId}`);
+        offset = status.data.upload.offset;
+      }
+    }
+
+    const response = await this.api.post(`/uploads/${uploadId}/complete`, deferred ? { async: true } : undefined);
+    return response.data;
+  }
+
+  async getMedia(mediaId) {
+    const response = await this.api.get(`/media/${mediaId}`);
+    return response.data;
+  }
 }
 
 export default new ApiService();
\ No newline at end of file
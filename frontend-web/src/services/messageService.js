@@ -1,5 +1,7 @@
 import apiService from './api';
 
+const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5001';
+
 class MessageService {
   // Get all conversations for current user
   async getConversations() {
@@ -12,9 +14,21 @@ class MessageService {
     }
   }
 
-  // Get messages for a specific conversation
-  async getMessages(conversationId, page = 1, limit = 50) {
+  // Get messages for a specific conversation.
+  // Pass { cursor } to use keyset pagination instead of page numbers: '' loads the
+  // newest page, and the returned nextCursor loads older history ({ messages, nextCursor }).
+  async getMessages(conversationId, page = 1, limit = 50, { cursor } = {}) {
     try {
+      if (cursor !== undefined && cursor !== null) {
+        const response = await apiService.get(
+          `/conversations/${conversationId}/messages?cursor=${encodeURIComponent(cursor)}&limit=${limit}`
+        );
+        return {
+          messages: response.data.messages || [],
+          nextCursor: response.data.next_cursor || null
+        };
+      }
+
       const response = await apiService.get(`/conversations/${conversationId}/messages?page=${page}&limit=${limit}`);
       return response.data.messages || [];
     } catch (error) {
@@ -53,6 +67,30 @@ class MessageService {
     }
   }
 
+  // Subscribe to real-time message, typing and read events.
+  // handlers: { message, typing, read } callbacks; returns an unsubscribe function.
+  subscribe(handlers = {}) {
+    const token = localStorage.getItem('access_token');
+    const source = new EventSource(`${API_BASE_URL}/events/stream?jwt=${encodeURIComponent(token)}`);
+
+    ['message', 'typing', 'read'].forEach((type) => {
+      if (handlers[type]) {
+        source.addEventListener(type, (event) => handlers[type](JSON.parse(event.data)));
+      }
+    });
+
+    return () => source.close();
+  }
+
+  // Tell other participants the current user is (or stopped) typing
+  async sendTyping(conversationId, isTyping = true) {
+    try {
+      await apiService.post(`/conversations/${conversationId}/typing`, { is_typing: isTyping });
+    } catch (error) {
+      console.error('Error sending typing status:', error);
+    }
+  }
+
   // Search users for new conversations
   async searchUsers(query) {
     try {